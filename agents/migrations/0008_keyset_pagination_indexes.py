@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agents", "0007_agent_slug"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="agent",
+            index=models.Index(
+                fields=["-created", "-id"], name="agents_agen_created_7f231d_idx"
+            ),
+        ),
+    ]
@@ -96,24 +96,24 @@ class Agent(models.Model):
     
     updated = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the agents directory
+            models.Index(fields=['-created', '-id']),
+        ]
     
     
     
     def save(self, *args, **kwargs):
-        # Generate slug from username if not set
-        if not self.slug:
-            from django.utils.text import slugify
-            base_slug = slugify(self.user.username)
-            slug = base_slug
-            counter = 1
-            while Agent.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-            
         if not self.referral_code:
             self.referral_code = self.generate_referral_code()
-        super().save(*args, **kwargs)
+
+        # Generate slug from username if not set
+        if not self.slug:
+            from core.slugs import save_with_unique_slug
+            save_with_unique_slug(self, self.user.username, lambda: super(Agent, self).save(*args, **kwargs))
+        else:
+            super().save(*args, **kwargs)
         
         
     def generate_referral_code(self):
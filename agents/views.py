@@ -405,15 +405,15 @@ def submit_company_verification(request):
 def agent_profile(request, slug):
     """Display agent profile with their properties"""
     from django.shortcuts import get_object_or_404
+    from property.cards import load_cards
     from property.models import Property
     
     agent = get_object_or_404(Agent, slug=slug)
     
     # Get recent properties by this agent (limit to 6 for profile page)
-    recent_properties = Property.objects.filter(
-        agent=agent,
-        is_active=True
-    ).select_related('state', 'city', 'property_type', 'status').order_by('-created_at')[:6]
+    recent_properties = load_cards(
+        Property.objects.filter(agent=agent, is_active=True).order_by('-created_at'), limit=6,
+    )
     
     # Get agent statistics
     total_properties = Property.objects.filter(agent=agent, is_active=True).count()
@@ -430,7 +430,8 @@ def agent_profile(request, slug):
 def agent_properties(request, slug):
     """Display all properties listed by a specific agent"""
     from django.shortcuts import get_object_or_404
-    from django.core.paginator import Paginator
+    from core.pagination import paginate_by_cursor
+    from property.cards import PropertyCard, card_values
     from property.models import Property
     
     agent = get_object_or_404(Agent, slug=slug)
@@ -439,17 +440,21 @@ def agent_properties(request, slug):
     properties_list = Property.objects.filter(
         agent=agent,
         is_active=True
-    ).select_related('state', 'city', 'property_type', 'status').order_by('-created_at')
+    )
     
-    # Pagination
-    paginator = Paginator(properties_list, 12)  # 12 properties per page
-    page_number = request.GET.get('page')
-    properties = paginator.get_page(page_number)
+    # Keyset pagination - 12 properties per page, total capped at 1,000+
+    ordering = ('-created_at', '-id')
+    properties = paginate_by_cursor(
+        card_values(properties_list, ordering), ordering,
+        cursor=request.GET.get('cursor'),
+        per_page=12,
+        row_factory=PropertyCard.from_row,
+    )
     
     context = {
         'agent': agent,
         'properties': properties,
-        'total_properties': properties_list.count(),
+        'total_properties': properties.count_display,
     }
     
     return render(request, 'agents/agent_properties.html', context)
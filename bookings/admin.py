@@ -20,7 +20,7 @@ class ApartmentAdmin(admin.ModelAdmin):
             'fields': ('title', 'description', 'property_type', 'status', 'owner')
         }),
         ('Location', {
-            'fields': ('address', 'city', 'state', 'zip_code')
+            'fields': ('address', 'city', 'state', 'zip_code', 'latitude', 'longitude')
         }),
         ('Property Details', {
             'fields': ('bedrooms', 'bathrooms', 'square_feet', 'floor_number', 'max_guests')
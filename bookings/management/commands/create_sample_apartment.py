@@ -10,6 +10,7 @@ Usage:
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from django.utils.text import slugify
+from core.slugs import SlugAllocator
 from decimal import Decimal
 import random
 
@@ -57,6 +58,7 @@ class Command(BaseCommand):
         # Create apartments
         self.stdout.write(f'Creating {count} sample apartments...')
         created_count = 0
+        self.slugs = SlugAllocator(Apartment)
         
         for i in range(count):
             apartment = self.create_apartment(i + 1, property_types, owner)
@@ -236,7 +238,7 @@ class Command(BaseCommand):
         try:
             apartment = Apartment.objects.create(
                 title=title,
-                slug=slugify(title) + f'-{index}',
+                slug=self.slugs.allocate(title),
                 description=description,
                 property_type=property_type,
                 address=f"{random.randint(100, 9999)} {street}",
@@ -4,7 +4,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from decimal import Decimal
 from django.urls import reverse
-from django.utils.text import slugify
+from core.slugs import save_with_unique_slug
 from ckeditor.fields import RichTextField
 
 User = get_user_model()
@@ -35,6 +35,10 @@ class Apartment(models.Model):
     city = models.CharField(max_length=100)
     state = models.CharField(max_length=100)
     zip_code = models.CharField(max_length=10)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    # Derived from latitude/longitude in save(); indexed for radius/map searches (core/geo.py)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     
     # Property Details
     bedrooms = models.PositiveIntegerField(default=1)
@@ -83,10 +87,18 @@ class Apartment(models.Model):
     
     
     def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            from core.geo import encode_geohash
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geohash'}
         if not self.slug:
-            base_slug = slugify(self.title)
-            self.slug = base_slug[:100]  # Reasonable slug length
-        super().save(*args, **kwargs)
+            save_with_unique_slug(self, self.title, lambda: super(Apartment, self).save(*args, **kwargs))
+        else:
+            super().save(*args, **kwargs)
         
         
     
@@ -1,3 +1,59 @@
+from decimal import Decimal
+
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import Apartment
+
+
+class ApartmentsNearbyTests(TestCase):
+    url = reverse('apartments_nearby')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.apartment = Apartment.objects.create(
+            title='Lekki Studio', address='1 Admiralty Way', city='Lekki', state='Lagos', zip_code='100001',
+            square_feet=600, price_per_night=Decimal('25000.00'),
+            latitude=Decimal('6.447800'), longitude=Decimal('3.472300'),
+        )
+
+    def test_bounding_box(self):
+        response = self.client.get(self.url, {'south': 6.4, 'west': 3.4, 'north': 6.5, 'east': 3.5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.apartment.pk])
+
+    def test_inverted_bounding_box_is_rejected(self):
+        for box in [
+            {'south': 6.5, 'west': 3.4, 'north': 6.4, 'east': 3.5},
+            {'south': 6.4, 'west': 3.5, 'north': 6.5, 'east': 3.4},
+        ]:
+            with self.subTest(box=box):
+                response = self.client.get(self.url, box)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': 'Invalid bounding box'})
+
+    def test_missing_or_malformed_params_are_rejected(self):
+        for params in [{}, {'south': 6.4}, {'lat': 'abc', 'lng': 3.4}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+    def test_non_finite_and_out_of_range_values_are_rejected(self):
+        for params in [
+            {'lat': 'nan', 'lng': 3.4}, {'lat': 6.4, 'lng': 'inf'}, {'lat': 91, 'lng': 3.4},
+            {'lat': 6.4, 'lng': 3.4, 'radius_km': 'nan'}, {'lat': 6.4, 'lng': 3.4, 'radius_km': '-1'},
+            {'lat': 6.4, 'lng': 3.4, 'radius_km': '0'},
+            {'south': 'nan', 'west': 3.4, 'north': 6.5, 'east': 3.5},
+            {'south': 6.4, 'west': '-inf', 'north': 6.5, 'east': 3.5},
+            {'south': -100, 'west': 3.4, 'north': 6.5, 'east': 3.5},
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
 
-# Create your tests here.
+    def test_radius(self):
+        response = self.client.get(self.url, {'lat': 6.4478, 'lng': 3.4723, 'radius_km': 1})
+        self.assertEqual(response.json()['count'], 1)
+        # Capped at the shared maximum rather than rejected
+        response = self.client.get(self.url, {'lat': 6.4478, 'lng': 3.4723, 'radius_km': 10000, 'limit': 'x'})
+        self.assertEqual(response.json()['count'], 1)
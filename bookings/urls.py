@@ -18,5 +18,6 @@ urlpatterns = [
     
     # AJAX URLs
     path('api/check-availability/', views.check_availability, name='check_availability'),
+    path('api/nearby/', views.apartments_nearby, name='apartments_nearby'),
 ]
 
@@ -309,4 +309,34 @@ def check_availability(request):
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=400)
     
-    return JsonResponse({'error': 'Invalid request'}, status=400)
\ No newline at end of file
+    return JsonResponse({'error': 'Invalid request'}, status=400)
+
+def apartments_nearby(request):
+    """AJAX endpoint: available apartments near lat/lng or inside a map viewport"""
+    from core.geo import InvalidGeoQuery, parse_bounds, parse_point, result_limit, within_bounds, within_radius
+
+    apartments = Apartment.objects.filter(status='available').exclude(geohash='')
+    by_bounds = 'south' in request.GET
+    try:
+        area = parse_bounds(request.GET) if by_bounds else parse_point(request.GET)
+    except InvalidGeoQuery as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Pass lat/lng (and radius_km) or south/west/north/east'}, status=400)
+
+    search = within_bounds if by_bounds else within_radius
+    results = search(apartments, *area, limit=result_limit(request.GET))
+
+    return JsonResponse({
+        'count': len(results),
+        'results': [{
+            'id': apartment.id,
+            'title': apartment.title,
+            'url': apartment.get_absolute_url(),
+            'price_per_night': float(apartment.price_per_night),
+            'location': f"{apartment.city}, {apartment.state}",
+            'lat': float(apartment.latitude),
+            'lng': float(apartment.longitude),
+            'distance_km': apartment.distance_km,
+        } for apartment in results],
+    })
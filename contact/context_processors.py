@@ -1,13 +1,23 @@
+from django.core.cache import cache
+
 from .models import ContactInfo
 
+CONTACT_INFO_CACHE_KEY = 'contact:active_info'
+CONTACT_INFO_CACHE_TIMEOUT = 60 * 60
+
 
 def contact_info(request):
     """
     Context processor to make ContactInfo available to all templates.
     This ensures that contact information is accessible globally without
     needing to pass it explicitly in every view.
+    The active row is cached (wrapped, so "none configured" is cached too)
+    and cleared by contact/signals.py when ContactInfo changes.
     """
-    contact_info_instance = ContactInfo.get_active()
+    cached = cache.get(CONTACT_INFO_CACHE_KEY)
+    if cached is None:
+        cached = {'instance': ContactInfo.get_active()}
+        cache.set(CONTACT_INFO_CACHE_KEY, cached, CONTACT_INFO_CACHE_TIMEOUT)
     return {
-        'contact_info': contact_info_instance
+        'contact_info': cached['instance']
     }
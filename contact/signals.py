@@ -0,0 +1,11 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .context_processors import CONTACT_INFO_CACHE_KEY
+from .models import ContactInfo
+
+
+@receiver(post_save, sender=ContactInfo)
+@receiver(post_delete, sender=ContactInfo)
+def clear_contact_info_cache(sender, **kwargs):
+    cache.delete(CONTACT_INFO_CACHE_KEY)
@@ -0,0 +1,103 @@
+"""
+Generation counters for versioned cache keys.
+
+Every namespace (e.g. 'properties') has a generation number stored in the
+cache. Keys are built from the current generation, so bumping it makes all
+previously cached values for that namespace unreachable at once, without
+having to know or delete the individual keys.
+
+get_or_rebuild() layers stale-while-rebuilding on top of that for hot,
+expensive pages such as the homepage.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+
+def _generation_key(namespace):
+    return f'generation:{namespace}'
+
+
+def get_generation(namespace):
+    """Return the current generation number for a namespace"""
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock rather than 1 so an evicted counter can never
+        # come back at a value that old cache entries were stored under.
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(namespace):
+    """Invalidate everything cached under `namespace`"""
+    key = _generation_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Counter missing (never read, or evicted): a fresh seed is enough
+        generation = int(time.time() * 1000)
+        cache.set(key, generation, timeout=None)
+        return generation
+
+
+def hash_key_parts(parts):
+    """Stable short digest of arbitrary key parts (filters, params...)"""
+    raw = repr(parts).encode('utf-8')
+    return hashlib.md5(raw, usedforsecurity=False).hexdigest()
+
+
+def versioned_key(namespace, *parts):
+    """Build a cache key bound to the namespace's current generation"""
+    suffix = ':'.join(str(part) for part in parts)
+    return f'{namespace}:{get_generation(namespace)}:{suffix}'
+
+
+# Lock entries expire on their own so a crashed rebuild can't wedge a key
+REBUILD_LOCK_TIMEOUT = 30
+COLD_WAIT_SECONDS = 2.0
+COLD_POLL_INTERVAL = 0.1
+
+
+def get_or_rebuild(key, namespace, builder, fresh_for, keep_for=60 * 60 * 24):
+    """
+    Cached value of `builder()` stored under `key`, tied to the generation of
+    `namespace`, with stampede protection.
+
+    The entry records the generation and a "fresh until" time. Once it is
+    stale (expired, or the generation was bumped) one caller takes a lock
+    via cache.add() and rebuilds it. Meanwhile, everyone else keeps getting
+    the stale copy, which stays in the cache for `keep_for` seconds. On a
+    completely cold cache the other callers poll briefly for the
+    rebuilder's result, and after that they build it themselves.
+    """
+    generation = get_generation(namespace)
+    entry = cache.get(key)
+    if entry and entry['generation'] == generation and entry['fresh_until'] > time.time():
+        return entry['value']
+
+    lock_key = f'{key}:rebuild-lock'
+    if cache.add(lock_key, 1, REBUILD_LOCK_TIMEOUT):
+        try:
+            value = builder()
+            cache.set(key, {
+                'generation': generation,
+                'fresh_until': time.time() + fresh_for,
+                'value': value,
+            }, keep_for)
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    if entry:
+        return entry['value']
+
+    deadline = time.time() + COLD_WAIT_SECONDS
+    while time.time() < deadline:
+        time.sleep(COLD_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry:
+            return entry['value']
+    return builder()
@@ -0,0 +1,9 @@
+from .saved_items import SavedItems
+
+
+def saved_items(request):
+    """
+    `saved_items.properties` / `saved_items.products`: ID sets of what the
+    visitor has saved, loaded (from cache) only if a template reads them.
+    """
+    return {'saved_items': SavedItems(request.user)}
@@ -0,0 +1,174 @@
+"""
+Buffered counters (page views...).
+
+A hit does not UPDATE the row. It increments a per-object counter in the
+cache and adds the object's id to a "pending" set for that model field.
+`flush_counters()` drains the pending ids and writes each model field in
+a single UPDATE ... SET field = field + n per distinct n. A popular
+listing therefore costs one write per flush rather than one per page view.
+
+Flushing happens opportunistically, at most every FLUSH_INTERVAL seconds,
+from the request that records a hit. It can also be run on demand with
+`manage.py flush_counters` (e.g. from cron).
+
+Buffering needs the Redis cache: its pending sets are native sets, shared
+by every worker and drained atomically. Any other cache writes each
+counted hit straight through instead. The local-memory cache is private
+to one process, so a buffer there would be invisible to flush_counters
+and lost on restart. Other backends have no atomic set to track pending
+ids with.
+"""
+import hashlib
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import F
+
+# Counted (model label, field, engagement event) - flush_counters() walks
+# these and also feeds the flushed amounts to the trending buckets
+COUNTERS = [
+    ('property.Property', 'views_count', 'view'),
+    ('shop.Product', 'views_count', 'view'),
+]
+
+FLUSH_INTERVAL = 60
+DEDUP_WINDOW = 60 * 30  # one view per visitor per object per half hour
+
+
+def _label(model):
+    return model._meta.label
+
+
+def _counter_key(label, field, pk):
+    return f'counters:{label}:{field}:{pk}'
+
+
+def _pending_key(label, field):
+    return f'counters:pending:{label}:{field}'
+
+
+def _redis():
+    """Raw Redis client when the default cache is django-redis, else None"""
+    if not type(cache).__module__.startswith('django_redis'):
+        return None
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def is_buffered():
+    """Whether hits are buffered (Redis cache) rather than written straight through"""
+    return _redis() is not None
+
+
+def _add_pending(client, label, field, pk):
+    client.sadd(cache.make_key(_pending_key(label, field)), pk)
+
+
+def _drain_pending(client, label, field):
+    key = cache.make_key(_pending_key(label, field))
+    pipe = client.pipeline()  # MULTI/EXEC: read and clear atomically
+    pipe.smembers(key)
+    pipe.delete(key)
+    members, _ = pipe.execute()
+    return {pk.decode() for pk in members}  # int or UUID keys, as strings
+
+
+def _event(label, field):
+    return next((event for counted, counted_field, event in COUNTERS if (counted, counted_field) == (label, field)), None)
+
+
+def _write_counts(model, field, event, amounts):
+    """UPDATE ... SET field = field + n for {pk: n}; returns the rows updated"""
+    from .trending import record_events
+
+    by_amount = {}
+    for pk, amount in amounts.items():
+        if amount:
+            by_amount.setdefault(amount, []).append(pk)
+    updated = 0
+    for amount, ids in by_amount.items():
+        updated += model.objects.filter(pk__in=ids).update(**{field: F(field) + amount})
+    if event:
+        record_events(model, event, amounts)
+    return updated
+
+
+def increment(obj, field='views_count', amount=1):
+    """
+    Buffer `amount` for obj.<field>, written to the DB on the next flush
+    (or straight away without a Redis cache)
+    """
+    label = _label(obj)
+    client = _redis()
+    if client is None:
+        _write_counts(type(obj), field, _event(label, field), {obj.pk: amount})
+        return
+    key = _counter_key(label, field, obj.pk)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, amount, None)
+    _add_pending(client, label, field, obj.pk)
+
+
+def _visitor_id(request):
+    session_key = getattr(request, 'session', None) and request.session.session_key
+    if session_key:
+        return session_key
+    # No session yet (anonymous first hit): don't create one just to count
+    raw = f"{request.META.get('REMOTE_ADDR', '')}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return hashlib.md5(raw.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def record_view(request, obj, field='views_count'):
+    """
+    Count a page view of `obj`, once per visitor per DEDUP_WINDOW.
+    Returns True if it was counted.
+    """
+    seen_key = f'counters:seen:{_label(obj)}:{obj.pk}:{_visitor_id(request)}'
+    if not cache.add(seen_key, 1, DEDUP_WINDOW):
+        return False
+    increment(obj, field)
+    if is_buffered():
+        maybe_flush()
+    return True
+
+
+def maybe_flush():
+    """Flush if nobody has in the last FLUSH_INTERVAL seconds"""
+    if cache.add('counters:flush-lock', 1, FLUSH_INTERVAL):
+        flush_counters()
+
+
+def flush_counters():
+    """Write buffered counts to the database. Returns the number of rows updated."""
+    client = _redis()
+    if client is None:
+        return 0  # nothing is buffered
+
+    updated = 0
+    for label, field, event in COUNTERS:
+        model = apps.get_model(label)
+        pks = _drain_pending(client, label, field)
+        if not pks:
+            continue
+        keys = {_counter_key(label, field, pk): pk for pk in pks}
+        counts = cache.get_many(list(keys))
+        updated += _write_counts(model, field, event, {keys[key]: int(amount) for key, amount in counts.items()})
+
+        # Subtract what was written rather than deleting, so hits that
+        # arrived during the flush stay buffered
+        for key, amount in counts.items():
+            if amount:
+                try:
+                    cache.decr(key, int(amount))
+                except ValueError:
+                    pass
+    return updated
+
+
+def pending_count(obj, field='views_count'):
+    """Buffered (not yet flushed) increments for obj.<field>"""
+    return cache.get(_counter_key(_label(obj), field, obj.pk)) or 0
@@ -0,0 +1,220 @@
+"""
+Geospatial helpers for plain PostgreSQL/SQLite (no PostGIS).
+
+Rows that have coordinates also store a geohash. A radius or bounding-box
+search first selects candidate rows with a few indexed
+`geohash LIKE 'prefix%'` conditions covering the search area, then computes
+exact haversine distances for the candidates in one vectorized NumPy pass
+and sorts by distance.
+"""
+from functools import reduce
+import math
+import operator
+
+import numpy as np
+from django.db.models import Q
+
+EARTH_RADIUS_KM = 6371.0088
+
+GEOHASH_PRECISION = 9  # ~4.8m x 4.8m, stored on each row
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Upper bound on prefixes per query; the search picks the finest precision
+# whose covering cells stay under it.
+MAX_COVER_CELLS = 16
+
+# Query-string limits shared by the nearby / viewport endpoints
+DEFAULT_RADIUS_KM = 5
+MAX_RADIUS_KM = 100
+DEFAULT_RESULTS = 50
+MAX_RESULTS = 200
+
+
+class InvalidGeoQuery(ValueError):
+    pass
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Standard base-32 geohash of a point"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            bounds[0] = mid
+        else:
+            bits <<= 1
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """(height, width) in degrees of a geohash cell at `precision`"""
+    total_bits = precision * 5
+    lat_bits = total_bits // 2
+    lng_bits = total_bits - lat_bits
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def _cover_at(south, west, north, east, precision):
+    height, width = cell_size(precision)
+    cells = set()
+    lat = south
+    while True:
+        lng = west
+        while True:
+            cells.add(encode_geohash(min(lat, north), min(lng, east), precision))
+            if len(cells) > MAX_COVER_CELLS:
+                return None
+            if lng >= east:
+                break
+            lng += width
+        if lat >= north:
+            break
+        lat += height
+    return cells
+
+
+def covering_geohashes(south, west, north, east):
+    """
+    Geohash prefixes whose cells together cover the bounding box, at the
+    finest precision that needs no more than MAX_COVER_CELLS of them.
+    """
+    south, north = max(-90.0, south), min(90.0, north)
+    west, east = max(-180.0, west), min(180.0, east)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cells = _cover_at(south, west, north, east, precision)
+        if cells is not None:
+            return sorted(cells)
+    return list(GEOHASH_ALPHABET)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(south, west, north, east) of the box enclosing a circle"""
+    lat_delta = np.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(np.cos(np.radians(latitude)), 1e-6)
+    lng_delta = min(180.0, lat_delta / cos_lat)
+    return latitude - lat_delta, longitude - lng_delta, latitude + lat_delta, longitude + lng_delta
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Vectorized great-circle distance from one point to arrays of points"""
+    lat1 = np.radians(latitude)
+    lng1 = np.radians(longitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=float))
+    lng2 = np.radians(np.asarray(longitudes, dtype=float))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def geohash_prefilter(queryset, south, west, north, east):
+    """Restrict a queryset to rows whose geohash falls in cells covering the box"""
+    prefixes = covering_geohashes(south, west, north, east)
+    return queryset.filter(reduce(operator.or_, [Q(geohash__startswith=p) for p in prefixes]))
+
+
+def _rank_by_distance(queryset, latitude, longitude, keep, limit):
+    candidates = list(queryset.values_list('pk', 'latitude', 'longitude'))
+    if not candidates:
+        return []
+    ids = np.array([row[0] for row in candidates])
+    lats = np.array([float(row[1]) for row in candidates])
+    lngs = np.array([float(row[2]) for row in candidates])
+    distances = haversine_km(latitude, longitude, lats, lngs)
+
+    mask = keep(lats, lngs, distances)
+    ids, distances = ids[mask], distances[mask]
+    order = np.argsort(distances, kind='stable')
+    if limit:
+        order = order[:limit]
+
+    objects = queryset.in_bulk([int(pk) for pk in ids[order]])
+    results = []
+    for pk, distance in zip(ids[order], distances[order]):
+        obj = objects.get(int(pk))
+        if obj is not None:
+            obj.distance_km = round(float(distance), 3)
+            results.append(obj)
+    return results
+
+
+def within_radius(queryset, latitude, longitude, radius_km, limit=None):
+    """
+    Objects within `radius_km` of a point, nearest first, each annotated
+    with `distance_km`. The model needs latitude, longitude and geohash.
+    """
+    latitude, longitude = float(latitude), float(longitude)
+    candidates = geohash_prefilter(queryset, *bounding_box(latitude, longitude, radius_km))
+    return _rank_by_distance(
+        candidates, latitude, longitude,
+        keep=lambda lats, lngs, distances: distances <= radius_km,
+        limit=limit,
+    )
+
+
+def within_bounds(queryset, south, west, north, east, limit=None):
+    """
+    Objects inside a map viewport, sorted by distance from its centre
+    (each annotated with `distance_km`).
+    """
+    south, west, north, east = (float(v) for v in (south, west, north, east))
+    candidates = geohash_prefilter(queryset, south, west, north, east)
+    return _rank_by_distance(
+        candidates, (south + north) / 2, (west + east) / 2,
+        keep=lambda lats, lngs, distances: (
+            (lats >= south) & (lats <= north) & (lngs >= west) & (lngs <= east)
+        ),
+        limit=limit,
+    )
+
+
+def _coordinate(params, name, bound):
+    value = float(params[name])
+    # nan and inf would defeat the geohash prefilter (a whole-table scan)
+    if not math.isfinite(value) or abs(value) > bound:
+        raise InvalidGeoQuery(f'{name} must be between -{bound} and {bound}')
+    return value
+
+
+def parse_point(params):
+    """
+    (lat, lng, radius_km) from query-string `params`, radius capped at
+    MAX_RADIUS_KM. Raises KeyError if lat/lng are missing, ValueError if
+    they aren't numbers and InvalidGeoQuery if they are out of range.
+    """
+    latitude = _coordinate(params, 'lat', 90)
+    longitude = _coordinate(params, 'lng', 180)
+    radius_km = float(params.get('radius_km', DEFAULT_RADIUS_KM))
+    if not (math.isfinite(radius_km) and radius_km > 0):
+        raise InvalidGeoQuery('radius_km must be a positive number')
+    return latitude, longitude, min(radius_km, MAX_RADIUS_KM)
+
+
+def parse_bounds(params):
+    """(south, west, north, east) from query-string `params`; raises like parse_point"""
+    south, north = _coordinate(params, 'south', 90), _coordinate(params, 'north', 90)
+    west, east = _coordinate(params, 'west', 180), _coordinate(params, 'east', 180)
+    if south > north or west > east:
+        raise InvalidGeoQuery('Invalid bounding box')
+    return south, west, north, east
+
+
+def result_limit(params):
+    """The `limit` query-string parameter, clamped to 1..MAX_RESULTS"""
+    try:
+        return max(1, min(int(params.get('limit', DEFAULT_RESULTS)), MAX_RESULTS))
+    except ValueError:
+        return DEFAULT_RESULTS
@@ -0,0 +1,148 @@
+"""
+Resized variants of uploaded images.
+
+Every image in IMAGE_FIELDS gets WebP and JPEG copies at each width in
+VARIANTS. They are stored through the field's own storage backend, next
+to the original:
+
+    properties/gallery/pool.jpg -> properties/gallery/pool__card.webp
+                                   properties/gallery/pool__card.jpg ...
+
+Saving a model with a new image queues it on a small thread pool once
+the transaction commits, so the upload request doesn't wait for Pillow.
+When the variants are written the image is marked ready in the cache.
+The `srcset` / `variant_url` template tags only point at variants of
+ready images, and fall back to the original otherwise. Images uploaded
+before this existed are handled by `manage.py generate_image_variants`.
+"""
+import atexit
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.signals import post_save
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# (model label, image field)
+IMAGE_FIELDS = [
+    ('property.Property', 'featured_image'),
+    ('property.PropertyImage', 'image'),
+    ('shop.Product', 'main_image'),
+    ('shop.ProductImage', 'image'),
+    ('bookings.ApartmentImage', 'image'),
+    ('shop.CustomerProfile', 'profile_image'),
+]
+
+# Variant name -> maximum width in pixels (never upscaled)
+VARIANTS = {
+    'thumb': 320,
+    'card': 640,
+    'hero': 1600,
+}
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+WORKERS = 2
+READY_TIMEOUT = None  # variants don't go stale; a new upload gets a new name
+
+_executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='image-variants')
+atexit.register(_executor.shutdown, wait=True)
+
+
+def variant_name(name, variant, fmt):
+    stem, _ = os.path.splitext(name)
+    return f'{stem}__{variant}.{fmt}'
+
+
+def is_variant(name):
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return any(stem.endswith(f'__{variant}') for variant in VARIANTS)
+
+
+def _ready_key(name):
+    return f'images:ready:{name}'
+
+
+def is_ready(storage, name):
+    """Whether variants exist for `name` (cached; checks storage on a miss)"""
+    ready = cache.get(_ready_key(name))
+    if ready is None:
+        ready = storage.exists(variant_name(name, 'card', 'webp'))
+        cache.set(_ready_key(name), ready, READY_TIMEOUT if ready else 60)
+    return ready
+
+
+def _encode(image, width, fmt):
+    resized = image.copy()
+    if resized.width > width:
+        resized.thumbnail((width, width * resized.height // resized.width), Image.LANCZOS)
+    pil_format, options = FORMATS[fmt]
+    if pil_format == 'JPEG' and resized.mode != 'RGB':
+        resized = resized.convert('RGB')
+    buffer = BytesIO()
+    resized.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def generate_variants(storage, name, overwrite=False):
+    """Write every variant of one stored image. Returns the number written."""
+    written = 0
+    with storage.open(name, 'rb') as original:
+        image = Image.open(original)
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        for variant, width in VARIANTS.items():
+            for fmt in FORMATS:
+                target = variant_name(name, variant, fmt)
+                if storage.exists(target):
+                    if not overwrite:
+                        continue
+                    storage.delete(target)
+                storage.save(target, ContentFile(_encode(image, width, fmt)))
+                written += 1
+    cache.set(_ready_key(name), True, READY_TIMEOUT)
+    return written
+
+
+def _generate_quietly(storage, name):
+    try:
+        generate_variants(storage, name)
+    except Exception:
+        # A bad upload must not take the worker down; the original still serves
+        logger.exception(f"Could not generate image variants for {name}")
+
+
+def queue_variants(field_file):
+    """Generate variants for a saved FieldFile on the background pool"""
+    name = field_file.name
+    if name and not is_variant(name):
+        _executor.submit(_generate_quietly, field_file.storage, name)
+
+
+def _queue_on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    for label, field in IMAGE_FIELDS:
+        if sender._meta.label != label:
+            continue
+        if update_fields and field not in update_fields:
+            continue
+        field_file = getattr(instance, field)
+        if field_file and not cache.get(_ready_key(field_file.name)):
+            transaction.on_commit(lambda f=field_file: queue_variants(f))
+
+
+def connect_signals():
+    for label, _ in IMAGE_FIELDS:
+        post_save.connect(_queue_on_save, sender=apps.get_model(label), dispatch_uid=f'image-variants:{label}')
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from core.counters import flush_counters
+from core.trending import compute_trending, rollup_buckets
+
+
+class Command(BaseCommand):
+    help = 'Rolls up engagement buckets and recomputes the trending rankings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-rollup', action='store_true', help='Only recompute scores')
+
+    def handle(self, *args, **options):
+        # Pick up buffered views first so the latest hour counts
+        flush_counters()
+        if not options['skip_rollup']:
+            folded, expired = rollup_buckets()
+            self.stdout.write(f'Folded {folded} hourly buckets, expired {expired} daily buckets')
+        scored = compute_trending()
+        self.stdout.write(self.style.SUCCESS(f'✓ Computed trending scores for {scored} items'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from core.counters import flush_counters, is_buffered
+
+
+class Command(BaseCommand):
+    help = 'Writes buffered view counters from the cache to the database'
+
+    def handle(self, *args, **options):
+        if not is_buffered():
+            self.stdout.write(self.style.WARNING(
+                'Counters are only buffered with the Redis cache; without it every view is '
+                'written straight away, so there is nothing to flush.'
+            ))
+            return
+        updated = flush_counters()
+        self.stdout.write(self.style.SUCCESS(f'✓ Flushed counters for {updated} rows'))
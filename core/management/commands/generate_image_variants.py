@@ -0,0 +1,36 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from core.images import IMAGE_FIELDS, generate_variants, is_variant
+
+
+class Command(BaseCommand):
+    help = 'Generates resized WebP/JPEG variants for existing uploaded images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--overwrite', action='store_true', help='Regenerate variants that already exist')
+        parser.add_argument('--model', help='Only this model, e.g. property.PropertyImage')
+
+    def handle(self, *args, **options):
+        processed = written = failed = 0
+        for label, field in IMAGE_FIELDS:
+            if options['model'] and options['model'] != label:
+                continue
+            model = apps.get_model(label)
+            storage = model._meta.get_field(field).storage
+            names = (
+                model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                .values_list(field, flat=True).distinct()
+            )
+            for name in names.iterator():
+                if is_variant(name):
+                    continue
+                try:
+                    written += generate_variants(storage, name, overwrite=options['overwrite'])
+                    processed += 1
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f'  ⚠ {name}: {str(e)[:80]}'))
+            self.stdout.write(f'  {label}.{field} done')
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Processed {processed} images ({written} variants written, {failed} failed)'
+        ))
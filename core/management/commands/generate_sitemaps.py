@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from core.sitemap_shards import generate_sitemaps, sitemap_root
+
+
+class Command(BaseCommand):
+    help = 'Writes the gzipped sitemap shards that changed since the last run, and the sitemap index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rewrite every shard')
+
+    def handle(self, *args, **options):
+        written = generate_sitemaps(full=options['full'])
+        index_size = written.pop('index')
+        for section, shards in written.items():
+            self.stdout.write(f"  {section}: {len(shards)} shard{'s' if len(shards) != 1 else ''} rewritten")
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Sitemap index lists {index_size} shards in {sitemap_root()}'
+        ))
@@ -0,0 +1,110 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EngagementBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.CharField(max_length=40)),
+                (
+                    "event",
+                    models.CharField(
+                        choices=[
+                            ("view", "View"),
+                            ("save", "Save"),
+                            ("cart_add", "Added to cart"),
+                            ("application", "Application"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("hour", "Hour"), ("day", "Day")],
+                        default="hour",
+                        max_length=4,
+                    ),
+                ),
+                ("bucket_start", models.DateTimeField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["granularity", "bucket_start"],
+                        name="core_engage_granula_5ae522_idx",
+                    )
+                ],
+                "unique_together": {
+                    (
+                        "content_type",
+                        "object_id",
+                        "event",
+                        "granularity",
+                        "bucket_start",
+                    )
+                },
+            },
+        ),
+        migrations.CreateModel(
+            name="TrendingScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.CharField(max_length=40)),
+                ("score", models.FloatField()),
+                ("computed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "-score"],
+                        name="core_trendi_content_878134_idx",
+                    )
+                ],
+                "unique_together": {("content_type", "object_id")},
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class EngagementBucket(models.Model):
+    """
+    Engagement counts per object, event and time bucket (see core/trending.py).
+    Recent activity lives in hourly buckets, which are rolled up into
+    daily buckets once they are older than a couple of days.
+    """
+    HOUR = 'hour'
+    DAY = 'day'
+    GRANULARITY_CHOICES = [
+        (HOUR, 'Hour'),
+        (DAY, 'Day'),
+    ]
+
+    EVENT_CHOICES = [
+        ('view', 'View'),
+        ('save', 'Save'),
+        ('cart_add', 'Added to cart'),
+        ('application', 'Application'),
+    ]
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.CharField(max_length=40)  # products use UUID keys
+    event = models.CharField(max_length=20, choices=EVENT_CHOICES)
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES, default=HOUR)
+    bucket_start = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['content_type', 'object_id', 'event', 'granularity', 'bucket_start']
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start']),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id} {self.event} x{self.count} @ {self.bucket_start}"
+
+
+class TrendingScore(models.Model):
+    """Precomputed decayed engagement score per object, rebuilt by `compute_trending`"""
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.CharField(max_length=40)
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['content_type', 'object_id']
+        indexes = [
+            models.Index(fields=['content_type', '-score']),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id} = {self.score:.2f}"
@@ -0,0 +1,211 @@
+"""
+Keyset (cursor) pagination.
+
+Instead of COUNT(*) + OFFSET, each page is fetched with a WHERE clause on
+the sort key of the last row seen, e.g. for ('-created_at', '-id'):
+
+    WHERE created_at < %s OR (created_at = %s AND id < %s)
+    ORDER BY created_at DESC, id DESC LIMIT per_page + 1
+
+so deep pages cost the same as the first one. Cursors are opaque,
+URL-safe tokens; totals are counted only up to a cap and shown as
+"1,000+" beyond it.
+
+Ordering fields must be non-null and end with a unique field (normally id)
+so every row has a distinct position.
+"""
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+DEFAULT_COUNT_CAP = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    # Decimal, UUID...: _decode_value converts back with field.to_python
+    return str(value)
+
+
+def _decode_value(model, name, value):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        # Annotation (e.g. search_rank): JSON round-trips a Python float
+        # exactly, so float annotations must be double precision, not real
+        return value
+    try:
+        return field.to_python(value)
+    except (TypeError, ValidationError) as e:
+        raise InvalidCursor(str(e))
+
+
+def encode_cursor(values, direction='next'):
+    payload = json.dumps({'v': [_encode_value(v) for v in values], 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (values, direction) from an encoded cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values, direction = payload['v'], payload['d']
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise InvalidCursor('Malformed cursor')
+    if direction not in ('next', 'prev') or not isinstance(values, list):
+        raise InvalidCursor('Malformed cursor')
+    return values, direction
+
+
+def _field_name(ordering_field):
+    name = ordering_field.lstrip('-')
+    return 'pk' if name == 'id' else name
+
+
+def _row_value(obj, ordering_field):
+    name = _field_name(ordering_field)
+    if isinstance(obj, dict):
+        return obj['id' if name == 'pk' else name]
+    return getattr(obj, name)
+
+
+def keyset_filter(ordering, values, reverse=False):
+    """Q object selecting the rows after `values` in `ordering`"""
+    condition = Q()
+    for i, field in enumerate(ordering):
+        descending = field.startswith('-') != reverse
+        clause = Q(**{f'{_field_name(field)}__{"lt" if descending else "gt"}': values[i]})
+        for previous, value in zip(ordering[:i], values[:i]):
+            clause &= Q(**{_field_name(previous): value})
+        condition |= clause
+    return condition
+
+
+def _reverse_ordering(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+def capped_count(queryset, cap=DEFAULT_COUNT_CAP):
+    """
+    Count rows up to `cap`; returns (count, is_capped).
+    Runs COUNT over a LIMIT subquery, so it stops scanning at cap + 1 rows.
+    """
+    count = queryset.order_by()[:cap + 1].count()
+    if count > cap:
+        return cap, True
+    return count, False
+
+
+class CursorPage:
+    """
+    One page of keyset-paginated results. Iterable like a Paginator Page,
+    with `next_cursor`/`previous_cursor` instead of page numbers.
+    """
+
+    def __init__(self, object_list, ordering, has_next, has_previous, count=None, count_capped=False):
+        self.object_list = object_list
+        self.ordering = ordering
+        # Sort keys of the first/last row, taken before any row_factory runs
+        self._first_values = [_row_value(object_list[0], f) for f in ordering] if object_list else None
+        self._last_values = [_row_value(object_list[-1], f) for f in ordering] if object_list else None
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.count = count
+        self.count_capped = count_capped
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} items>'
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return encode_cursor(self._last_values, 'next')
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return encode_cursor(self._first_values, 'prev')
+
+    @property
+    def count_display(self):
+        """Total for display, e.g. '245' or '1,000+'"""
+        if self.count is None:
+            return ''
+        return f'{self.count:,}{"+" if self.count_capped else ""}'
+
+
+def paginate_by_cursor(queryset, ordering, cursor=None, per_page=12, count_cap=DEFAULT_COUNT_CAP, row_factory=None):
+    """
+    Fetch one page of `queryset` sorted by `ordering` (a list of field names,
+    '-' prefix for descending), starting after `cursor`.
+    An invalid cursor falls back to the first page. Pass count_cap=None to
+    skip counting. `row_factory`, if given, converts each fetched row (e.g.
+    a .values() dict into a property card) once the cursors are taken.
+    """
+    ordering = list(ordering)
+    count, count_capped = (None, False)
+    if count_cap:
+        count, count_capped = capped_count(queryset, count_cap)
+
+    values, direction = None, 'next'
+    if cursor:
+        try:
+            values, direction = decode_cursor(cursor)
+            if len(values) != len(ordering):
+                raise InvalidCursor('Cursor does not match ordering')
+            values = [
+                _decode_value(queryset.model, _field_name(field), value)
+                for field, value in zip(ordering, values)
+            ]
+        except InvalidCursor:
+            values, direction = None, 'next'
+
+    backwards = direction == 'prev'
+    page_qs = queryset.order_by(*(_reverse_ordering(ordering) if backwards else ordering))
+    if values is not None:
+        page_qs = page_qs.filter(keyset_filter(ordering, values, reverse=backwards))
+
+    rows = list(page_qs[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if backwards:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, values is not None
+
+    page = CursorPage(rows, ordering, has_next, has_previous, count, count_capped)
+    if row_factory is not None:
+        page.object_list = [row_factory(row) for row in rows]
+    return page
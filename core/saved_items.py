@@ -0,0 +1,75 @@
+"""
+The signed-in user's saved listings and wishlisted products, as ID sets.
+
+Both sets are loaded with one values_list query each, cached per user,
+and dropped by listings/signals.py and shop/signals.py when a row is
+added or removed. Pages then answer "is this saved?" with a set lookup
+instead of a query per item. Templates get them through the
+`saved_items` context processor:
+
+    {% if prop.id in saved_items.properties %}...{% endif %}
+    {% if product.id in saved_items.products %}...{% endif %}
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+SAVED_ITEMS_TIMEOUT = 60 * 60 * 24
+
+
+def _cache_key(kind, user_id):
+    return f'saved-items:{kind}:{user_id}'
+
+
+def _load(kind, user, query):
+    if not user.is_authenticated:
+        return frozenset()
+    key = _cache_key(kind, user.pk)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(query(user))
+        cache.set(key, ids, SAVED_ITEMS_TIMEOUT)
+    return ids
+
+
+def saved_property_ids(user):
+    from listings.models import SavedProperty
+
+    return _load(
+        'properties', user,
+        lambda u: SavedProperty.objects.filter(user=u).values_list('property_id', flat=True),
+    )
+
+
+def wishlisted_product_ids(user):
+    from shop.models import Wishlist
+
+    return _load(
+        'products', user,
+        lambda u: Wishlist.objects.filter(user=u).values_list('product_id', flat=True),
+    )
+
+
+def invalidate(kind, user_id):
+    """Drop a user's cached set once the change is committed (so it can't be re-read stale)"""
+    transaction.on_commit(lambda: cache.delete(_cache_key(kind, user_id)))
+
+
+class SavedItems:
+    """Per-request view of a user's sets; each is loaded on first use"""
+
+    def __init__(self, user):
+        self.user = user
+        self._properties = None
+        self._products = None
+
+    @property
+    def properties(self):
+        if self._properties is None:
+            self._properties = saved_property_ids(self.user)
+        return self._properties
+
+    @property
+    def products(self):
+        if self._products is None:
+            self._products = wishlisted_product_ids(self.user)
+        return self._products
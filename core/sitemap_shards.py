@@ -0,0 +1,210 @@
+"""
+Pre-generated, sharded sitemaps.
+
+Each model sitemap in SHARDED_SITEMAPS is split by primary key into
+fixed ranges of SITEMAP_SHARD_SIZE ids. Shard k covers ids
+[k * size, (k + 1) * size). A row therefore always lives in the same
+shard, and editing it only rewrites that one file:
+
+    SITEMAP_ROOT/sitemap.xml                  index of every shard
+    SITEMAP_ROOT/properties-0.xml.gz          ids 0..size-1
+    SITEMAP_ROOT/properties-1.xml.gz          ...
+
+`manage.py generate_sitemaps` keeps the files current. For each section
+it finds the shards touched since the last run:
+- rows whose updated field is past the stored watermark;
+- shards whose live row count no longer matches the manifest, which
+  catches deletions.
+Only those shards are rewritten, then the index. State lives in
+SITEMAP_ROOT/manifest.json.
+
+Sections in SMALL_SITEMAPS are rewritten whole on every run, in chunks
+of SITEMAP_SHARD_SIZE. That covers static pages and products: products
+have UUID keys, which can't be split into id ranges, and the catalogue
+is small.
+
+The files are served from disk by core.views.sitemap_file, or straight
+from the directory by a front-end server.
+"""
+import gzip
+import json
+import os
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Count, F
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .sitemaps import BlogSitemap, ProductSitemap, PropertySitemap, StaticPagesSitemap
+
+# section -> sitemap over an integer primary key (must define `updated_field`)
+SHARDED_SITEMAPS = {
+    'properties': PropertySitemap,
+    'blog': BlogSitemap,
+}
+
+# section -> sitemap small enough to rewrite every run
+SMALL_SITEMAPS = {
+    'products': ProductSitemap,
+    'static': StaticPagesSitemap,
+}
+
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+
+
+def sitemap_root():
+    return getattr(settings, 'SITEMAP_ROOT', os.path.join(settings.BASE_DIR, 'sitemaps'))
+
+
+def shard_size():
+    return getattr(settings, 'SITEMAP_SHARD_SIZE', 10000)
+
+
+def shard_filename(section, number):
+    return f'{section}-{number}.xml.gz'
+
+
+def _write_atomic(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'sections': {}}
+
+
+def _url_entry(sitemap, item):
+    lastmod = sitemap.lastmod(item) if hasattr(sitemap, 'lastmod') else None
+    return {
+        'item': item,
+        'location': f'{settings.SITE_URL}{sitemap.location(item)}',
+        'lastmod': lastmod,
+        'changefreq': sitemap.changefreq,
+        'priority': str(sitemap.priority) if sitemap.priority is not None else '',
+        'alternates': [],
+    }
+
+
+def _write_urlset(root, filename, sitemap, items):
+    urlset = [_url_entry(sitemap, item) for item in items]
+    xml = render_to_string('sitemap.xml', {'urlset': urlset})
+    # mtime=0 so unchanged content produces identical bytes
+    _write_atomic(os.path.join(root, filename), gzip.compress(xml.encode('utf-8'), mtime=0))
+    lastmods = [entry['lastmod'] for entry in urlset if entry['lastmod']]
+    return len(urlset), max(lastmods).isoformat() if lastmods else None
+
+
+def _live_counts(sitemap, size):
+    """{shard number: rows} for every shard with at least one live row"""
+    rows = (
+        sitemap.items().order_by()
+        .annotate(shard=F('pk') / size)
+        .values('shard')
+        .annotate(rows=Count('pk'))
+    )
+    return {row['shard']: row['rows'] for row in rows}
+
+
+def _dirty_shards(sitemap, state, size, full):
+    live = _live_counts(sitemap, size)
+    if full or state.get('watermark') is None or state.get('shard_size') != size:
+        return set(live) | {int(k) for k in state.get('shards', {})}, live
+
+    watermark = datetime.fromisoformat(state['watermark'])
+    model = sitemap.items().model
+    # All rows, not just live ones: a row that went inactive must leave its shard
+    changed = (
+        model._default_manager.filter(**{f'{sitemap.updated_field}__gt': watermark})
+        .order_by()
+        .annotate(shard=F('pk') / size)
+        .values_list('shard', flat=True)
+        .distinct()
+    )
+    dirty = set(changed)
+    shards = state.get('shards', {})
+    for number in set(live) | {int(k) for k in shards}:
+        if live.get(number, 0) != shards.get(str(number), {}).get('count', 0):
+            dirty.add(number)
+    return dirty, live
+
+
+def _generate_section(root, section, sitemap, state, size, full):
+    """Rewrite the dirty shards of one section; returns the numbers rewritten"""
+    started = timezone.now()
+    dirty, live = _dirty_shards(sitemap, state, size, full)
+    shards = state.setdefault('shards', {})
+    for number in sorted(dirty):
+        filename = shard_filename(section, number)
+        if not live.get(number):
+            shards.pop(str(number), None)
+            try:
+                os.remove(os.path.join(root, filename))
+            except FileNotFoundError:
+                pass
+            continue
+        items = sitemap.items().filter(pk__gte=number * size, pk__lt=(number + 1) * size).order_by('pk')
+        count, lastmod = _write_urlset(root, filename, sitemap, items)
+        shards[str(number)] = {'count': count, 'lastmod': lastmod}
+    state['watermark'] = started.isoformat()
+    state['shard_size'] = size
+    return sorted(dirty)
+
+
+def _generate_small_section(root, section, sitemap, state, size):
+    items = list(sitemap.items())
+    shards = {}
+    for number, start in enumerate(range(0, len(items), size)):
+        count, lastmod = _write_urlset(root, shard_filename(section, number), sitemap, items[start:start + size])
+        shards[str(number)] = {'count': count, 'lastmod': lastmod}
+    for number in set(state.get('shards', {})) - set(shards):
+        try:
+            os.remove(os.path.join(root, shard_filename(section, number)))
+        except FileNotFoundError:
+            pass
+    state['shards'] = shards
+    return [int(number) for number in shards]
+
+
+def _write_index(root, manifest):
+    entries = []
+    for section, state in manifest['sections'].items():
+        for number, shard in sorted(state.get('shards', {}).items(), key=lambda kv: int(kv[0])):
+            entries.append({
+                'location': f"{settings.SITE_URL}/sitemaps/{shard_filename(section, number)}",
+                'last_mod': datetime.fromisoformat(shard['lastmod']) if shard.get('lastmod') else None,
+            })
+    xml = render_to_string('sitemap_index.xml', {'sitemaps': entries})
+    _write_atomic(os.path.join(root, INDEX_NAME), xml.encode('utf-8'))
+    return len(entries)
+
+
+def generate_sitemaps(full=False):
+    """
+    Bring the sitemap files up to date. Returns
+    {section: [shard numbers rewritten]} plus the index size under 'index'.
+    """
+    root = sitemap_root()
+    os.makedirs(root, exist_ok=True)
+    size = shard_size()
+    manifest = load_manifest(root)
+    sections = manifest.setdefault('sections', {})
+
+    written = {}
+    for section, sitemap_class in SHARDED_SITEMAPS.items():
+        written[section] = _generate_section(
+            root, section, sitemap_class(), sections.setdefault(section, {}), size, full,
+        )
+    for section, sitemap_class in SMALL_SITEMAPS.items():
+        written[section] = _generate_small_section(root, section, sitemap_class(), sections.setdefault(section, {}), size)
+
+    written['index'] = _write_index(root, manifest)
+    _write_atomic(os.path.join(root, MANIFEST_NAME), json.dumps(manifest, indent=2).encode('utf-8'))
+    return written
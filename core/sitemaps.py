@@ -12,6 +12,7 @@ class PropertySitemap(Sitemap):
     """Sitemap for property listings"""
     changefreq = "daily"
     priority = 0.9
+    updated_field = 'updated_at'  # watermark for generate_sitemaps
     
     def items(self):
         return Property.objects.filter(is_active=True).select_related('city', 'state')
@@ -42,6 +43,7 @@ class BlogSitemap(Sitemap):
     """Sitemap for blog posts"""
     changefreq = "monthly"
     priority = 0.7
+    updated_field = 'updated'  # watermark for generate_sitemaps
     
     def items(self):
         return Post.objects.filter(status='published').select_related('author', 'category')
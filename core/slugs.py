@@ -0,0 +1,92 @@
+"""
+Unique slug allocation.
+
+Slugs are `base`, `base-1`, `base-2`... The next free suffix for a base
+comes from one prefix query that loads the slugs already using it, rather
+than probing candidates one `exists()` at a time. A SlugAllocator
+remembers the counter per base, so bulk imports pay that query once per
+distinct title instead of once per row.
+
+Two concurrent inserts can still pick the same slug. save_with_unique_slug
+runs the save in a savepoint and, if the slug turned out to be taken,
+allocates again.
+"""
+import re
+
+from django.db import IntegrityError, transaction
+from django.utils.text import slugify
+
+SLUG_ATTEMPTS = 5
+SUFFIX_RESERVE = 6  # room for "-NNNNN" within the field's max_length
+
+
+class SlugAllocator:
+    """Hands out unique slugs for one model field"""
+
+    def __init__(self, model, field='slug'):
+        self.model = model
+        self.field = field
+        self.max_length = model._meta.get_field(field).max_length
+        self._next = {}      # base -> next suffix to try (0 = the bare base)
+        self._issued = set()  # slugs handed out by this allocator
+
+    def base_for(self, text):
+        base = slugify(text or '')[:self.max_length - SUFFIX_RESERVE].strip('-')
+        return base or self.model._meta.model_name
+
+    def _first_free_suffix(self, base):
+        pattern = re.compile(rf'^{re.escape(base)}(?:-(\d+))?$')
+        taken = self.model._default_manager.filter(
+            **{f'{self.field}__startswith': base}
+        ).values_list(self.field, flat=True)
+        highest = -1
+        for slug in taken:
+            match = pattern.match(slug or '')
+            if match:
+                highest = max(highest, int(match.group(1) or 0))
+        return highest + 1
+
+    def allocate(self, text):
+        """Next unused slug for `text`"""
+        base = self.base_for(text)
+        if base not in self._next:
+            self._next[base] = self._first_free_suffix(base)
+        while True:
+            suffix = self._next[base]
+            self._next[base] = suffix + 1
+            slug = f'{base}-{suffix}' if suffix else base
+            # Another base can produce the same string ("flat-1" vs "flat" + 1)
+            if slug not in self._issued:
+                self._issued.add(slug)
+                return slug
+
+    def forget(self, text):
+        """Drop the cached counter for `text`, e.g. after losing an insert race"""
+        self._next.pop(self.base_for(text), None)
+
+
+def unique_slug(model, text, field='slug'):
+    """One unique slug for `text` (a single prefix query)"""
+    return SlugAllocator(model, field).allocate(text)
+
+
+def save_with_unique_slug(instance, text, save, field='slug', attempts=SLUG_ATTEMPTS):
+    """
+    Assign a free slug derived from `text` to `instance` and call `save()`
+    (normally the model's super().save). A slug collision from a concurrent
+    insert is retried with a freshly allocated slug; other integrity errors
+    propagate.
+    """
+    allocator = SlugAllocator(type(instance), field)
+    for attempt in range(attempts):
+        setattr(instance, field, allocator.allocate(text))
+        try:
+            with transaction.atomic():
+                save()
+            return
+        except IntegrityError:
+            slug = getattr(instance, field)
+            taken = type(instance)._default_manager.filter(**{field: slug}).exists()
+            if not taken or attempt == attempts - 1:
+                raise
+            allocator.forget(text)
@@ -0,0 +1,54 @@
+from django import template
+from django.utils.html import format_html
+
+from core.images import VARIANTS, is_ready, variant_name
+
+register = template.Library()
+
+
+def _ready(field_file):
+    return bool(field_file) and is_ready(field_file.storage, field_file.name)
+
+
+@register.simple_tag
+def variant_url(field_file, variant='card', fmt='jpg'):
+    """URL of one resized variant, or of the original until variants exist"""
+    if not field_file:
+        return ''
+    if _ready(field_file):
+        return field_file.storage.url(variant_name(field_file.name, variant, fmt))
+    return field_file.url
+
+
+@register.simple_tag
+def srcset(field_file, fmt='webp'):
+    """`srcset` value listing every variant width (just the original until variants exist)"""
+    if not field_file:
+        return ''
+    if not _ready(field_file):
+        return field_file.url
+    storage = field_file.storage
+    return ', '.join(
+        f'{storage.url(variant_name(field_file.name, variant, fmt))} {width}w'
+        for variant, width in VARIANTS.items()
+    )
+
+
+@register.simple_tag
+def picture(field_file, alt='', sizes='100vw', variant='card', css_class='', loading='lazy'):
+    """
+    {% picture prop.featured_image alt=prop.title sizes="(max-width: 768px) 100vw, 50vw" %}
+    WebP variants with a JPEG fallback, or a plain <img> of the original.
+    """
+    if not field_file:
+        return ''
+    if not _ready(field_file):
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}">', field_file.url, alt, css_class, loading,
+        )
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="{}"></picture>',
+        srcset(field_file, 'webp'), sizes,
+        variant_url(field_file, variant, 'jpg'), srcset(field_file, 'jpg'), sizes, alt, css_class, loading,
+    )
@@ -1,3 +1,309 @@
-from django.test import TestCase
+import gzip
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from listings.models import SavedProperty
+from property.models import Property
+from property.tests import PropertyDataMixin
+from shop.models import Wishlist
+from shop.tests import make_product
+from . import counters
+from .models import EngagementBucket
+from .pagination import InvalidCursor, decode_cursor, encode_cursor, paginate_by_cursor
+from .saved_items import saved_property_ids, wishlisted_product_ids
+from .sitemap_shards import INDEX_NAME, generate_sitemaps, load_manifest, shard_filename
+from .slugs import SlugAllocator
+
+
+def walk(queryset, ordering, per_page):
+    """Every page forwards from the first; returns the pages' rows"""
+    pages, cursor = [], None
+    while True:
+        page = paginate_by_cursor(queryset, ordering, cursor=cursor, per_page=per_page)
+        pages.append(list(page))
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+        if len(pages) > 100:
+            raise AssertionError('Pagination did not terminate')
+
+
+class CursorPaginationTests(PropertyDataMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Repeated prices, so pages have to break ties on id
+        cls.properties = [cls.make_property(price=Decimal(1000 * (i % 4))) for i in range(11)]
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(['2026-01-01T00:00:00', 0.1 + 0.2, 7], 'prev')
+        self.assertEqual(decode_cursor(cursor), (['2026-01-01T00:00:00', 0.1 + 0.2, 7], 'prev'))
+        with self.assertRaises(InvalidCursor):
+            decode_cursor('not a cursor')
+
+    def test_walk_visits_every_row_once(self):
+        for ordering in [('-created_at', '-id'), ('price', 'id'), ('-price', '-id')]:
+            with self.subTest(ordering=ordering):
+                pages = walk(Property.objects.all(), ordering, per_page=3)
+                seen = [prop.pk for page in pages for prop in page]
+                self.assertEqual(len(seen), len(set(seen)))
+                self.assertEqual(seen, list(Property.objects.order_by(*ordering).values_list('pk', flat=True)))
+                self.assertEqual([len(page) for page in pages], [3, 3, 3, 2])
+
+    def test_previous_cursor(self):
+        ordering = ('price', 'id')
+        first = paginate_by_cursor(Property.objects.all(), ordering, per_page=4)
+        second = paginate_by_cursor(Property.objects.all(), ordering, cursor=first.next_cursor, per_page=4)
+        self.assertTrue(second.has_previous())
+        back = paginate_by_cursor(Property.objects.all(), ordering, cursor=second.previous_cursor, per_page=4)
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(first.has_previous())
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        ordering = ('-created_at', '-id')
+        first = paginate_by_cursor(Property.objects.all(), ordering, per_page=5)
+        for cursor in ['garbage', encode_cursor([1], 'next'), encode_cursor(['not a date', 1], 'next')]:
+            with self.subTest(cursor=cursor):
+                page = paginate_by_cursor(Property.objects.all(), ordering, cursor=cursor, per_page=5)
+                self.assertEqual(list(page), list(first))
+
+    def test_capped_count(self):
+        page = paginate_by_cursor(Property.objects.all(), ('-id',), per_page=2, count_cap=5)
+        self.assertEqual((page.count, page.count_capped, page.count_display), (5, True, '5+'))
+        page = paginate_by_cursor(Property.objects.all(), ('-id',), per_page=2, count_cap=50)
+        self.assertEqual((page.count, page.count_capped), (11, False))
+
+
+class FakeRedis:
+    """The few Redis set commands core.counters uses, in memory"""
+
+    def __init__(self):
+        self.sets = {}
+
+    def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(str(member).encode())
+
+    def pipeline(self):
+        redis, commands = self, []
+
+        class Pipeline:
+            def smembers(self, key):
+                commands.append(lambda: set(redis.sets.get(key, set())))
+
+            def delete(self, key):
+                commands.append(lambda: redis.sets.pop(key, None) is not None)
+
+            def execute(self):
+                return [command() for command in commands]
+
+        return Pipeline()
+
+
+class CounterTests(PropertyDataMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.prop = self.make_property()
+
+    def view(self, visitor):
+        request = RequestFactory().get('/', REMOTE_ADDR=visitor)
+        return counters.record_view(request, self.prop)
+
+    def views(self):
+        return Property.objects.values_list('views_count', flat=True).get(pk=self.prop.pk)
+
+    def view_events(self):
+        return EngagementBucket.objects.filter(event='view').aggregate(total=Sum('count'))['total'] or 0
+
+    def test_without_redis_views_are_written_straight_through(self):
+        self.assertFalse(counters.is_buffered())
+        self.assertTrue(self.view('10.0.0.1'))
+        self.assertFalse(self.view('10.0.0.1'))  # same visitor, within the window
+        self.assertTrue(self.view('10.0.0.2'))
+        self.assertEqual(self.views(), 2)
+        self.assertEqual(self.view_events(), 2)
+        self.assertEqual(counters.flush_counters(), 0)
+
+        out = StringIO()
+        call_command('flush_counters', stdout=out)
+        self.assertIn('nothing to flush', out.getvalue())
+
+    def test_with_redis_views_are_buffered_until_flushed(self):
+        redis = FakeRedis()
+        with mock.patch('core.counters._redis', return_value=redis), \
+                mock.patch('core.counters.maybe_flush'):
+            for visitor in ['10.0.0.1', '10.0.0.2', '10.0.0.3']:
+                self.assertTrue(self.view(visitor))
+            self.assertEqual(self.views(), 0)
+            self.assertEqual(counters.pending_count(self.prop), 3)
+
+            out = StringIO()
+            call_command('flush_counters', stdout=out)
+            self.assertIn('Flushed counters for 1 rows', out.getvalue())
+            self.assertEqual(self.views(), 3)
+            self.assertEqual(self.view_events(), 3)
+            self.assertEqual(counters.pending_count(self.prop), 0)
+            # Drained: a second flush writes nothing
+            self.assertEqual(counters.flush_counters(), 0)
+            self.assertEqual(self.views(), 3)
+
+
+class SlugAllocatorTests(PropertyDataMixin, TestCase):
+    def test_next_free_suffix_from_one_query_per_base(self):
+        self.make_property(title='Garden Flat')
+        self.make_property(title='Garden Flat')
+        self.make_property(title='Garden Flat 2')  # "garden-flat-2" is taken by another base
+        self.assertEqual(
+            set(Property.objects.values_list('slug', flat=True)), {'garden-flat', 'garden-flat-1', 'garden-flat-2'},
+        )
+
+        slugs = SlugAllocator(Property)
+        with CaptureQueriesContext(connection) as queries:
+            issued = [slugs.allocate('Garden Flat') for _ in range(3)]
+        self.assertEqual(issued, ['garden-flat-3', 'garden-flat-4', 'garden-flat-5'])
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(slugs.allocate('!!!'), 'property')
+
+    def test_create_dummy_properties_gives_unique_slugs(self):
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            for _ in range(2):
+                call_command('create_dummy_properties', stdout=StringIO())
+        slugs = list(Property.objects.values_list('slug', flat=True))
+        self.assertEqual(len(slugs), 40)
+        self.assertEqual(len(set(slugs)), 40)
+
+
+class SitemapShardTests(PropertyDataMixin, TestCase):
+    size = 3
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        overrides = override_settings(SITEMAP_ROOT=self.root, SITEMAP_SHARD_SIZE=self.size)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.properties = [self.make_property(title=f'Listing {i}') for i in range(7)]
+
+    def shard_of(self, prop):
+        return prop.pk // self.size
+
+    def shard_xml(self, number):
+        with gzip.open(os.path.join(self.root, shard_filename('properties', number))) as f:
+            return f.read().decode()
+
+    def test_full_run_writes_every_shard_and_the_index(self):
+        written = generate_sitemaps()
+        shards = sorted({self.shard_of(prop) for prop in self.properties})
+        self.assertEqual(written['properties'], shards)
+        for prop in self.properties:
+            self.assertIn(f'/property/{prop.slug}/', self.shard_xml(self.shard_of(prop)))
+        with open(os.path.join(self.root, INDEX_NAME)) as f:
+            index = f.read()
+        for number in shards:
+            self.assertIn(shard_filename('properties', number), index)
+
+    def test_unchanged_run_rewrites_nothing(self):
+        generate_sitemaps()
+        self.assertEqual(generate_sitemaps()['properties'], [])
+
+    def test_edit_rewrites_only_its_shard(self):
+        generate_sitemaps()
+        prop = self.properties[4]
+        prop.title = 'Renamed'
+        prop.slug = 'renamed'
+        prop.save()
+        self.assertEqual(generate_sitemaps()['properties'], [self.shard_of(prop)])
+        self.assertIn('/property/renamed/', self.shard_xml(self.shard_of(prop)))
+
+    def test_deactivated_and_deleted_rows_leave_their_shards(self):
+        generate_sitemaps()
+        # Seven consecutive ids fill at least one shard of three
+        shard = next(number for number in {self.shard_of(prop) for prop in self.properties}
+                     if sum(self.shard_of(prop) == number for prop in self.properties) == self.size)
+        hidden, deleted, kept = [prop for prop in self.properties if self.shard_of(prop) == shard]
+        hidden.is_active = False
+        hidden.save()
+        deleted.delete()
+
+        self.assertEqual(generate_sitemaps()['properties'], [shard])
+        xml = self.shard_xml(shard)
+        self.assertNotIn(f'/property/{hidden.slug}/', xml)
+        self.assertNotIn(f'/property/{deleted.slug}/', xml)
+        self.assertIn(f'/property/{kept.slug}/', xml)
+
+    def test_emptied_shard_is_removed(self):
+        generate_sitemaps()
+        last = self.shard_of(self.properties[-1])
+        Property.objects.filter(pk__gte=last * self.size).delete()
+        self.assertEqual(generate_sitemaps()['properties'], [last])
+        self.assertFalse(os.path.exists(os.path.join(self.root, shard_filename('properties', last))))
+        manifest = load_manifest(self.root)
+        self.assertNotIn(str(last), manifest['sections']['properties']['shards'])
+
+    def test_shard_size_change_rewrites_everything(self):
+        old_shards = set(generate_sitemaps()['properties'])
+        new_shards = {prop.pk // 100 for prop in self.properties}
+        with override_settings(SITEMAP_SHARD_SIZE=100):
+            self.assertEqual(generate_sitemaps()['properties'], sorted(old_shards | new_shards))
+        shards = load_manifest(self.root)['sections']['properties']['shards']
+        self.assertEqual(set(shards), {str(number) for number in new_shards})
+        self.assertEqual(sum(shard['count'] for shard in shards.values()), len(self.properties))
+
+
+class SavedItemsTests(PropertyDataMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.prop = self.make_property()
+
+    def test_ids_are_cached_until_a_committed_change(self):
+        self.assertEqual(saved_property_ids(self.user), frozenset())
+        with self.assertNumQueries(0):
+            saved_property_ids(self.user)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            saved = SavedProperty.objects.create(user=self.user, property=self.prop)
+            # Dropped only once the save commits
+            self.assertEqual(saved_property_ids(self.user), frozenset())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(saved_property_ids(self.user), {self.prop.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            saved.delete()
+        self.assertEqual(saved_property_ids(self.user), frozenset())
+
+    def test_wishlist_ids(self):
+        product = make_product()
+        self.assertEqual(wishlisted_product_ids(self.user), frozenset())
+        with self.captureOnCommitCallbacks(execute=True):
+            item = Wishlist.objects.create(user=self.user, product=product)
+        self.assertEqual(wishlisted_product_ids(self.user), {product.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            item.delete()
+        self.assertEqual(wishlisted_product_ids(self.user), frozenset())
+
+    def test_anonymous_users_have_nothing_saved(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(saved_property_ids(AnonymousUser()), frozenset())
+            self.assertEqual(wishlisted_product_ids(AnonymousUser()), frozenset())
+
+    def test_list_page_marks_saved_cards(self):
+        other = self.make_property(title='Garden Terrace')
+        self.client.force_login(self.user)
+        self.assertNotContains(self.client.get(reverse('properties')), 'favorite-btn saved')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SavedProperty.objects.create(user=self.user, property=other)
+        self.assertContains(self.client.get(reverse('properties')), 'favorite-btn saved', count=1)
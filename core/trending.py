@@ -0,0 +1,163 @@
+"""
+Time-bucketed engagement and "trending" rankings.
+
+Events (views, saves, cart adds, applications) are counted per object in
+hourly EngagementBucket rows. A bucket's row is only written while its
+hour is current: views arrive in batches from the buffered counters
+(core/counters.py), and the rarer events one at a time.
+
+`rollup_buckets` folds hourly rows older than HOURLY_RETENTION into one
+row per day and drops daily rows past DAILY_RETENTION, so the table stays
+small. `compute_trending` scores every object as
+
+    sum(weight[event] * count * 0.5 ** (age_hours / HALF_LIFE_HOURS))
+
+over the last TRENDING_WINDOW, and stores the results in TrendingScore.
+The `trending` sort options read that table through `annotate_trending`.
+"""
+import math
+from datetime import timedelta
+
+import numpy as np
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import CharField, F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, TruncDay
+from django.utils import timezone
+
+from .models import EngagementBucket, TrendingScore
+
+EVENT_WEIGHTS = {
+    'view': 1.0,
+    'save': 5.0,
+    'cart_add': 4.0,
+    'application': 8.0,
+}
+
+HALF_LIFE_HOURS = 48
+TRENDING_WINDOW = timedelta(days=14)
+HOURLY_RETENTION = timedelta(hours=48)
+DAILY_RETENTION = timedelta(days=90)
+
+
+def _hour_start(when):
+    return when.replace(minute=0, second=0, microsecond=0)
+
+
+def object_key(model, pk):
+    """
+    object_id for a primary key, in the form the database gives for
+    CAST(pk AS text) so annotate_trending() can join on it (UUIDs are
+    stored without dashes on SQLite, with them on PostgreSQL).
+    """
+    return str(model._meta.pk.get_db_prep_value(model._meta.pk.to_python(pk), connection))
+
+
+def _add_counts(content_type_id, event, granularity, bucket_start, amounts):
+    """Add {object_id: n} onto existing buckets, creating the missing ones"""
+    amounts = {object_id: n for object_id, n in amounts.items() if n}
+    if not amounts:
+        return
+    buckets = EngagementBucket.objects.filter(
+        content_type_id=content_type_id, event=event, granularity=granularity, bucket_start=bucket_start,
+    )
+    existing = set(buckets.filter(object_id__in=list(amounts)).values_list('object_id', flat=True))
+
+    by_amount = {}
+    for object_id in existing:
+        by_amount.setdefault(amounts[object_id], []).append(object_id)
+    for amount, object_ids in by_amount.items():
+        buckets.filter(object_id__in=object_ids).update(count=F('count') + amount)
+
+    EngagementBucket.objects.bulk_create([
+        EngagementBucket(
+            content_type_id=content_type_id, object_id=object_id, event=event,
+            granularity=granularity, bucket_start=bucket_start, count=amount,
+        )
+        for object_id, amount in amounts.items() if object_id not in existing
+    ], ignore_conflicts=True)
+
+
+def record_events(model, event, amounts, when=None):
+    """Count `event` for several objects of `model` at once ({pk: n})"""
+    content_type = ContentType.objects.get_for_model(model)
+    amounts = {object_key(model, pk): n for pk, n in amounts.items()}
+    _add_counts(content_type.pk, event, EngagementBucket.HOUR, _hour_start(when or timezone.now()), amounts)
+
+
+def record_event(obj, event, amount=1):
+    record_events(type(obj), event, {obj.pk: amount})
+
+
+def rollup_buckets(now=None):
+    """
+    Fold old hourly buckets into daily ones and expire old daily buckets.
+    Returns (hourly rows folded, daily rows deleted).
+    """
+    now = now or timezone.now()
+    cutoff = _hour_start(now - HOURLY_RETENTION)
+    old_hourly = EngagementBucket.objects.filter(granularity=EngagementBucket.HOUR, bucket_start__lt=cutoff)
+
+    with transaction.atomic():
+        totals = (
+            old_hourly
+            .annotate(day=TruncDay('bucket_start'))
+            .values('content_type_id', 'object_id', 'event', 'day')
+            .annotate(total=Sum('count'))
+            .values_list('content_type_id', 'event', 'day', 'object_id', 'total')
+            .order_by()
+        )
+        groups = {}
+        for content_type_id, event, day, object_id, total in totals:
+            groups.setdefault((content_type_id, event, day), {})[object_id] = total
+        for (content_type_id, event, day), amounts in groups.items():
+            _add_counts(content_type_id, event, EngagementBucket.DAY, day, amounts)
+        folded, _ = old_hourly.delete()
+
+    expired, _ = EngagementBucket.objects.filter(
+        granularity=EngagementBucket.DAY, bucket_start__lt=now - DAILY_RETENTION,
+    ).delete()
+    return folded, expired
+
+
+def compute_trending(now=None, batch_size=1000):
+    """Rebuild TrendingScore from the buckets in the window. Returns the number of scores."""
+    now = now or timezone.now()
+    rows = list(
+        EngagementBucket.objects.filter(bucket_start__gte=now - TRENDING_WINDOW)
+        .values_list('content_type_id', 'object_id', 'event', 'granularity', 'bucket_start', 'count')
+    )
+    scores = []
+    if rows:
+        keys = {}
+        index = np.array([keys.setdefault((row[0], row[1]), len(keys)) for row in rows])
+        weights = np.array([EVENT_WEIGHTS.get(row[2], 0.0) for row in rows])
+        counts = np.array([row[5] for row in rows], dtype=float)
+        # Age measured from the middle of each bucket
+        half_width = np.array([0.5 if row[3] == EngagementBucket.HOUR else 12.0 for row in rows])
+        ages = np.array([(now - row[4]).total_seconds() / 3600.0 for row in rows]) - half_width
+        decay = np.exp(-math.log(2) * np.clip(ages, 0, None) / HALF_LIFE_HOURS)
+
+        totals = np.bincount(index, weights=weights * counts * decay, minlength=len(keys))
+        scores = [
+            TrendingScore(content_type_id=content_type_id, object_id=object_id, score=float(totals[i]))
+            for (content_type_id, object_id), i in keys.items()
+            if totals[i] > 0
+        ]
+
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+        TrendingScore.objects.bulk_create(scores, batch_size=batch_size)
+    return len(scores)
+
+
+def annotate_trending(queryset):
+    """Annotate `trending_score` (0 when unscored) for the `trending` sort options"""
+    content_type = ContentType.objects.get_for_model(queryset.model)
+    score = TrendingScore.objects.filter(
+        content_type=content_type,
+        object_id=Cast(OuterRef('pk'), CharField()),
+    ).values('score')[:1]
+    return queryset.annotate(
+        trending_score=Coalesce(Subquery(score, output_field=FloatField()), Value(0.0))
+    )
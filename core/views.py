@@ -29,26 +29,31 @@ def properties_page(request):
 def agents(request):
     """Display all verified agents"""
     from agents.models import Agent
-    from django.core.paginator import Paginator
+    from core.pagination import paginate_by_cursor
     
     # Get all verified agents
     agents_list = Agent.objects.filter(
         is_active=True,
         verification_status='verified'
-    ).select_related('user').order_by('-created')
+    ).select_related('user')
     
-    # Pagination
-    paginator = Paginator(agents_list, 12)  # 12 agents per page
-    page_number = request.GET.get('page')
-    agents = paginator.get_page(page_number)
+    # Keyset pagination - 12 agents per page, total capped at 1,000+
+    agents = paginate_by_cursor(
+        agents_list, ('-created', '-id'),
+        cursor=request.GET.get('cursor'),
+        per_page=12,
+    )
     
-    # Get featured agent (first verified agent or None)
-    featured_agent = agents_list.first() if agents_list.exists() else None
+    # Get featured agent (newest verified agent or None)
+    if agents and not agents.has_previous():
+        featured_agent = agents[0]
+    else:
+        featured_agent = agents_list.order_by('-created', '-id').first()
     
     context = {
         'agents': agents,
         'featured_agent': featured_agent,
-        'total_agents': agents_list.count(),
+        'total_agents': agents.count_display,
     }
     
     return render(request, "estate/agents.html", context)
@@ -82,3 +87,25 @@ def dashboard_user(request):
     return render(request, "estate/dashboard.html")
 
 
+def sitemap_file(request, filename='sitemap.xml'):
+    """
+    Serve a pre-generated sitemap file (see core/sitemap_shards.py). Until
+    generate_sitemaps has run, /sitemap.xml falls back to the live sitemap.
+    """
+    import os
+    from django.http import FileResponse, Http404
+    from .sitemap_shards import INDEX_NAME, sitemap_root
+
+    if filename != os.path.basename(filename) or not (filename == INDEX_NAME or filename.endswith('.xml.gz')):
+        raise Http404
+    path = os.path.join(sitemap_root(), filename)
+    if not os.path.exists(path):
+        if filename == INDEX_NAME:
+            from django.contrib.sitemaps.views import sitemap
+            from nestova.urls import sitemaps
+            return sitemap(request, sitemaps=sitemaps)
+        raise Http404
+    content_type = 'application/xml' if filename == INDEX_NAME else 'application/gzip'
+    response = FileResponse(open(path, 'rb'), content_type=content_type)
+    response['Cache-Control'] = 'public, max-age=3600'
+    return response
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ListingPackage, UserSubscription, SavedProperty, Notification
+from .models import ListingPackage, UserSubscription, SavedProperty, Notification, SavedSearch
 
 @admin.register(ListingPackage)
 class ListingPackageAdmin(admin.ModelAdmin):
@@ -101,6 +101,14 @@ class SavedPropertyAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'property__title']
     date_hierarchy = 'saved_at'
 
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ['user', 'name', 'index_key', 'email_alerts', 'is_active', 'created_at']
+    list_filter = ['is_active', 'email_alerts', 'created_at']
+    search_fields = ['user__username', 'user__email', 'name']
+    readonly_fields = ['index_key', 'needs_verification', 'created_at']
+    raw_id_fields = ['user', 'state', 'city']
+
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ['user', 'title', 'is_read', 'created_at']
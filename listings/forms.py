@@ -11,7 +11,7 @@ class PropertyForm(forms.ModelForm):
     class Meta:
         model = Property
         fields = [
-            'title', 'state', 'city', 'address', 'zip_code',
+            'title', 'state', 'city', 'address', 'zip_code', 'latitude', 'longitude',
             'property_type', 'status', 
             'bedrooms', 'bathrooms', 'square_feet', 'lot_size', 'year_built', 'parking_spaces',
             'price', 'description', 
@@ -22,6 +22,8 @@ class PropertyForm(forms.ModelForm):
         widgets = {
             'title': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Property Title'}),
             'address': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Full Address'}),
+            'latitude': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.000001', 'placeholder': 'e.g. 6.4474'}),
+            'longitude': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.000001', 'placeholder': 'e.g. 3.4700'}),
             'description': CKEditorWidget(config_name='default'),
             'price': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01', 'min': '0'}),
             'bedrooms': forms.NumberInput(attrs={'class': 'form-control'}),
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from listings.saved_searches import send_digests
+
+
+class Command(BaseCommand):
+    help = 'Emails each user a digest of new listings matching their saved searches'
+
+    def handle(self, *args, **options):
+        sent = send_digests()
+        self.stdout.write(self.style.SUCCESS(f'✓ Sent {sent} saved-search digests'))
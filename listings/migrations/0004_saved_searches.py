@@ -0,0 +1,146 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0003_add_slot_fields"),
+        ("property", "0018_market_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SavedSearch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=200)),
+                ("params", models.JSONField(default=dict)),
+                (
+                    "email_alerts",
+                    models.BooleanField(
+                        default=True, help_text="Include matches in the email digest"
+                    ),
+                ),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("index_key", models.CharField(editable=False, max_length=60)),
+                ("property_type", models.CharField(blank=True, max_length=50)),
+                ("listing_type", models.CharField(blank=True, max_length=20)),
+                (
+                    "min_price",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=15, null=True
+                    ),
+                ),
+                (
+                    "max_price",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=15, null=True
+                    ),
+                ),
+                ("min_bedrooms", models.PositiveIntegerField(blank=True, null=True)),
+                ("max_bedrooms", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "needs_verification",
+                    models.BooleanField(
+                        default=False,
+                        editable=False,
+                        help_text="Has filters (keywords, amenities...) checked against the listing itself",
+                    ),
+                ),
+                (
+                    "city",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="property.city",
+                    ),
+                ),
+                (
+                    "state",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="property.state",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="saved_searches",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Saved Searches",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SavedSearchMatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("matched_at", models.DateTimeField(auto_now_add=True)),
+                ("emailed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="property.property",
+                    ),
+                ),
+                (
+                    "saved_search",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="matches",
+                        to="listings.savedsearch",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="savedsearch",
+            index=models.Index(
+                fields=["index_key", "is_active"], name="listings_sa_index_k_d0d3e3_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savedsearchmatch",
+            index=models.Index(
+                fields=["emailed_at"], name="listings_sa_emailed_53ac35_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="savedsearchmatch",
+            unique_together={("saved_search", "property")},
+        ),
+    ]
@@ -158,3 +158,67 @@ class Notification(models.Model):
         
     def __str__(self):
         return f"Notification for {self.user}: {self.title}"
+
+
+class SavedSearch(models.Model):
+    """
+    A property_list filter set a user wants to be alerted about.
+
+    `params` keeps the filters as submitted. The columns below denormalise
+    the indexable ones so listings/saved_searches.py can find the searches
+    a listing matches without evaluating each one.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=200)
+    params = models.JSONField(default=dict)
+    email_alerts = models.BooleanField(default=True, help_text="Include matches in the email digest")
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    # Denormalised predicates (blank = no constraint)
+    index_key = models.CharField(max_length=60, editable=False)
+    state = models.ForeignKey('property.State', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    city = models.ForeignKey('property.City', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    property_type = models.CharField(max_length=50, blank=True)
+    listing_type = models.CharField(max_length=20, blank=True)
+    min_price = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    min_bedrooms = models.PositiveIntegerField(null=True, blank=True)
+    max_bedrooms = models.PositiveIntegerField(null=True, blank=True)
+    needs_verification = models.BooleanField(
+        default=False, editable=False,
+        help_text="Has filters (keywords, amenities...) checked against the listing itself",
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'Saved Searches'
+        indexes = [models.Index(fields=['index_key', 'is_active'])]
+
+    def __str__(self):
+        return f"{self.user}: {self.name}"
+
+    def save(self, *args, **kwargs):
+        from .saved_searches import apply_predicates
+        apply_predicates(self)
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        from django.urls import reverse
+        from urllib.parse import urlencode
+        return f"{reverse('properties')}?{urlencode(self.params)}"
+
+
+class SavedSearchMatch(models.Model):
+    """A listing that matched a saved search (each pair is alerted once)"""
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='matches')
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='+')
+    matched_at = models.DateTimeField(auto_now_add=True)
+    emailed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['saved_search', 'property']
+        indexes = [models.Index(fields=['emailed_at'])]
+
+    def __str__(self):
+        return f"{self.saved_search_id} ~ {self.property_id}"
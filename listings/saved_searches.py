@@ -0,0 +1,315 @@
+"""
+Saved-search alerts.
+
+A SavedSearch is filed under a single index key, its most selective
+equality predicate:
+- 'city:<id>', else
+- 'state:<id>', else
+- 'type:<name>', else
+- '*'.
+
+A listing can only match searches filed under its own city, state or type
+key (or '*'). One indexed query therefore narrows tens of thousands of
+searches to the few that concern the listing. The denormalised range
+columns (price band, bedrooms) are checked in the same query.
+
+Searches with filters those columns can't express (keywords, location
+text, amenities, bathrooms) are flagged needs_verification. They are
+confirmed by running property_list's own filters against that one
+listing, as one EXISTS column per search in a single query (per
+VERIFY_BATCH_SIZE searches). `match_properties` does the same for a
+batch of listings at once, e.g. after a bulk import. Params are validated when a search is
+saved, so a malformed filter can't break matching.
+
+Each (search, listing) pair is alerted at most once. New matches become
+Notification rows in bulk, and `send_saved_search_digests` emails them
+in one message per user.
+"""
+import logging
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.mail import send_mail
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from property.filters import filter_properties, normalize_filter_params, validate_filter_params
+from property.models import Property
+from .models import Notification, SavedSearch, SavedSearchMatch
+
+logger = logging.getLogger(__name__)
+
+# Listing fields that can change which searches a listing matches
+MATCH_FIELDS = frozenset([
+    'title', 'description', 'address', 'price', 'bedrooms', 'bathrooms', 'state', 'city',
+    'property_type', 'status', 'is_active', 'amenity_mask',
+])
+
+ALERT_STATUSES = ['for_sale', 'for_rent']
+
+# Filters the denormalised columns capture exactly
+INDEXED_PARAMS = frozenset([
+    'state_type', 'city_type', 'type', 'listing_type', 'min_price', 'max_price', 'bedrooms',
+])
+
+BATCH_SIZE = 1000
+VERIFY_BATCH_SIZE = 100  # EXISTS columns per verification query
+
+
+def _decimal(value):
+    try:
+        return Decimal(value)
+    except (InvalidOperation, TypeError):
+        return None
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_predicates(search):
+    """
+    Fill a SavedSearch's denormalised columns and index key from its
+    params. Raises property.filters.InvalidFilter for malformed values.
+    """
+    params = dict(normalize_filter_params(search.params))
+    validate_filter_params(params)
+    search.params = params
+    search.state_id = _int(params.get('state_type'))
+    search.city_id = _int(params.get('city_type'))
+    search.property_type = params.get('type', '')
+    listing_type = params.get('listing_type', '')
+    search.listing_type = '' if listing_type == 'buy' else listing_type
+    search.min_price = _decimal(params.get('min_price'))
+    search.max_price = _decimal(params.get('max_price'))
+
+    bedrooms = params.get('bedrooms', '')
+    search.min_bedrooms = _int(bedrooms.replace('+', '')) if bedrooms else None
+    search.max_bedrooms = None if '+' in bedrooms else search.min_bedrooms
+
+    search.needs_verification = any(name not in INDEXED_PARAMS for name in params)
+    if search.city_id:
+        search.index_key = f'city:{search.city_id}'
+    elif search.state_id:
+        search.index_key = f'state:{search.state_id}'
+    elif search.property_type:
+        search.index_key = f'type:{search.property_type}'
+    else:
+        search.index_key = '*'
+
+
+def describe(params):
+    """Default name for a search, e.g. '3+ bed Duplex in Lekki up to ₦50,000,000'"""
+    from property.models import City, PropertyType, State
+
+    params = dict(normalize_filter_params(params))
+    parts = []
+    if params.get('bedrooms'):
+        parts.append(f"{params['bedrooms']} bed")
+    type_labels = dict(PropertyType.TYPE_CHOICES)
+    parts.append(type_labels.get(params.get('type'), 'Properties'))
+    place = None
+    if _int(params.get('city_type')):
+        place = City.objects.filter(pk=params['city_type']).values_list('name', flat=True).first()
+    elif _int(params.get('state_type')):
+        place = State.objects.filter(pk=params['state_type']).values_list('name', flat=True).first()
+    place = place or params.get('location')
+    if place:
+        parts.append(f'in {place}')
+    if params.get('q'):
+        parts.append(f'matching "{params["q"]}"')
+    if _decimal(params.get('max_price')):
+        parts.append(f"up to ₦{_decimal(params['max_price']):,.0f}")
+    return ' '.join(parts)[:200]
+
+
+def _index_keys(prop):
+    return [f'city:{prop.city_id}', f'state:{prop.state_id}', f'type:{prop.property_type.name}', '*']
+
+
+def _accepts(search, prop):
+    """The indexed predicates, for one search and listing"""
+    return (
+        search.state_id in (None, prop.state_id)
+        and search.city_id in (None, prop.city_id)
+        and search.property_type in ('', prop.property_type.name)
+        and (search.min_price is None or search.min_price <= prop.price)
+        and (search.max_price is None or search.max_price >= prop.price)
+        and (search.min_bedrooms is None or search.min_bedrooms <= prop.bedrooms)
+        and (search.max_bedrooms is None or search.max_bedrooms >= prop.bedrooms)
+        # Same substring test as filter_properties' listing_type filter
+        and (not search.listing_type or search.listing_type.lower() in prop.status.name.lower())
+    )
+
+
+def candidate_pairs(props):
+    """
+    (search, listing) pairs whose indexed predicates match. One query
+    narrows the active searches to the listings' index keys and their
+    overall price and bedroom range; each pair is then checked exactly.
+    """
+    prices = [prop.price for prop in props]
+    bedrooms = [prop.bedrooms for prop in props]
+    searches = SavedSearch.objects.filter(
+        index_key__in={key for prop in props for key in _index_keys(prop)}, is_active=True,
+    ).filter(
+        Q(min_price__isnull=True) | Q(min_price__lte=max(prices)),
+        Q(max_price__isnull=True) | Q(max_price__gte=min(prices)),
+        Q(min_bedrooms__isnull=True) | Q(min_bedrooms__lte=max(bedrooms)),
+        Q(max_bedrooms__isnull=True) | Q(max_bedrooms__gte=min(bedrooms)),
+    ).only(
+        'id', 'user_id', 'name', 'params', 'index_key', 'state', 'city', 'property_type', 'listing_type',
+        'min_price', 'max_price', 'min_bedrooms', 'max_bedrooms', 'needs_verification',
+    )
+    by_key = {}
+    for search in searches:
+        by_key.setdefault(search.index_key, []).append(search)
+    for prop in props:
+        for key in _index_keys(prop):
+            for search in by_key.get(key, ()):
+                if _accepts(search, prop):
+                    yield search, prop
+
+
+def verified_pairs(pairs):
+    """
+    The (search id, listing id) of `pairs` whose full filters match. Each
+    search is an EXISTS column over the batch's listings, so a batch of
+    searches costs one query. A search whose stored params no longer
+    apply is logged and left out.
+    """
+    checks = {}
+    for search, _ in pairs:
+        name = f'search_{search.pk}'
+        if name in checks:
+            continue
+        try:
+            checks[name] = Exists(filter_properties(Property.objects.filter(pk=OuterRef('pk')), search.params))
+        except (ValueError, ValidationError) as e:
+            logger.warning(f"Skipping saved search {search.pk} with unusable params: {str(e)}")
+
+    found = set()
+    property_ids = {prop.pk for _, prop in pairs}
+    names = list(checks)
+    for start in range(0, len(names), VERIFY_BATCH_SIZE):
+        batch = {name: checks[name] for name in names[start:start + VERIFY_BATCH_SIZE]}
+        for row in Property.objects.filter(pk__in=property_ids).annotate(**batch).values('pk', *batch):
+            found.update((int(name.removeprefix('search_')), row['pk']) for name in batch if row[name])
+    return {(search.pk, prop.pk) for search, prop in pairs if (search.pk, prop.pk) in found}
+
+
+def match_properties(property_ids):
+    """
+    Record and notify the saved searches each listing newly matches, in
+    batches of BATCH_SIZE listings. Returns the number of new matches.
+    """
+    property_ids = list(property_ids)
+    return sum(
+        _match_batch(property_ids[start:start + BATCH_SIZE]) for start in range(0, len(property_ids), BATCH_SIZE)
+    )
+
+
+def match_property(property_id):
+    """Record and notify the saved searches a listing newly matches"""
+    return match_properties([property_id])
+
+
+def _match_batch(property_ids):
+    props = list(
+        Property.objects.select_related('status', 'property_type', 'city', 'state')
+        .filter(pk__in=property_ids, is_active=True, status__name__in=ALERT_STATUSES)
+    )
+    if not props:
+        return 0
+
+    already = set(
+        SavedSearchMatch.objects.filter(property__in=props).values_list('saved_search_id', 'property_id')
+    )
+    candidates = [(search, prop) for search, prop in candidate_pairs(props) if (search.pk, prop.pk) not in already]
+    verified = verified_pairs([(search, prop) for search, prop in candidates if search.needs_verification])
+    matched = [
+        (search, prop) for search, prop in candidates
+        if not search.needs_verification or (search.pk, prop.pk) in verified
+    ]
+    if not matched:
+        return 0
+
+    SavedSearchMatch.objects.bulk_create(
+        [SavedSearchMatch(saved_search=search, property=prop) for search, prop in matched],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    Notification.objects.bulk_create(
+        [
+            Notification(
+                user_id=search.user_id,
+                title=f'New match for "{search.name}"'[:200],
+                message=f"{prop.title} in {prop.city.name}, {prop.state.name} - {prop.formatted_price}",
+                link=prop.get_absolute_url(),
+            )
+            for search, prop in matched
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return len(matched)
+
+
+def send_digests():
+    """
+    Email each user one summary of their saved-search matches not emailed
+    yet. Returns the number of emails sent.
+    """
+    pending = (
+        SavedSearchMatch.objects.filter(
+            emailed_at__isnull=True,
+            saved_search__email_alerts=True,
+            saved_search__is_active=True,
+        )
+        .select_related('saved_search__user', 'property__city', 'property__state')
+        .order_by('saved_search__user_id', 'saved_search_id', '-matched_at')
+    )
+
+    by_user = {}
+    for match in pending.iterator(chunk_size=BATCH_SIZE):
+        by_user.setdefault(match.saved_search.user_id, []).append(match)
+
+    sent = 0
+    for matches in by_user.values():
+        user = matches[0].saved_search.user
+        if not user.email:
+            continue
+        lines = []
+        current = None
+        for match in matches:
+            if match.saved_search_id != current:
+                current = match.saved_search_id
+                lines.append(f'\n{match.saved_search.name}:')
+            prop = match.property
+            lines.append(
+                f'  - {prop.title}, {prop.city.name} ({prop.formatted_price}): '
+                f'{settings.SITE_URL}{prop.get_absolute_url()}'
+            )
+        body = (
+            f"Dear {user.first_name or user.username},\n\n"
+            f"New listings match your saved searches:\n" + '\n'.join(lines) +
+            "\n\nBest regards,\nThe Nestova Team"
+        )
+        try:
+            send_mail(
+                f'{len(matches)} new listing{"s" if len(matches) != 1 else ""} for your saved searches',
+                body,
+                settings.DEFAULT_FROM_EMAIL,
+                [user.email],
+                fail_silently=False,
+            )
+        except Exception as e:
+            # Left unmarked, so the next run retries
+            logger.error(f"Failed to send saved-search digest to {user.email}: {str(e)}")
+            continue
+        SavedSearchMatch.objects.filter(pk__in=[m.pk for m in matches]).update(emailed_at=timezone.now())
+        sent += 1
+    return sent
@@ -1,6 +1,13 @@
-from django.db.models.signals import post_delete
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from property.models import Property
+from .models import SavedProperty
+
+logger = logging.getLogger(__name__)
 
 
 @receiver(post_delete, sender=Property)
@@ -16,3 +23,58 @@ def release_slot_on_property_delete(sender, instance, **kwargs):
         sub.release_slot()
     except UserSubscription.DoesNotExist:
         pass
+
+
+@receiver(post_save, sender=SavedProperty)
+def count_save_engagement(sender, instance, created=False, raw=False, **kwargs):
+    """Saves feed the trending rankings (core/trending.py)"""
+    from core.trending import record_event
+
+    if created and not raw:
+        record_event(instance.property, 'save')
+
+
+@receiver(post_save, sender=SavedProperty)
+def increment_saved_count(sender, instance, created=False, raw=False, **kwargs):
+    """Keep Property.saved_count current without a GROUP BY on every read"""
+    if created and not raw:
+        Property.objects.filter(pk=instance.property_id).update(saved_count=F('saved_count') + 1)
+
+
+@receiver(post_delete, sender=SavedProperty)
+def decrement_saved_count(sender, instance, **kwargs):
+    # Guarded so a drifted count can't go negative; reconcile_saved_counts fixes drift
+    Property.objects.filter(pk=instance.property_id, saved_count__gt=0).update(saved_count=F('saved_count') - 1)
+
+
+def _match_quietly(property_id):
+    from .saved_searches import match_property
+
+    try:
+        match_property(property_id)
+    except Exception:
+        # Alerts are best-effort; they must never fail the listing save
+        logger.exception(f"Saved-search matching failed for property {property_id}")
+
+
+@receiver(post_save, sender=Property)
+def match_saved_searches(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Alert users whose saved searches this listing now matches"""
+    from .saved_searches import MATCH_FIELDS
+
+    if raw:
+        return
+    if update_fields and not MATCH_FIELDS.intersection(update_fields):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: _match_quietly(pk))
+
+
+@receiver(post_save, sender=SavedProperty)
+@receiver(post_delete, sender=SavedProperty)
+def invalidate_saved_property_ids(sender, instance, created=True, **kwargs):
+    """Drop the user's cached saved-listing IDs (core/saved_items.py)"""
+    from core.saved_items import invalidate
+
+    if created:  # post_delete has no `created`; re-saving a row doesn't change the IDs
+        invalidate('properties', instance.user_id)
@@ -1,3 +1,87 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from property.filters import InvalidFilter
+from property.tests import PropertyDataMixin
+from .models import Notification, SavedSearch, SavedSearchMatch
+from .saved_searches import match_property
+
+
+class SavedSearchTests(PropertyDataMixin, TestCase):
+    def save_search(self, **params):
+        return SavedSearch.objects.create(user=self.user, name='search', params=params)
+
+    def test_predicates_and_index_key(self):
+        search = self.save_search(city_type=str(self.lekki.pk), bedrooms='3+', max_price='60000000')
+        self.assertEqual(search.index_key, f'city:{self.lekki.pk}')
+        self.assertEqual((search.min_bedrooms, search.max_bedrooms), (3, None))
+        self.assertEqual(search.max_price, Decimal('60000000'))
+        self.assertFalse(search.needs_verification)
+
+        keyword = self.save_search(q='garden')
+        self.assertEqual(keyword.index_key, '*')
+        self.assertTrue(keyword.needs_verification)
+
+    def test_malformed_params_are_rejected(self):
+        for params in [{'bedrooms': 'abc', 'q': 'x'}, {'state_type': 'abc'}, {'min_price': 'abc', 'q': 'x'}]:
+            with self.subTest(params=params), self.assertRaises(InvalidFilter):
+                self.save_search(**params)
+        self.assertFalse(SavedSearch.objects.exists())
+
+    def test_save_search_view_rejects_malformed_params(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('listings:save_search'), {'query': 'bedrooms=abc&q=duplex'})
+        self.assertRedirects(response, reverse('properties'), fetch_redirect_response=False)
+        self.assertFalse(SavedSearch.objects.exists())
+
+    def test_match_property(self):
+        city = self.save_search(city_type=str(self.lekki.pk), bedrooms='3')
+        elsewhere = self.save_search(city_type=str(self.garki.pk))
+        too_cheap = self.save_search(max_price='1000')
+        keyword = self.save_search(q='garden')
+        other_keyword = self.save_search(q='penthouse')
+        prop = self.make_property()
+
+        self.assertEqual(match_property(prop.pk), 2)
+        self.assertEqual(
+            set(SavedSearchMatch.objects.values_list('saved_search', flat=True)), {city.pk, keyword.pk},
+        )
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 2)
+        # Each pair is alerted once
+        self.assertEqual(match_property(prop.pk), 0)
+        self.assertFalse(SavedSearchMatch.objects.filter(saved_search__in=[elsewhere, too_cheap, other_keyword]).exists())
+
+    def test_keyword_searches_are_verified_in_one_query(self):
+        for i in range(5):
+            self.save_search(q='garden', bathrooms=str(i))
+        prop = self.make_property()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(match_property(prop.pk), 1)
+        self.assertEqual(sum('EXISTS' in query['sql'].upper() for query in queries.captured_queries), 1)
+
+    def test_unusable_stored_search_is_skipped(self):
+        good = self.save_search(q='garden')
+        bad = self.save_search(q='garden')
+        # Written behind save()'s validation, e.g. before it existed
+        SavedSearch.objects.filter(pk=bad.pk).update(params={'q': 'garden', 'bedrooms': 'abc'})
+        prop = self.make_property()
+        with self.assertLogs('listings.saved_searches', 'WARNING'):
+            self.assertEqual(match_property(prop.pk), 1)
+        self.assertTrue(SavedSearchMatch.objects.filter(saved_search=good).exists())
+
+    def test_listing_save_survives_matching_errors(self):
+        bad = self.save_search(q='garden')
+        SavedSearch.objects.filter(pk=bad.pk).update(params={'q': 'garden', 'min_price': 'abc'})
+        with self.assertLogs('listings.saved_searches', 'WARNING'), self.captureOnCommitCallbacks(execute=True):
+            prop = self.make_property()
+        self.assertTrue(prop.pk)
 
-# Create your tests here.
+    def test_matching_failure_is_logged_not_raised(self):
+        with mock.patch('listings.saved_searches.match_property', side_effect=RuntimeError('boom')):
+            with self.assertLogs('listings.signals', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+                self.make_property()
@@ -7,6 +7,8 @@ urlpatterns = [
     path('dashboard/', views.dashboard, name='dashboard'),
     path('post/', views.post_property, name='post_property'),
     path('edit/<slug:slug>/', views.edit_property, name='edit_property'),
+    path('searches/save/', views.save_search, name='save_search'),
+    path('searches/<int:pk>/delete/', views.delete_saved_search, name='delete_saved_search'),
     path('pricing/', views.pricing_plans, name='pricing'),
     path('subscribe/<int:package_id>/', views.subscribe, name='subscribe'),
     path("verify/listing/package/", views.verify_payment, name="verify_payment")
@@ -1,7 +1,7 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from .models import ListingPackage, UserSubscription
+from .models import ListingPackage, UserSubscription, SavedSearch
 from .forms import PropertyForm
 from property.models import Property, PropertyImage
 from django.db.models import Count
@@ -164,6 +164,48 @@ def edit_property(request, slug):
     return render(request, 'listings/post_property.html', context)
 
 
+@login_required
+def save_search(request):
+    """
+    Save the property_list filters in POST['query'] (its query string) so
+    the user is alerted about new matching listings.
+    """
+    from django.http import QueryDict
+    from property.filters import InvalidFilter, normalize_filter_params, validate_filter_params
+    from .saved_searches import describe
+
+    if request.method != 'POST':
+        return redirect('properties')
+    query = QueryDict(request.POST.get('query', ''))
+    params = dict(normalize_filter_params(query))
+    if not params:
+        messages.warning(request, "Choose some filters before saving a search.")
+        return redirect('properties')
+    try:
+        validate_filter_params(params)
+    except InvalidFilter:
+        messages.error(request, "Some of those filters aren't valid. Adjust them and try again.")
+        return redirect('properties')
+
+    search, created = SavedSearch.objects.get_or_create(
+        user=request.user,
+        params=params,
+        defaults={'name': request.POST.get('name', '').strip()[:200] or describe(params)},
+    )
+    if created:
+        messages.success(request, f'Saved "{search.name}". We\'ll let you know about new matches.')
+    else:
+        messages.info(request, f'You already saved "{search.name}".')
+    return redirect(search.get_absolute_url())
+
+
+@login_required
+def delete_saved_search(request, pk):
+    if request.method == 'POST':
+        get_object_or_404(SavedSearch, pk=pk, user=request.user).delete()
+        messages.success(request, "Saved search removed.")
+    return redirect('shop:profile')
+
 def pricing_plans(request):
     """
     Show available slot packages for purchase.
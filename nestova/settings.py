@@ -116,6 +116,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'contact.context_processors.contact_info',  # Make ContactInfo available globally
+                'core.context_processors.saved_items',  # Saved listing / wishlist IDs for cards
                 
         
             ],
@@ -437,6 +438,10 @@ USER_VERIFICATION_REQUIRED = ['nin']  # Normal users must verify NIN to post pro
 # Site URL for email notifications
 SITE_URL = os.environ.get('SITE_URL', 'http://localhost:8000' if DEBUG else 'https://nestovaproperty.com')
 
+# Pre-generated sitemap files (see core/sitemap_shards.py)
+SITEMAP_ROOT = os.environ.get('SITEMAP_ROOT', os.path.join(BASE_DIR, 'sitemaps'))
+SITEMAP_SHARD_SIZE = int(os.environ.get('SITEMAP_SHARD_SIZE', '10000'))
+
 
 # ==================================
 # ZOOM INTEGRATION
@@ -18,9 +18,9 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from django.contrib.sitemaps.views import sitemap
 from django.views.generic import TemplateView
 from core.sitemaps import PropertySitemap, ProductSitemap, BlogSitemap, StaticPagesSitemap
+from core import views as core_views
 
 # Sitemap configuration
 sitemaps = {
@@ -34,7 +34,9 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     
     # SEO URLs
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    # Pre-generated by `manage.py generate_sitemaps` (live sitemap until then)
+    path('sitemap.xml', core_views.sitemap_file, name='django.contrib.sitemaps.views.sitemap'),
+    path('sitemaps/<str:filename>', core_views.sitemap_file, name='sitemap_file'),
     path('robots.txt', TemplateView.as_view(template_name='robots_seo.txt', content_type='text/plain'), name='robots_txt'),
     
     # IMPORTANT: Custom auth URLs MUST come BEFORE allauth to prevent override
@@ -69,7 +69,7 @@ class PropertyAdmin(admin.ModelAdmin):
             'fields': ('title', 'slug', 'description', 'listed_by', 'agent')
         }),
         ('Location', {
-            'fields': ('state', 'city', 'address', 'zip_code')
+            'fields': ('state', 'city', 'address', 'zip_code', 'latitude', 'longitude')
         }),
         ('Property Details', {
             'fields': (
@@ -105,12 +105,54 @@ class PropertyAdmin(admin.ModelAdmin):
     )
     
     inlines = [PropertyImageInline, PropertyAmenityLinkInline]
+    change_list_template = 'admin/property/property/change_list.html'
     
     def save_model(self, request, obj, form, change):
         if not change:  # If creating new property
             obj.listed_by = request.user
         super().save_model(request, obj, form, change)
 
+    def get_urls(self):
+        from django.urls import path
+        return [
+            path('import/', self.admin_site.admin_view(self.import_view), name='property_property_import'),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        """Bulk upload of CSV/JSONL listings (see property/importer.py)"""
+        from django.contrib import messages
+        from django.shortcuts import redirect
+        from django.template.response import TemplateResponse
+        from .forms import PropertyImportForm
+        from .importer import SlotsExhausted, import_uploaded_file
+
+        if not self.has_add_permission(request):
+            return redirect('admin:property_property_changelist')
+
+        form = PropertyImportForm(request.POST or None, request.FILES or None)
+        report = None
+        if request.method == 'POST' and form.is_valid():
+            try:
+                report = import_uploaded_file(
+                    form.cleaned_data['file'],
+                    form.cleaned_data['owner'],
+                    fetch_photos=form.cleaned_data['fetch_photos'],
+                    charge_slots=form.cleaned_data['charge_slots'],
+                )
+                messages.success(
+                    request, f"Imported {report.created} of {report.rows} rows ({len(report.errors)} rejected)."
+                )
+            except SlotsExhausted as e:
+                messages.error(request, f"Import stopped: {e}.")
+
+        return TemplateResponse(request, 'admin/property/property/import.html', {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import properties',
+            'form': form,
+            'report': report,
+        })
+
 
 @admin.register(PropertyImage)
 class PropertyImageAdmin(admin.ModelAdmin):
@@ -0,0 +1,147 @@
+"""
+Location autocomplete for the search bar.
+
+Each process keeps a LocationIndex: a sorted array of lowercased keys
+searched with bisect, holding:
+- states;
+- cities;
+- neighbourhoods taken from listing addresses (comma-separated address
+  parts shared by at least MIN_NEIGHBOURHOOD_LISTINGS active listings).
+
+Every word of a name is a key too, so "island" finds "Victoria Island".
+A keystroke therefore costs a cache read of the 'locations' generation
+(to notice edited states/cities) and a binary search, never a query.
+
+The index is built lazily on first use. It is rebuilt when the
+generation changes or after MAX_AGE, which picks up new neighbourhoods
+as listings come and go.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+from django.db.models import Count, Q
+
+from core.cache import get_generation
+from .models import City, Property, State
+
+MAX_AGE = 15 * 60
+MIN_NEIGHBOURHOOD_LISTINGS = 3
+MAX_RESULTS = 10
+
+# Shown before neighbourhoods when equally relevant
+KIND_ORDER = {'state': 0, 'city': 1, 'neighbourhood': 2}
+
+HOUSE_NUMBER_RE = re.compile(r'^(?:no\.?\s*)?[\d/\-]+[a-z]?\s+', re.IGNORECASE)
+WORD_RE = re.compile(r'\w+')
+
+
+def normalise(text):
+    return ' '.join(WORD_RE.findall((text or '').lower()))
+
+
+def _neighbourhoods(addresses):
+    """Address parts ("Lekki Phase 1", "Admiralty Way") shared by several listings"""
+    counts = Counter()
+    labels = {}
+    for address in addresses:
+        seen = set()
+        for part in (address or '').split(','):
+            part = HOUSE_NUMBER_RE.sub('', part.strip())
+            key = normalise(part)
+            if len(key) < 3 or key.isdigit() or key in seen:
+                continue
+            seen.add(key)
+            counts[key] += 1
+            labels.setdefault(key, part)
+    return {labels[key]: n for key, n in counts.items() if n >= MIN_NEIGHBOURHOOD_LISTINGS}
+
+
+class LocationIndex:
+    def __init__(self, entries):
+        """entries: dicts with label, kind, listings and params"""
+        self.entries = entries
+        keyed = []
+        for position, entry in enumerate(entries):
+            words = normalise(entry['name']).split()
+            for start in range(len(words)):
+                keyed.append((' '.join(words[start:]), start, position))
+        keyed.sort()
+        self.keys = [key for key, _, _ in keyed]
+        self.matches = [(start, position) for _, start, position in keyed]
+
+    @classmethod
+    def build(cls):
+        active = Q(properties__is_active=True)
+        entries = [
+            {'name': state.name, 'label': state.name, 'kind': 'state',
+             'listings': state.listings, 'params': {'state_type': state.pk}}
+            for state in State.objects.annotate(listings=Count('properties', filter=active))
+        ]
+        entries += [
+            {'name': city.name, 'label': f'{city.name}, {city.state.name}', 'kind': 'city',
+             'listings': city.listings, 'params': {'city_type': city.pk}}
+            for city in City.objects.select_related('state').annotate(listings=Count('properties', filter=active))
+        ]
+        known = {normalise(entry['name']) for entry in entries}
+        addresses = Property.objects.filter(is_active=True).values_list('address', flat=True)
+        entries += [
+            {'name': label, 'label': label, 'kind': 'neighbourhood',
+             'listings': listings, 'params': {'location': label}}
+            for label, listings in _neighbourhoods(addresses).items()
+            if normalise(label) not in known
+        ]
+        return cls(entries)
+
+    def search(self, text, limit=MAX_RESULTS):
+        prefix = normalise(text)
+        if not prefix:
+            return []
+        best = {}
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix):
+            start, position = self.matches[i]
+            # Matching the start of the name beats matching a later word
+            best[position] = min(best.get(position, start), start)
+            i += 1
+        ranked = sorted(
+            best.items(),
+            key=lambda item: (
+                item[1] > 0,
+                KIND_ORDER[self.entries[item[0]]['kind']],
+                -self.entries[item[0]]['listings'],
+                self.entries[item[0]]['label'],
+            ),
+        )
+        return [
+            {key: self.entries[position][key] for key in ('label', 'kind', 'listings', 'params')}
+            for position, _ in ranked[:limit]
+        ]
+
+
+_index = None
+_index_generation = None
+_index_built_at = 0.0
+_build_lock = threading.Lock()
+
+
+def get_index():
+    """This process's index, rebuilt if locations changed or it has aged out"""
+    global _index, _index_generation, _index_built_at
+
+    generation = get_generation('locations')
+    if _index is not None and _index_generation == generation and time.monotonic() - _index_built_at < MAX_AGE:
+        return _index
+    with _build_lock:
+        # Another thread may have rebuilt it while we waited
+        if _index is None or _index_generation != generation or time.monotonic() - _index_built_at >= MAX_AGE:
+            _index = LocationIndex.build()
+            _index_generation = generation
+            _index_built_at = time.monotonic()
+    return _index
+
+
+def autocomplete(text, limit=MAX_RESULTS):
+    return get_index().search(text, limit)
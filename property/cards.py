@@ -0,0 +1,146 @@
+"""
+Lightweight listing cards.
+
+Pages that show listings as cards (homepage, property_list, agent
+pages, the profile dashboard) don't need full Property instances. A full
+instance carries the RichText description, additional_features JSON and
+SEO fields. Instead, `card_values` selects the CARD_VALUES columns, the
+joined names and a photo count with .values(). `PropertyCard` (a slotted
+dataclass) turns each row into what the card templates print:
+- pre-formatted price;
+- status label and badge;
+- primary image and its URL;
+- location label.
+
+    cards = load_cards(Property.objects.filter(is_featured=True), limit=6)
+    page = paginate_by_cursor(card_values(qs, ordering), ordering, row_factory=PropertyCard.from_row)
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.fields.files import ImageFieldFile
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+
+from .models import Property, PropertyImage, PropertyStatus
+
+CARD_VALUES = [
+    'id', 'slug', 'title', 'address', 'price', 'bedrooms', 'bathrooms', 'square_feet',
+    'featured_image', 'amenity_mask', 'created_at',
+    'is_featured', 'is_premium', 'is_hot', 'is_new', 'is_exclusive',
+    'status__name', 'city__name', 'state__name', 'state__code', 'property_type__name',
+    'listed_by__username', 'listed_by__first_name', 'listed_by__last_name',
+]
+
+STATUS_LABELS = dict(PropertyStatus.STATUS_CHOICES)
+
+# Highest-priority flag wins the card's single badge
+BADGES = [
+    ('is_exclusive', 'Exclusive'),
+    ('is_hot', 'Hot'),
+    ('is_new', 'New'),
+    ('is_premium', 'Premium'),
+    ('is_featured', 'Featured'),
+]
+
+_image_field = Property._meta.get_field('featured_image')
+
+
+@dataclass(slots=True)
+class PropertyCard:
+    id: int
+    slug: str
+    title: str
+    url: str
+    address: str
+    price: Decimal
+    price_display: str
+    status: str
+    status_label: str
+    badge: str
+    image: ImageFieldFile | None
+    image_url: str
+    location: str  # 'Lekki, Lagos'
+    location_short: str  # 'Lekki, LA'
+    property_type: str
+    bedrooms: int
+    bathrooms: int
+    square_feet: int
+    amenity_mask: int
+    photo_count: int
+    is_featured: bool
+    is_premium: bool
+    is_hot: bool
+    is_new: bool
+    is_exclusive: bool
+    agent_name: str
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, row):
+        image = ImageFieldFile(None, _image_field, row['featured_image']) if row['featured_image'] else None
+        status = row['status__name']
+        full_name = f"{row['listed_by__first_name'] or ''} {row['listed_by__last_name'] or ''}".strip()
+        return cls(
+            id=row['id'],
+            slug=row['slug'],
+            title=row['title'],
+            url=reverse('property_detail', kwargs={'slug': row['slug']}),
+            address=row['address'],
+            price=row['price'],
+            price_display=f"₦{row['price']:,.2f}",  # same as Property.formatted_price
+            status=status,
+            status_label=STATUS_LABELS.get(status, status),
+            badge=next((label for flag, label in BADGES if row[flag]), ''),
+            image=image,
+            image_url=image.url if image else '',
+            location=f"{row['city__name']}, {row['state__name']}",
+            location_short=f"{row['city__name']}, {row['state__code']}",
+            property_type=row['property_type__name'],
+            bedrooms=row['bedrooms'],
+            bathrooms=row['bathrooms'],
+            square_feet=row['square_feet'],
+            amenity_mask=row['amenity_mask'],
+            photo_count=row['photo_count'] + (1 if image else 0),
+            is_featured=row['is_featured'],
+            is_premium=row['is_premium'],
+            is_hot=row['is_hot'],
+            is_new=row['is_new'],
+            is_exclusive=row['is_exclusive'],
+            agent_name=full_name or row['listed_by__username'] or '',
+            created_at=row['created_at'],
+        )
+
+    def get_absolute_url(self):
+        return self.url
+
+
+def _photo_count():
+    images = (
+        PropertyImage.objects.filter(property=OuterRef('pk'))
+        .order_by()
+        .values('property')
+        .annotate(n=Count('pk'))
+        .values('n')
+    )
+    return Coalesce(Subquery(images, output_field=IntegerField()), Value(0))
+
+
+def card_values(queryset, ordering=()):
+    """
+    `queryset` as card rows (dicts). Pass the ordering a cursor page is
+    built from so its sort keys (including annotations such as
+    search_rank) are selected too.
+    """
+    extra = [f.lstrip('-') for f in ordering if f.lstrip('-') not in CARD_VALUES]
+    return queryset.select_related(None).values(*CARD_VALUES, *extra, photo_count=_photo_count())
+
+
+def load_cards(queryset, limit=None):
+    """Evaluate a Property queryset (first `limit` rows) as a list of PropertyCard"""
+    rows = card_values(queryset)
+    if limit is not None:
+        rows = rows[:limit]
+    return [PropertyCard.from_row(row) for row in rows]
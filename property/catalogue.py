@@ -0,0 +1,66 @@
+"""
+State -> city catalogue for the search forms' location dropdowns.
+
+The catalogue lists every active state and its active cities. It is
+built into an immutable snapshot holding:
+- the JSON body;
+- a content-hash ETag;
+- a per-state city lookup.
+
+Each process keeps its snapshot until the 'locations' cache generation
+moves (bumped on any State/City change, see signals.py).
+
+Pages embed the catalogue URL with the snapshot version (?v=<etag>). That
+URL can be cached by browsers for a year, since a change produces a new
+version and so a new URL. The bare URL still revalidates cheaply with
+If-None-Match.
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+
+from core.cache import get_generation
+from .models import City, State
+
+
+@dataclass(frozen=True)
+class Catalogue:
+    generation: int
+    body: bytes
+    etag: str
+    cities_by_state: dict = field(default_factory=dict)
+
+    def cities(self, state_id):
+        return self.cities_by_state.get(state_id, [])
+
+
+def build_catalogue(generation):
+    cities_by_state = {}
+    for city_id, name, state_id in City.objects.filter(is_active=True).values_list('id', 'name', 'state_id'):
+        cities_by_state.setdefault(state_id, []).append({'id': city_id, 'name': name})
+
+    states = [
+        {'id': state_id, 'name': name, 'code': code, 'cities': cities_by_state.get(state_id, [])}
+        for state_id, name, code in State.objects.filter(is_active=True).values_list('id', 'name', 'code')
+    ]
+    body = json.dumps({'states': states}, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    etag = hashlib.sha256(body).hexdigest()[:20]
+    return Catalogue(generation=generation, body=body, etag=etag, cities_by_state=cities_by_state)
+
+
+_snapshot = None
+_build_lock = threading.Lock()
+
+
+def get_catalogue():
+    """This process's snapshot, rebuilt when states or cities have changed"""
+    global _snapshot
+
+    generation = get_generation('locations')
+    if _snapshot is not None and _snapshot.generation == generation:
+        return _snapshot
+    with _build_lock:
+        if _snapshot is None or _snapshot.generation != generation:
+            _snapshot = build_catalogue(generation)
+    return _snapshot
@@ -0,0 +1,292 @@
+"""
+Server-side marker clustering for the listings map.
+
+Each zoom level is cut into Web Mercator tiles (the usual z/x/y scheme) and
+every tile into a CELLS_PER_SIDE x CELLS_PER_SIDE grid. All geocoded, active
+listings falling in a grid cell form one MapCluster row (count, centroid,
+price range), so serving a tile is one indexed lookup plus a cache hit.
+
+`rebuild_clusters` recomputes everything with NumPy; property signals call
+`apply_change` to move a single listing between cells incrementally, and
+bulk imports call `add_listings` for their new rows.
+"""
+import math
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import Greatest, Least
+
+from core.cache import bump_generation, versioned_key
+from core.geo import geohash_prefilter
+from .models import MapCluster, Property
+
+MIN_ZOOM = 3
+MAX_ZOOM = 16
+CELL_SHIFT = 2  # 4 x 4 cells per 256px tile, i.e. 64px clusters
+CELLS_PER_SIDE = 1 << CELL_SHIFT
+
+TILE_CACHE_TIMEOUT = 60 * 60
+MAX_LATITUDE = 85.05112878  # Web Mercator limit
+
+MAPPABLE_STATUSES = ['for_sale', 'for_rent', 'pending']
+
+
+def mappable_properties():
+    """Listings that appear on the map"""
+    return Property.objects.filter(
+        is_active=True,
+        status__name__in=MAPPABLE_STATUSES,
+    ).exclude(geohash='')
+
+
+def cell_for(latitude, longitude, zoom):
+    """(cell_x, cell_y) of a point at `zoom`: the tile coordinates at zoom + CELL_SHIFT"""
+    scale = 1 << (zoom + CELL_SHIFT)
+    lat = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, float(latitude))))
+    x = (float(longitude) + 180.0) / 360.0 * scale
+    y = (1.0 - math.log(math.tan(lat) + 1.0 / math.cos(lat)) / math.pi) / 2.0 * scale
+    return min(int(x), scale - 1), min(int(y), scale - 1)
+
+
+def cell_bounds(cell_x, cell_y, zoom):
+    """(south, west, north, east) of a grid cell"""
+    scale = 1 << (zoom + CELL_SHIFT)
+
+    def lat_at(y):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / scale))))
+
+    return (
+        lat_at(cell_y + 1),
+        cell_x / scale * 360.0 - 180.0,
+        lat_at(cell_y),
+        (cell_x + 1) / scale * 360.0 - 180.0,
+    )
+
+
+def _vector_cells(latitudes, longitudes, zoom):
+    scale = 1 << (zoom + CELL_SHIFT)
+    lat = np.radians(np.clip(latitudes, -MAX_LATITUDE, MAX_LATITUDE))
+    xs = np.minimum(((longitudes + 180.0) / 360.0 * scale).astype(np.int64), scale - 1)
+    ys = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) / 2.0 * scale
+    ys = np.minimum(ys.astype(np.int64), scale - 1)
+    return xs, ys
+
+
+def tile_cache_key(zoom, tile_x, tile_y):
+    return versioned_key('map_tiles', zoom, tile_x, tile_y)
+
+
+# ==================== FULL REBUILD ====================
+
+def _cells(rows, zoom):
+    """
+    Per-cell aggregates of (latitude, longitude, price) rows at one zoom:
+    (cell_x, cell_y, count, latitude_sum, longitude_sum, min_price, max_price)
+    """
+    latitudes = np.array([float(r[0]) for r in rows])
+    longitudes = np.array([float(r[1]) for r in rows])
+    prices = np.array([float(r[2]) for r in rows])
+
+    xs, ys = _vector_cells(latitudes, longitudes, zoom)
+    keys = xs * (1 << (zoom + CELL_SHIFT)) + ys
+    order = np.argsort(keys, kind='stable')
+    unique_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+    lat_sums = np.add.reduceat(latitudes[order], starts)
+    lng_sums = np.add.reduceat(longitudes[order], starts)
+    min_prices = np.minimum.reduceat(prices[order], starts)
+    max_prices = np.maximum.reduceat(prices[order], starts)
+    cell_xs = xs[order][starts]
+    cell_ys = ys[order][starts]
+    for i in range(len(unique_keys)):
+        yield (
+            int(cell_xs[i]), int(cell_ys[i]), int(counts[i]), float(lat_sums[i]), float(lng_sums[i]),
+            round(min_prices[i], 2), round(max_prices[i], 2),
+        )
+
+
+def rebuild_clusters(batch_size=1000):
+    """Recompute every cluster from scratch. Returns the number of rows written."""
+    rows = list(mappable_properties().values_list('latitude', 'longitude', 'price'))
+    clusters = []
+    if rows:
+        for zoom in range(MIN_ZOOM, MAX_ZOOM + 1):
+            for cell_x, cell_y, count, latitude_sum, longitude_sum, min_price, max_price in _cells(rows, zoom):
+                clusters.append(MapCluster(
+                    zoom=zoom,
+                    cell_x=cell_x,
+                    cell_y=cell_y,
+                    tile_x=cell_x >> CELL_SHIFT,
+                    tile_y=cell_y >> CELL_SHIFT,
+                    count=count,
+                    latitude_sum=latitude_sum,
+                    longitude_sum=longitude_sum,
+                    min_price=min_price,
+                    max_price=max_price,
+                ))
+
+    with transaction.atomic():
+        MapCluster.objects.all().delete()
+        MapCluster.objects.bulk_create(clusters, batch_size=batch_size)
+    bump_generation('map_tiles')
+    return len(clusters)
+
+
+# ==================== INCREMENTAL UPDATES ====================
+
+def snapshot(prop):
+    """
+    The part of a listing that clustering depends on, or None when it is
+    not on the map. Compared before/after a save to find affected cells.
+    """
+    status_name = getattr(prop, 'status_name', None) or prop.status.name
+    if not (prop.is_active and status_name in MAPPABLE_STATUSES):
+        return None
+    if prop.latitude is None or prop.longitude is None:
+        return None
+    return (float(prop.latitude), float(prop.longitude), prop.price)
+
+
+def _recompute_cell(zoom, cell_x, cell_y):
+    """Rebuild one cell from the listings inside it (used after removals)"""
+    south, west, north, east = cell_bounds(cell_x, cell_y, zoom)
+    inside = geohash_prefilter(mappable_properties(), south, west, north, east).filter(
+        latitude__gt=south, latitude__lte=north,
+        longitude__gte=west, longitude__lt=east,
+    )
+    stats = inside.aggregate(
+        count=Count('pk'),
+        latitude_sum=Sum('latitude'),
+        longitude_sum=Sum('longitude'),
+        min_price=Min('price'),
+        max_price=Max('price'),
+    )
+    if not stats['count']:
+        MapCluster.objects.filter(zoom=zoom, cell_x=cell_x, cell_y=cell_y).delete()
+        return
+    MapCluster.objects.update_or_create(
+        zoom=zoom, cell_x=cell_x, cell_y=cell_y,
+        defaults={
+            'tile_x': cell_x >> CELL_SHIFT,
+            'tile_y': cell_y >> CELL_SHIFT,
+            'count': stats['count'],
+            'latitude_sum': float(stats['latitude_sum']),
+            'longitude_sum': float(stats['longitude_sum']),
+            'min_price': stats['min_price'],
+            'max_price': stats['max_price'],
+        },
+    )
+
+
+def _remove_point(zoom, cell_x, cell_y, latitude, longitude, price):
+    """Subtract a point from its cell; returns True if the cell was recounted instead"""
+    cluster = MapCluster.objects.filter(zoom=zoom, cell_x=cell_x, cell_y=cell_y).first()
+    if cluster is None:
+        return False
+    if cluster.count <= 1 or price <= cluster.min_price or price >= cluster.max_price:
+        # Count hits zero or the price range may shrink: recount this cell
+        _recompute_cell(zoom, cell_x, cell_y)
+        return True
+    MapCluster.objects.filter(pk=cluster.pk).update(
+        count=F('count') - 1,
+        latitude_sum=F('latitude_sum') - latitude,
+        longitude_sum=F('longitude_sum') - longitude,
+    )
+    return False
+
+
+def _add_cell(zoom, cell_x, cell_y, count, latitude_sum, longitude_sum, min_price, max_price):
+    """Add `count` points with these sums and price range to a cell"""
+    updated = MapCluster.objects.filter(zoom=zoom, cell_x=cell_x, cell_y=cell_y).update(
+        count=F('count') + count,
+        latitude_sum=F('latitude_sum') + latitude_sum,
+        longitude_sum=F('longitude_sum') + longitude_sum,
+        min_price=Least('min_price', min_price),
+        max_price=Greatest('max_price', max_price),
+    )
+    if not updated:
+        _, created = MapCluster.objects.get_or_create(
+            zoom=zoom, cell_x=cell_x, cell_y=cell_y,
+            defaults={
+                'tile_x': cell_x >> CELL_SHIFT,
+                'tile_y': cell_y >> CELL_SHIFT,
+                'count': count,
+                'latitude_sum': latitude_sum,
+                'longitude_sum': longitude_sum,
+                'min_price': min_price,
+                'max_price': max_price,
+            },
+        )
+        if not created:  # lost a race with another insert
+            _recompute_cell(zoom, cell_x, cell_y)
+
+
+def _add_point(zoom, cell_x, cell_y, latitude, longitude, price):
+    _add_cell(zoom, cell_x, cell_y, 1, latitude, longitude, price, price)
+
+
+def add_listings(property_ids):
+    """
+    Add new listings (e.g. a bulk import, which sends no post_save) to
+    their clusters: one update per touched cell rather than per listing.
+    Returns the number of listings added.
+    """
+    rows = list(mappable_properties().filter(pk__in=property_ids).values_list('latitude', 'longitude', 'price'))
+    if not rows:
+        return 0
+    touched_tiles = set()
+    with transaction.atomic():
+        for zoom in range(MIN_ZOOM, MAX_ZOOM + 1):
+            for cell in _cells(rows, zoom):
+                _add_cell(zoom, *cell)
+                touched_tiles.add((zoom, cell[0] >> CELL_SHIFT, cell[1] >> CELL_SHIFT))
+    cache.delete_many([tile_cache_key(*tile) for tile in touched_tiles])
+    return len(rows)
+
+
+def apply_change(old, new):
+    """
+    Move one listing's contribution from `old` to `new` (snapshots, either
+    may be None) at every zoom level, and drop the cached tiles touched.
+    Must run after the change is written: recounted cells read the table.
+    """
+    if old == new:
+        return
+    touched_tiles = set()
+    with transaction.atomic():
+        for zoom in range(MIN_ZOOM, MAX_ZOOM + 1):
+            recounted = None
+            if old is not None:
+                cell = cell_for(old[0], old[1], zoom)
+                if _remove_point(zoom, *cell, *old):
+                    recounted = cell
+                touched_tiles.add((zoom, cell[0] >> CELL_SHIFT, cell[1] >> CELL_SHIFT))
+            if new is not None:
+                cell = cell_for(new[0], new[1], zoom)
+                if cell != recounted:  # a recount already includes the new state
+                    _add_point(zoom, *cell, *new)
+                touched_tiles.add((zoom, cell[0] >> CELL_SHIFT, cell[1] >> CELL_SHIFT))
+    cache.delete_many([tile_cache_key(*tile) for tile in touched_tiles])
+
+
+# ==================== TILE LOOKUP ====================
+
+def get_tile(zoom, tile_x, tile_y):
+    """Cluster list for one map tile (cached)"""
+    key = tile_cache_key(zoom, tile_x, tile_y)
+    tile = cache.get(key)
+    if tile is None:
+        tile = [
+            {
+                'count': cluster.count,
+                'lat': round(cluster.latitude, 6),
+                'lng': round(cluster.longitude, 6),
+                'min_price': float(cluster.min_price),
+                'max_price': float(cluster.max_price),
+            }
+            for cluster in MapCluster.objects.filter(zoom=zoom, tile_x=tile_x, tile_y=tile_y)
+        ]
+        cache.set(key, tile, TILE_CACHE_TIMEOUT)
+    return tile
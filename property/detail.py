@@ -0,0 +1,97 @@
+"""
+Data for the property detail page.
+
+The anonymous part of the page (the listing, its relations and similar
+listings) is loaded with a fixed number of queries:
+- the listing with its joined relations;
+- the similar listings.
+
+It is then cached per slug until the listing changes (see signals.py).
+The lister's and agent's rows are cut down to the fields the page shows
+before caching, so no password hash or bank details reach the cache.
+The images come from the separately cached gallery (gallery.py). The
+visitor-specific part comes on top: saved state from the user's cached
+saved-ID set and the application from a single query.
+"""
+from django.core.cache import cache
+from django.db.models.fields.files import FieldFile
+from django.http import Http404
+
+from .models import Property, PropertyApplication
+
+DETAIL_CACHE_TIMEOUT = 60 * 10  # similar listings and agent details may drift
+
+# All the page reads of the lister / agent; the other columns stay deferred
+PUBLIC_USER_FIELDS = ('id', 'username', 'first_name', 'last_name', 'image')
+PUBLIC_AGENT_FIELDS = ('id', 'user_id', 'slug', 'verification_status')
+
+
+def detail_cache_key(slug):
+    return f'property:detail:{slug}'
+
+
+def _public_copy(obj, field_names):
+    """`obj` reloaded as if fetched with .only(*field_names)"""
+    if obj is None:
+        return None
+    values = []
+    for name in field_names:
+        value = getattr(obj, name)
+        values.append(value.name if isinstance(value, FieldFile) else value)
+    return type(obj).from_db(obj._state.db, list(field_names), values)
+
+
+def load_detail(slug):
+    """{'property', 'similar_properties'} for a slug (cached); raises Http404"""
+    from .similarity import similar_properties
+
+    key = detail_cache_key(slug)
+    bundle = cache.get(key)
+    if bundle is None:
+        prop = (
+            Property.objects.select_related(
+                'state', 'city', 'property_type', 'status', 'agent__user', 'listed_by',
+            )
+            .filter(slug=slug)
+            .first()
+        )
+        if prop is None:
+            raise Http404('No Property matches the given query.')
+        prop.listed_by = _public_copy(prop.listed_by, PUBLIC_USER_FIELDS)
+        if prop.agent is not None:
+            user = _public_copy(prop.agent.user, PUBLIC_USER_FIELDS)
+            prop.agent = _public_copy(prop.agent, PUBLIC_AGENT_FIELDS)
+            prop.agent.user = user
+        bundle = {
+            'property': prop,
+            'similar_properties': similar_properties(prop),
+        }
+        cache.set(key, bundle, DETAIL_CACHE_TIMEOUT)
+    return bundle
+
+
+def invalidate_detail(slug):
+    if slug:
+        cache.delete(detail_cache_key(slug))
+
+
+def load_visitor_state(prop, user):
+    """
+    (is_saved, existing_application) for a signed-in visitor. Saved state
+    comes from the cached ID set (core/saved_items.py); the application
+    is one query and only carries the fields the page shows.
+    """
+    from core.saved_items import saved_property_ids
+
+    if not user.is_authenticated:
+        return False, None
+    application = (
+        PropertyApplication.objects.filter(listing=prop, applicant=user)
+        .order_by('-submitted_at')
+        .only('id', 'status', 'submitted_at')
+        .first()
+    )
+    if application is not None:
+        application.listing = prop
+        application.applicant = user
+    return prop.pk in saved_property_ids(user), application
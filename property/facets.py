@@ -0,0 +1,139 @@
+"""
+Facet counts for the property listing sidebar.
+
+All facets are computed for the current filter set in one grouped query:
+matching rows are grouped by (state, city, type, bedroom bucket, bathroom
+bucket, price band) with per-group amenity counts, and the groups are then
+rolled up in Python. The number of groups is bounded by the number of
+distinct combinations, not by the number of listings.
+
+Results are cached per normalized filter set and invalidated by bumping the
+'properties' generation whenever a Property changes (see property/signals.py).
+"""
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, IntegerField, Q, Value, When
+from django.db.models.functions import Least
+
+from core.cache import hash_key_parts, versioned_key
+from .filters import AMENITY_FILTERS, normalize_filter_params
+from .models import PropertyType
+
+FACET_CACHE_TIMEOUT = 60 * 10
+
+# (key, label, min price, max price) - bounds match the min_price/max_price inputs
+PRICE_BANDS = [
+    ('under_5m', 'Under ₦5M', None, 5_000_000),
+    ('5m_20m', '₦5M - ₦20M', 5_000_000, 20_000_000),
+    ('20m_50m', '₦20M - ₦50M', 20_000_000, 50_000_000),
+    ('50m_100m', '₦50M - ₦100M', 50_000_000, 100_000_000),
+    ('over_100m', 'Over ₦100M', 100_000_000, None),
+]
+
+# Highest bucket is "N+", matching the sidebar buttons
+BEDROOM_CAP = 4
+BATHROOM_CAP = 3
+
+
+def _price_band_expression():
+    whens = [
+        When(price__lt=max_price, then=Value(key))
+        for key, _, _, max_price in PRICE_BANDS
+        if max_price is not None
+    ]
+    return Case(*whens, default=Value(PRICE_BANDS[-1][0]), output_field=CharField())
+
+
+def _bucket_label(value, cap):
+    return f'{cap}+' if value >= cap else str(value)
+
+
+def compute_facets(queryset):
+    """Compute every sidebar facet for an already-filtered Property queryset"""
+    amenity_counts = {
+        f'amenity_{param}': Count('pk', filter=Q(**{field: True}))
+        for param, field, _ in AMENITY_FILTERS
+    }
+    groups = (
+        queryset.order_by()
+        .annotate(
+            price_band=_price_band_expression(),
+            bedroom_bucket=Least('bedrooms', Value(BEDROOM_CAP), output_field=IntegerField()),
+            bathroom_bucket=Least('bathrooms', Value(BATHROOM_CAP), output_field=IntegerField()),
+        )
+        .values(
+            'state_id', 'state__name', 'city_id', 'city__name', 'property_type__name',
+            'price_band', 'bedroom_bucket', 'bathroom_bucket',
+        )
+        .annotate(total=Count('pk'), **amenity_counts)
+    )
+
+    total = 0
+    states = {}
+    cities = {}
+    types = defaultdict(int)
+    price_bands = defaultdict(int)
+    bedrooms = defaultdict(int)
+    bathrooms = defaultdict(int)
+    amenities = defaultdict(int)
+
+    for row in groups:
+        count = row['total']
+        total += count
+
+        state = states.setdefault(row['state_id'], {'id': row['state_id'], 'name': row['state__name'], 'count': 0})
+        state['count'] += count
+        city = cities.setdefault(row['city_id'], {'id': row['city_id'], 'name': row['city__name'], 'count': 0})
+        city['count'] += count
+
+        types[row['property_type__name']] += count
+        price_bands[row['price_band']] += count
+        bedrooms[_bucket_label(row['bedroom_bucket'], BEDROOM_CAP)] += count
+        bathrooms[_bucket_label(row['bathroom_bucket'], BATHROOM_CAP)] += count
+        for param, _, _ in AMENITY_FILTERS:
+            amenities[param] += row[f'amenity_{param}']
+
+    type_labels = dict(PropertyType.TYPE_CHOICES)
+    by_count = lambda item: (-item['count'], item['name'])
+
+    return {
+        'total': total,
+        'states': sorted(states.values(), key=by_count),
+        'cities': sorted(cities.values(), key=by_count),
+        'types': sorted(
+            [{'name': name, 'label': type_labels.get(name, name), 'count': count} for name, count in types.items()],
+            key=by_count,
+        ),
+        'type_counts': dict(types),
+        'price_bands': [
+            {'key': key, 'label': label, 'min': min_price, 'max': max_price, 'count': price_bands.get(key, 0)}
+            for key, label, min_price, max_price in PRICE_BANDS
+        ],
+        'bedrooms': [
+            {'value': value, 'count': bedrooms.get(value, 0)}
+            for value in ['1', '2', '3', f'{BEDROOM_CAP}+']
+        ],
+        'bathrooms': [
+            {'value': value, 'count': bathrooms.get(value, 0)}
+            for value in ['1', '2', f'{BATHROOM_CAP}+']
+        ],
+        'amenities': [
+            {'param': param, 'label': label, 'count': amenities.get(param, 0)}
+            for param, _, label in AMENITY_FILTERS
+        ],
+    }
+
+
+def get_facets(queryset, params, scope='listing'):
+    """
+    Cached facet counts for the filter set in `params`.
+    `queryset` must already have those filters applied; `scope` names the
+    base queryset it was filtered from so different bases don't share keys.
+    """
+    key = versioned_key('properties', 'facets', scope, hash_key_parts(normalize_filter_params(params)))
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,217 @@
+"""
+Query-string filters shared by the property listing, facet counts and
+search endpoints. Everything `property_list` accepts (except sorting and
+pagination) is applied here so each consumer filters the same way.
+"""
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import F, Q
+
+from .models import AMENITY_BITS, AMENITY_FLAGS
+from .search import apply_search
+
+# Query-string parameter for each amenity flag
+AMENITY_PARAMS = {
+    'has_garage': 'garage',
+    'has_pool': 'pool',
+    'has_garden': 'garden',
+    'has_security': 'security',
+    'has_gym': 'gym',
+    'has_balcony': 'balcony',
+    'is_furnished': 'furnished',
+    'has_ac': 'ac',
+    'has_heating': 'has_heating',
+    'pet_friendly': 'pets',
+}
+
+# (query-string parameter, Property field, label)
+AMENITY_FILTERS = [(AMENITY_PARAMS[field], field, label) for field, label in AMENITY_FLAGS]
+
+FILTER_PARAMS = [
+    'q', 'state_type', 'city_type', 'listing_type', 'type',
+    'min_price', 'max_price', 'bedrooms', 'bathrooms', 'location',
+] + [param for param, _, _ in AMENITY_FILTERS]
+
+# Sort options -> keyset ordering (last field must be unique, see core/pagination.py)
+SORT_ORDERINGS = {
+    'newest': ('-created_at', '-id'),
+    'price_asc': ('price', 'id'),
+    'price_desc': ('-price', '-id'),
+    'views': ('-views_count', '-id'),
+    'saved': ('-saved_count', '-id'),
+    'trending': ('-trending_score', '-id'),
+    'best': ('-rank_score', '-id'),
+    'relevance': ('-search_rank', '-id'),
+}
+
+# Values the search forms send to mean "no filter"
+EMPTY_VALUES = ('', 'Any', 'All Types')
+
+# Filters that must hold an id, an amount, or a count ("3" or "3+")
+ID_PARAMS = ('state_type', 'city_type')
+PRICE_PARAMS = ('min_price', 'max_price')
+COUNT_PARAMS = ('bedrooms', 'bathrooms')
+
+COUNT_RE = re.compile(r'\d+\+?')
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+def normalize_filter_params(params):
+    """
+    Reduce a QueryDict/dict to the recognised, non-empty filters as a
+    sorted tuple of (name, value) pairs, e.g. for use in cache keys.
+    """
+    normalized = []
+    for name in FILTER_PARAMS:
+        value = params.get(name)
+        if value is None:
+            continue
+        value = str(value).strip()
+        if value in EMPTY_VALUES:
+            continue
+        normalized.append((name, value))
+    return tuple(normalized)
+
+
+def _valid_filter_value(name, value):
+    if name in ID_PARAMS:
+        return value.isdigit()
+    if name in PRICE_PARAMS:
+        try:
+            amount = Decimal(value)
+        except InvalidOperation:
+            return False
+        return amount.is_finite() and amount >= 0
+    if name in COUNT_PARAMS:
+        return COUNT_RE.fullmatch(value) is not None
+    return True
+
+
+def validate_filter_params(params):
+    """Raise InvalidFilter for the first recognised filter whose value can't be applied"""
+    for name, value in normalize_filter_params(params):
+        if not _valid_filter_value(name, value):
+            raise InvalidFilter(f'Invalid value for {name}: {value!r}')
+
+
+def drop_invalid_filters(params):
+    """
+    For pages that should still render: a copy of the QueryDict `params`
+    without the filters validate_filter_params would reject, and the
+    names of the ones dropped.
+    """
+    invalid = [name for name, value in normalize_filter_params(params) if not _valid_filter_value(name, value)]
+    if not invalid:
+        return params, []
+    params = params.copy()
+    for name in invalid:
+        params.pop(name)
+    return params, invalid
+
+
+def _count_filter(queryset, field, value):
+    """Apply an exact or "N+" filter on a numeric field"""
+    if '+' in value:
+        return queryset.filter(**{f'{field}__gte': int(value.replace('+', ''))})
+    return queryset.filter(**{field: int(value)})
+
+
+def filter_amenities(queryset, required_mask):
+    """
+    Keep properties having every amenity bit in `required_mask`.
+    Any superset of the mask is numerically >= it, so the range condition
+    lets the amenity_mask index narrow the scan before the bitwise check.
+    """
+    return queryset.alias(
+        matched_amenities=F('amenity_mask').bitand(required_mask)
+    ).filter(amenity_mask__gte=required_mask, matched_amenities=required_mask)
+
+
+def filter_properties(queryset, params):
+    """
+    Apply the property_list query-string filters to a Property queryset.
+    Raises InvalidFilter if a filter value is malformed (e.g. bedrooms=abc).
+    """
+    validate_filter_params(params)
+
+    # Keyword Search (e.g. from global search) - ranked full-text index
+    query = params.get('q')
+    if query:
+        queryset = apply_search(queryset, query)
+
+    state_id = params.get('state_type')
+    if state_id:
+        queryset = queryset.filter(state_id=state_id)
+
+    listing_type = params.get('listing_type')
+    if listing_type and listing_type not in ('', 'buy'):
+        queryset = queryset.filter(status__name__icontains=listing_type)
+
+    # City filter (from homepage search form)
+    city_id = params.get('city_type')
+    if city_id:
+        queryset = queryset.filter(city_id=city_id)
+
+    # Property Type
+    prop_type = params.get('type')
+    if prop_type and prop_type != 'All Types':
+        queryset = queryset.filter(property_type__name=prop_type)
+
+    # Price Range
+    min_price = params.get('min_price')
+    max_price = params.get('max_price')
+    if min_price:
+        queryset = queryset.filter(price__gte=min_price)
+    if max_price:
+        queryset = queryset.filter(price__lte=max_price)
+
+    # Bedrooms / Bathrooms
+    bedrooms = params.get('bedrooms')
+    if bedrooms and bedrooms != 'Any':
+        queryset = _count_filter(queryset, 'bedrooms', bedrooms)
+
+    bathrooms = params.get('bathrooms')
+    if bathrooms and bathrooms != 'Any':
+        queryset = _count_filter(queryset, 'bathrooms', bathrooms)
+
+    # Location (Text search for City/State/Address)
+    location = params.get('location')
+    if location:
+        queryset = queryset.filter(
+            Q(city__name__icontains=location) |
+            Q(state__name__icontains=location) |
+            Q(address__icontains=location)
+        )
+
+    # Features - one "contains all bits" predicate on the packed mask
+    required = 0
+    for param, field, _ in AMENITY_FILTERS:
+        if params.get(param):
+            required |= AMENITY_BITS[field]
+    if required:
+        queryset = filter_amenities(queryset, required)
+
+    return queryset
+
+
+def get_sort_ordering(sort_by, query=None):
+    """
+    Resolve a `sort` parameter to (sort name, ordering). Relevance is the
+    default for keyword searches and is only available with a query.
+    """
+    sort_by = sort_by or ('relevance' if query else 'newest')
+    if sort_by not in SORT_ORDERINGS or (sort_by == 'relevance' and not query):
+        sort_by = 'newest'
+    return sort_by, SORT_ORDERINGS[sort_by]
+
+
+def apply_sort(queryset, sort_by):
+    """Add any annotation the chosen sort orders by"""
+    if sort_by == 'trending':
+        from core.trending import annotate_trending
+        return annotate_trending(queryset)
+    return queryset
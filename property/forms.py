@@ -65,4 +65,21 @@ class PropertyApplicationForm(forms.ModelForm):
         cleaned = super().clean()
         if cleaned.get('is_pep') and not cleaned.get('pep_details', '').strip():
             self.add_error('pep_details', 'Please state the name and position of the PEP.')
-        return cleaned
\ No newline at end of file
+        return cleaned
+
+class PropertyImportForm(forms.Form):
+    """Admin upload for property/importer.py"""
+    file = forms.FileField(help_text="CSV or JSON Lines (.jsonl), one listing per row")
+    owner = forms.CharField(help_text="Email or username of the account the listings belong to")
+    fetch_photos = forms.BooleanField(required=False, initial=True, label="Download photos")
+    charge_slots = forms.BooleanField(required=False, initial=True, label="Use the owner's listing slots")
+
+    def clean_owner(self):
+        from django.contrib.auth import get_user_model
+        from django.db.models import Q
+
+        value = self.cleaned_data['owner'].strip()
+        users = get_user_model().objects.filter(Q(email__iexact=value) | Q(username=value))
+        if users.count() != 1:
+            raise forms.ValidationError("No single user matches this email or username.")
+        return users.get()
@@ -0,0 +1,106 @@
+"""
+Listing galleries, served a page at a time.
+
+A listing's gallery is its featured image followed by its PropertyImage
+rows. Each entry carries its URLs (original, thumbnail and the resized
+variants from core/images.py), caption, order and pixel dimensions. The
+whole gallery's metadata is cached per listing and invalidated when the
+listing or any of its images change (see signals.py).
+
+The detail page renders only the first PREVIEW_SIZE entries. The rest
+are fetched from `api/properties/<pk>/gallery/` as the visitor reaches
+them.
+"""
+from django.core.cache import cache
+from django.core.files.images import get_image_dimensions
+
+from core.images import FORMATS, VARIANTS, is_ready, variant_name
+from .models import Property, PropertyImage
+
+GALLERY_PAGE_SIZE = 12
+MAX_PAGE_SIZE = 48
+PREVIEW_SIZE = 7  # featured image + six thumbnails
+GALLERY_CACHE_TIMEOUT = 60 * 60 * 24
+PENDING_CACHE_TIMEOUT = 60 * 5  # variants still being generated; look again soon
+
+
+def gallery_cache_key(property_id):
+    return f'property:gallery:{property_id}'
+
+
+def _measure(field_file):
+    try:
+        with field_file.open('rb') as f:
+            return get_image_dimensions(f)
+    except Exception:
+        return None, None
+
+
+def _entry(field_file, *, index, image_id=None, caption='', order=0, is_primary=False, width=None, height=None):
+    storage, name = field_file.storage, field_file.name
+    url = field_file.url
+    variants = {}
+    if is_ready(storage, name):
+        variants = {
+            variant: {fmt: storage.url(variant_name(name, variant, fmt)) for fmt in FORMATS}
+            for variant in VARIANTS
+        }
+    return {
+        'index': index,
+        'id': image_id,
+        'url': url,
+        'thumbnail': variants['thumb']['jpg'] if variants else url,
+        'large': variants['hero']['jpg'] if variants else url,
+        'variants': variants,
+        'caption': caption,
+        'order': order,
+        'is_primary': is_primary,
+        'width': width,
+        'height': height,
+    }
+
+
+def _build(prop):
+    entries = []
+    if prop.featured_image:
+        width, height = _measure(prop.featured_image)
+        entries.append(_entry(prop.featured_image, index=0, caption=prop.title, is_primary=True, width=width, height=height))
+
+    for image in PropertyImage.objects.filter(property=prop):
+        if not image.image:
+            continue
+        if image.width is None:
+            # Rows created before dimensions were stored (or bulk-imported)
+            image.width, image.height = _measure(image.image)
+            if image.width is not None:
+                PropertyImage.objects.filter(pk=image.pk).update(width=image.width, height=image.height)
+        entries.append(_entry(
+            image.image,
+            index=len(entries),
+            image_id=image.pk,
+            caption=image.caption,
+            order=image.order,
+            is_primary=image.is_primary,
+            width=image.width,
+            height=image.height,
+        ))
+    return entries
+
+
+def load_gallery(property_id):
+    """Metadata for every image of a listing (cached); None if there's no such listing"""
+    key = gallery_cache_key(property_id)
+    entries = cache.get(key)
+    if entries is None:
+        prop = Property.objects.filter(pk=property_id).only('id', 'title', 'featured_image').first()
+        if prop is None:
+            return None
+        entries = _build(prop)
+        pending = any(not entry['variants'] for entry in entries)
+        cache.set(key, entries, PENDING_CACHE_TIMEOUT if pending else GALLERY_CACHE_TIMEOUT)
+    return entries
+
+
+def invalidate_gallery(property_id):
+    if property_id:
+        cache.delete(gallery_cache_key(property_id))
@@ -0,0 +1,449 @@
+"""
+Bulk property import (agency migrations).
+
+Rows come from CSV or JSON Lines. Each row is one listing with these
+columns:
+- required: title, state, city, address, property_type, status,
+  square_feet, price;
+- optional: description, zip_code, latitude, longitude, bedrooms,
+  bathrooms, lot_size, year_built, parking_spaces, video_url, the amenity
+  flags (has_pool...), and photos.
+
+photos holds image URLs separated by '|'; the first is the featured image.
+state, city, type and status are resolved by name, code or label through
+lookup maps loaded once.
+
+Rows are processed in batches:
+1. validate the rows;
+2. download the batch's photos in a thread pool, outside any transaction;
+3. in one transaction, bulk_create the listings and their gallery images,
+   index them for search and charge the owner's listing slots for the
+   whole batch.
+
+After each committed batch, the input line reached is written to a
+checkpoint file, so an interrupted import resumes where it stopped.
+Derived data that saves would normally maintain (map clusters, similar
+listings, market segments, saved-search alerts) is refreshed at the end
+in batched passes over the created rows. Similar listings are only
+queued; `build_similar_properties --pending` scores them.
+"""
+import csv
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from urllib.parse import urlparse
+
+import requests
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import F
+
+from core.slugs import SlugAllocator
+from .models import AMENITY_FLAGS, City, Property, PropertyImage, PropertyStatus, PropertyType, State
+
+BATCH_SIZE = 200
+PHOTO_WORKERS = 8
+PHOTO_TIMEOUT = 15
+MAX_PHOTOS = 20
+
+REQUIRED_COLUMNS = ('title', 'state', 'city', 'address', 'property_type', 'status', 'square_feet', 'price')
+INTEGER_COLUMNS = ('bedrooms', 'bathrooms', 'lot_size', 'year_built', 'parking_spaces')
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+COORDINATE_LIMITS = {'latitude': 90, 'longitude': 180}
+
+
+class RowError(ValueError):
+    """A row that can't be imported; the rest of the batch goes ahead"""
+
+
+class SlotsExhausted(Exception):
+    """The owner has no listing slots left for the next batch"""
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    photos: int = 0
+    photo_errors: int = 0
+    batches: int = 0
+    resumed_from: int = 0
+    already_complete: bool = False
+    errors: list = field(default_factory=list)  # (line, message)
+    created_ids: list = field(default_factory=list)
+
+
+# ==================== INPUT ====================
+
+def read_rows(stream, fmt):
+    """Yield (line number, row dict) from a text stream of CSV or JSONL"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {k.strip(): (v or '').strip() for k, v in row.items() if k}
+    elif fmt == 'jsonl':
+        for line_no, line in enumerate(stream, start=1):
+            if line.strip():
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, {'__error__': f'Invalid JSON: {e}'}
+    else:
+        raise ValueError(f'Unknown format {fmt!r} (use csv or jsonl)')
+
+
+def detect_format(name):
+    return 'jsonl' if name.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+class LookupMaps:
+    """Name/code/label -> id maps for the lookup tables, loaded once"""
+
+    def __init__(self):
+        self.states = {}
+        for pk, name, code in State.objects.values_list('id', 'name', 'code'):
+            self.states[name.lower()] = pk
+            self.states[code.lower()] = pk
+        self.cities = {
+            (state_id, name.lower()): pk
+            for pk, name, state_id in City.objects.values_list('id', 'name', 'state_id')
+        }
+        type_labels = dict(PropertyType.TYPE_CHOICES)
+        self.types = {}
+        for pk, name in PropertyType.objects.values_list('id', 'name'):
+            self.types[name.lower()] = pk
+            self.types[str(type_labels.get(name, name)).lower()] = pk
+        status_labels = dict(PropertyStatus.STATUS_CHOICES)
+        self.statuses = {}
+        for pk, name in PropertyStatus.objects.values_list('id', 'name'):
+            self.statuses[name.lower()] = pk
+            self.statuses[str(status_labels.get(name, name)).lower()] = pk
+
+    @staticmethod
+    def _find(mapping, key, what):
+        try:
+            return mapping[key]
+        except KeyError:
+            raise RowError(f'Unknown {what}')
+
+    def state(self, value):
+        return self._find(self.states, value.lower(), f'state "{value}"')
+
+    def city(self, state_id, value):
+        return self._find(self.cities, (state_id, value.lower()), f'city "{value}"')
+
+    def property_type(self, value):
+        key = value.lower()
+        for candidate in (key, key.replace(' ', '_'), key.replace('_', ' ')):
+            if candidate in self.types:
+                return self.types[candidate]
+        raise RowError(f'Unknown property type "{value}"')
+
+    def status(self, value):
+        return self._find(self.statuses, value.lower(), f'status "{value}"')
+
+
+# ==================== VALIDATION ====================
+
+def _text(row, name):
+    value = row.get(name)
+    return '' if value is None else str(value).strip()
+
+
+def _decimal(row, name, required=False):
+    value = _text(row, name).replace(',', '').lstrip('₦')
+    if not value:
+        if required:
+            raise RowError(f'{name} is required')
+        return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise RowError(f'{name} must be a number')
+    if not number.is_finite():  # NaN, Infinity
+        raise RowError(f'{name} must be a number')
+    return number
+
+
+def _integer(row, name, required=False):
+    number = _decimal(row, name, required)
+    if number is None:
+        return None
+    if number < 0 or number != number.to_integral_value():
+        raise RowError(f'{name} must be a whole number')
+    return _fit_column(name, int(number))
+
+
+def _fit_column(name, number):
+    """
+    `number` as the Property column `name` stores it. Raises RowError if
+    it's out of the column's range, rather than failing the whole batch
+    in bulk_create.
+    """
+    if number is None:
+        return None
+    field = Property._meta.get_field(name)
+    internal_type = field.get_internal_type()
+    if internal_type == 'DecimalField':
+        try:
+            number = number.quantize(Decimal(1).scaleb(-field.decimal_places))
+        except InvalidOperation:
+            raise RowError(f'{name} is out of range')
+        if abs(number) >= Decimal(10) ** (field.max_digits - field.decimal_places):
+            raise RowError(f'{name} is out of range')
+        return number
+    low, high = connection.ops.integer_field_range(internal_type)
+    if (low is not None and number < low) or (high is not None and number > high):
+        raise RowError(f'{name} is out of range')
+    return number
+
+
+def _coordinate(row, name):
+    number = _decimal(row, name)
+    limit = COORDINATE_LIMITS[name]
+    if number is not None and not -limit <= number <= limit:
+        raise RowError(f'{name} must be between -{limit} and {limit}')
+    return _fit_column(name, number)
+
+
+def build_property(row, lookups, owner, slugs):
+    """Unsaved Property for a row plus its photo URLs; raises RowError"""
+    if '__error__' in row:
+        raise RowError(row['__error__'])
+    missing = [name for name in REQUIRED_COLUMNS if not _text(row, name)]
+    if missing:
+        raise RowError(f"Missing {', '.join(missing)}")
+
+    state_id = lookups.state(_text(row, 'state'))
+    prop = Property(
+        title=_text(row, 'title')[:200],
+        description=_text(row, 'description'),
+        state_id=state_id,
+        city_id=lookups.city(state_id, _text(row, 'city')),
+        address=_text(row, 'address')[:500],
+        zip_code=_text(row, 'zip_code')[:10],
+        latitude=_coordinate(row, 'latitude'),
+        longitude=_coordinate(row, 'longitude'),
+        property_type_id=lookups.property_type(_text(row, 'property_type')),
+        status_id=lookups.status(_text(row, 'status')),
+        square_feet=_integer(row, 'square_feet', required=True),
+        price=_fit_column('price', _decimal(row, 'price', required=True)),
+        video_url=_text(row, 'video_url'),
+        listed_by=owner,
+    )
+    for name in INTEGER_COLUMNS:
+        value = _integer(row, name)
+        if value is not None:
+            setattr(prop, name, value)
+    for flag, _ in AMENITY_FLAGS:
+        setattr(prop, flag, _text(row, flag).lower() in TRUE_VALUES)
+    if prop.price <= 0:
+        raise RowError('price must be positive')
+
+    # What Property.save() would have derived
+    if prop.square_feet:
+        prop.price_per_sqft = _fit_column('price_per_sqft', prop.price / prop.square_feet)
+    prop.amenity_mask = prop.compute_amenity_mask()
+    prop.geohash = prop.compute_geohash()
+    prop.slug = slugs.allocate(prop.title)
+
+    photos = row.get('photos') or []
+    if isinstance(photos, str):
+        photos = [url.strip() for url in photos.split('|')]
+    return prop, [url for url in photos if url][:MAX_PHOTOS]
+
+
+# ==================== PHOTOS ====================
+
+def _download(url):
+    try:
+        response = requests.get(url, timeout=PHOTO_TIMEOUT)
+        response.raise_for_status()
+        if not response.headers.get('Content-Type', 'image/').startswith('image/'):
+            return url, None
+        return url, response.content
+    except requests.RequestException:
+        return url, None
+
+
+def download_photos(urls, workers=PHOTO_WORKERS):
+    """{url: bytes or None} for a batch's photos, fetched concurrently"""
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_download, unique))
+
+
+def _photo_file(prop, url, data, index):
+    extension = os.path.splitext(urlparse(url).path)[1].lower()
+    if extension not in ('.jpg', '.jpeg', '.png', '.webp', '.gif'):
+        extension = '.jpg'
+    return ContentFile(data, name=f'{prop.slug[:80]}-{index}{extension}')
+
+
+# ==================== CHECKPOINTS ====================
+
+def load_checkpoint(path, source):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        checkpoint = json.load(f)
+    return checkpoint if checkpoint.get('source') == source else None
+
+
+def save_checkpoint(path, data):
+    if not path:
+        return
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(data, f)
+    os.replace(temporary, path)  # atomic: a crash never leaves half a file
+
+
+# ==================== IMPORT ====================
+
+def _charge_slots(owner, count, charge):
+    """Reserve `count` listing slots for the batch (row-locked), or raise SlotsExhausted"""
+    from listings.models import UserSubscription
+
+    if not charge:
+        return
+    subscription, _ = UserSubscription.objects.get_or_create(user=owner)
+    subscription = UserSubscription.objects.select_for_update().get(pk=subscription.pk)
+    if subscription.remaining_slots < count:
+        raise SlotsExhausted(
+            f'{owner} has {subscription.remaining_slots} listing slots left, this batch needs {count}'
+        )
+    UserSubscription.objects.filter(pk=subscription.pk).update(used_slots=F('used_slots') + count)
+
+
+def _write_batch(batch, photos, charge, owner):
+    """Create one batch of (line, property, photo urls); returns (created, photos saved)"""
+    from .market import listing_segments, mark_dirty
+    from .search import index_properties
+
+    saved_photos = 0
+    gallery = []
+    with transaction.atomic():
+        _charge_slots(owner, len(batch), charge)
+        for _, prop, urls in batch:
+            files = [(url, photos.get(url)) for url in urls]
+            files = [(url, data) for url, data in files if data]
+            if files:
+                # FileField.pre_save stores it during bulk_create
+                prop.featured_image = _photo_file(prop, files[0][0], files[0][1], 0)
+                saved_photos += 1
+        Property.objects.bulk_create([prop for _, prop, _ in batch])
+
+        for _, prop, urls in batch:
+            files = [(url, photos.get(url)) for url in urls[1:]]
+            for order, (url, data) in enumerate((u, d) for u, d in files if d):
+                gallery.append(PropertyImage(
+                    property=prop, image=_photo_file(prop, url, data, order + 1), order=order,
+                ))
+        PropertyImage.objects.bulk_create(gallery)
+        saved_photos += len(gallery)
+
+        ids = [prop.pk for _, prop, _ in batch]
+        index_properties(Property.objects.filter(pk__in=ids))
+
+    statuses = dict(PropertyStatus.objects.values_list('id', 'name'))
+    keys = set()
+    for _, prop, _ in batch:
+        prop.status_name = statuses[prop.status_id]
+        keys.update(listing_segments(prop))
+    mark_dirty(keys)
+    return len(batch), saved_photos
+
+
+def refresh_derived(created_ids):
+    """
+    Refresh what per-listing save signals maintain (bulk_create sends
+    none), in batched passes over the created rows
+    """
+    from core.cache import bump_generation
+    from listings.saved_searches import match_properties
+    from .clusters import add_listings
+    from .ranking import rank_properties
+    from .similarity import queue_rescore
+
+    if not created_ids:
+        return
+    bump_generation('properties')
+    bump_generation('homepage')
+    add_listings(created_ids)
+    queue_rescore(created_ids)  # scored by the next build_similar_properties --pending
+    rank_properties(created_ids)
+    match_properties(created_ids)
+
+
+def import_properties(
+    stream, fmt, owner, *, source=None, checkpoint_path=None, batch_size=BATCH_SIZE,
+    charge_slots=True, fetch_photos=True, progress=None,
+):
+    """
+    Import listings from `stream` for `owner`. `source` identifies the
+    input in the checkpoint (e.g. its path). `progress(report)` is called
+    after every batch. Stops early with SlotsExhausted; the checkpoint
+    records how far it got.
+    """
+    report = ImportReport()
+    checkpoint = load_checkpoint(checkpoint_path, source)
+    if checkpoint:
+        if checkpoint.get('complete'):
+            report.already_complete = True
+            return report
+        report.resumed_from = checkpoint['line']
+
+    lookups = LookupMaps()
+    slugs = SlugAllocator(Property)
+    pending = []
+    last_line = report.resumed_from
+
+    def flush():
+        if not pending:
+            return
+        photos = download_photos([url for _, _, urls in pending for url in urls]) if fetch_photos else {}
+        wanted = sum(len(urls) for _, _, urls in pending) if fetch_photos else 0
+        created, saved_photos = _write_batch(pending, photos, charge_slots, owner)
+        report.created += created
+        report.photos += saved_photos
+        report.photo_errors += wanted - saved_photos
+        report.created_ids.extend(prop.pk for _, prop, _ in pending)
+        report.batches += 1
+        save_checkpoint(checkpoint_path, {'source': source, 'line': pending[-1][0], 'created': report.created})
+        pending.clear()
+        if progress:
+            progress(report)
+
+    try:
+        for line, row in read_rows(stream, fmt):
+            if line <= report.resumed_from:
+                continue
+            last_line = line
+            report.rows += 1
+            try:
+                prop, urls = build_property(row, lookups, owner, slugs)
+            except RowError as e:
+                report.errors.append((line, str(e)))
+                continue
+            pending.append((line, prop, urls))
+            if len(pending) >= batch_size:
+                flush()
+        flush()
+        save_checkpoint(checkpoint_path, {
+            'source': source, 'line': last_line, 'created': report.created, 'complete': True,
+        })
+    finally:
+        refresh_derived(report.created_ids)
+    return report
+
+
+def import_uploaded_file(uploaded, owner, **options):
+    """Admin upload entry point: decode the file and import it"""
+    stream = io.TextIOWrapper(uploaded.file, encoding='utf-8-sig', newline='')
+    return import_properties(stream, detect_format(uploaded.name), owner, source=uploaded.name, **options)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from property.clusters import MAX_ZOOM, MIN_ZOOM, rebuild_clusters
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the precomputed map marker clusters for every zoom level'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        # Saves/deletes keep clusters current; run after bulk updates or imports
+        written = rebuild_clusters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Built {written} clusters for zoom levels {MIN_ZOOM}-{MAX_ZOOM}'
+        ))
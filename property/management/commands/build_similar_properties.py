@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from property.similarity import SIMILAR_COUNT, rebuild_similar, rescore_pending
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the "similar properties" recommendations for every active listing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=SIMILAR_COUNT, help='Neighbours stored per listing')
+        parser.add_argument(
+            '--pending', action='store_true',
+            help='Only rescore listings queued by edits since the last run (schedule every few minutes)',
+        )
+
+    def handle(self, *args, **options):
+        if options['pending']:
+            rescored = rescore_pending(k=options['k'])
+            self.stdout.write(self.style.SUCCESS(f'✓ Rescored similar properties for {rescored} queued listings'))
+            return
+        # A periodic full run also picks up drift in the price/size
+        # scaling as the catalogue grows
+        scored = rebuild_similar(k=options['k'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Computed similar properties for {scored} listings'))
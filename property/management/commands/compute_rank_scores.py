@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from property.ranking import compute_rank_scores
+
+
+class Command(BaseCommand):
+    help = 'Recomputes Property.rank_score (the "Recommended" sort) for every listing'
+
+    def handle(self, *args, **options):
+        # Saves rescore single listings; this periodic run applies freshness
+        # decay and the latest engagement to everything
+        scored, written = compute_rank_scores()
+        self.stdout.write(self.style.SUCCESS(f'✓ Scored {scored} listings ({written} scores changed)'))
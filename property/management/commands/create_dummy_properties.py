@@ -9,6 +9,8 @@ from datetime import timedelta
 from django.utils import timezone
 from decimal import Decimal
 
+from core.slugs import SlugAllocator
+
 User = get_user_model()
 
 class Command(BaseCommand):
@@ -94,6 +96,7 @@ class Command(BaseCommand):
             'Renovated Duplex', 'Penthouse with View', 'Affordable Starter Home'
         ]
 
+        slugs = SlugAllocator(Property)
         for i in range(20):
             prop_type = random.choice(property_types)
             status = random.choice(property_statuses)
@@ -101,8 +104,10 @@ class Command(BaseCommand):
             
             price = Decimal(random.randint(1, 500) * 1000000) if not is_rent else Decimal(random.randint(50, 500) * 10000)
             
+            title = f"{random.choice(titles)} {i+1}"
             p = Property(
-                title=f"{random.choice(titles)} {i+1}",
+                title=title,
+                slug=slugs.allocate(title),
                 description=f"This is a dummy description for property {i+1}. It features amazing amenities and a great location.",
                 state=state,
                 city=random.choice(cities),
@@ -118,7 +123,7 @@ class Command(BaseCommand):
                 is_new=random.choice([True, False])
             )
             
-            # Save first to get ID/Slug
+            # Save first so the image can be attached
             p.save()
 
             # Attach Image - Only if images are available
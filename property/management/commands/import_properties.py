@@ -0,0 +1,69 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from property.importer import BATCH_SIZE, SlotsExhausted, detect_format, import_properties
+
+
+class Command(BaseCommand):
+    help = 'Imports listings from a CSV or JSON Lines file (resumable, see property/importer.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or .jsonl file')
+        parser.add_argument('--user', required=True, help='Email or username of the listing owner')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--checkpoint', help='Checkpoint file (default: <path>.checkpoint.json)')
+        parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint')
+        parser.add_argument('--no-photos', action='store_true', help='Skip downloading photos')
+        parser.add_argument('--no-charge', action='store_true', help="Don't use the owner's listing slots")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'{path} does not exist')
+        User = get_user_model()
+        try:
+            owner = User.objects.get(Q(email__iexact=options['user']) | Q(username=options['user']))
+        except (User.DoesNotExist, User.MultipleObjectsReturned):
+            raise CommandError(f"No single user matches {options['user']!r}")
+
+        checkpoint = options['checkpoint'] or f'{path}.checkpoint.json'
+        if options['restart'] and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        def progress(report):
+            self.stdout.write(
+                f'  batch {report.batches}: {report.created} created, {len(report.errors)} rejected, '
+                f'{report.photos} photos ({report.photo_errors} failed)'
+            )
+
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            try:
+                report = import_properties(
+                    stream, options['format'] or detect_format(path), owner,
+                    source=os.path.abspath(path),
+                    checkpoint_path=checkpoint,
+                    batch_size=options['batch_size'],
+                    charge_slots=not options['no_charge'],
+                    fetch_photos=not options['no_photos'],
+                    progress=progress,
+                )
+            except SlotsExhausted as e:
+                raise CommandError(f'{e}. Buy more slots and run the command again to resume.')
+
+        if report.already_complete:
+            self.stdout.write(self.style.WARNING(
+                f'{path} was already imported (see {checkpoint}); use --restart to import it again'
+            ))
+            return
+        if report.resumed_from:
+            self.stdout.write(f'Resumed after line {report.resumed_from}')
+        for line, message in report.errors[:50]:
+            self.stdout.write(self.style.WARNING(f'  line {line}: {message}'))
+        if len(report.errors) > 50:
+            self.stdout.write(self.style.WARNING(f'  ... and {len(report.errors) - 50} more'))
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Imported {report.created} of {report.rows} rows ({len(report.errors)} rejected, {report.photos} photos)'
+        ))
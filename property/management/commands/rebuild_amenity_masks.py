@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from property.models import Property, amenity_mask_expression
+
+
+class Command(BaseCommand):
+    help = 'Recomputes Property.amenity_mask from the amenity boolean fields'
+
+    def handle(self, *args, **options):
+        # Single UPDATE; needed after bulk .update() calls that bypass save()
+        updated = Property.objects.update(amenity_mask=amenity_mask_expression())
+        self.stdout.write(self.style.SUCCESS(f'✓ Recomputed amenity masks for {updated} properties'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from property.models import Property, PropertySearchDocument
+from property.search import index_properties, unindexed_properties
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text property search index (PropertySearchDocument)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing-only',
+            action='store_true',
+            help='Only index properties that have no search document yet',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of documents written per batch (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        if options['missing_only']:
+            queryset = unindexed_properties()
+        else:
+            queryset = Property.objects.all()
+
+        self.stdout.write(f'Indexing {queryset.count()} properties...')
+        total = index_properties(queryset, batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Indexed {total} properties ({PropertySearchDocument.objects.count()} documents in index)'
+        ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from listings.models import SavedProperty
+from property.models import Property
+
+
+class Command(BaseCommand):
+    help = 'Recomputes Property.saved_count from SavedProperty rows'
+
+    def handle(self, *args, **options):
+        # Single UPDATE with a correlated COUNT; catches drift from bulk
+        # deletes or raw SQL that bypassed the SavedProperty signals
+        saves = (
+            SavedProperty.objects.filter(property=OuterRef('pk'))
+            .order_by()
+            .values('property')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        updated = Property.objects.update(
+            saved_count=Coalesce(Subquery(saves, output_field=IntegerField()), 0)
+        )
+        self.stdout.write(self.style.SUCCESS(f'✓ Reconciled saved counts for {updated} properties'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from property.market import refresh_market_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes market price statistics for segments changed since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every segment from scratch')
+
+    def handle(self, *args, **options):
+        written = refresh_market_stats(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Refreshed {written} market segments'))
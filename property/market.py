@@ -0,0 +1,238 @@
+"""
+Materialised market statistics.
+
+Listings are grouped into segments by listing status (sale or rent
+prices are never mixed) and then by:
+- the whole country
+- state
+- city
+- property type
+- state + type
+- city + type
+
+Each segment has one MarketStats row with price percentiles, a
+log-scale price histogram and price-per-sqft quartiles.
+
+Saving or deleting a property marks the segments of its old and new
+values dirty (two small queries). `refresh_market_stats` then recomputes
+only the dirty segments, with NumPy, from one query over the affected
+statuses. The JSON endpoint and the `market_position` template tag read
+the rows through the cache.
+"""
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import bump_generation, versioned_key
+from .models import MarketStats, Property
+
+MARKET_STATUSES = ['for_sale', 'for_rent']
+
+# Fields whose change moves a listing between segments or changes its stats
+MARKET_FIELDS = frozenset([
+    'price', 'square_feet', 'price_per_sqft', 'status', 'state', 'city', 'property_type', 'is_active',
+])
+
+PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_BINS = 12
+
+# Smallest segment trusted for a "vs median" badge
+MIN_BADGE_SAMPLE = 5
+
+STATS_CACHE_TIMEOUT = 60 * 60
+
+ANY = '*'
+
+# (state, city, type) components present in each segment
+SEGMENT_SHAPES = [
+    (False, False, False),
+    (True, False, False),
+    (False, True, False),
+    (False, False, True),
+    (True, False, True),
+    (False, True, True),
+]
+
+
+def segment_key(status, state_id=None, city_id=None, property_type_id=None):
+    parts = [state_id, city_id, property_type_id]
+    return ':'.join([status] + [str(p) if p is not None else ANY for p in parts])
+
+
+def parse_segment_key(key):
+    status, *parts = key.split(':')
+    return status, *[None if p == ANY else int(p) for p in parts]
+
+
+def segment_keys_for(status, state_id, city_id, property_type_id):
+    """Every segment a listing with these values belongs to"""
+    if status not in MARKET_STATUSES:
+        return []
+    return [
+        segment_key(
+            status,
+            state_id if has_state else None,
+            city_id if has_city else None,
+            property_type_id if has_type else None,
+        )
+        for has_state, has_city, has_type in SEGMENT_SHAPES
+    ]
+
+
+def listing_segments(prop):
+    """Segment keys for a Property (instance or a row annotated with status_name)"""
+    if not prop.is_active:
+        return []
+    status_name = getattr(prop, 'status_name', None) or prop.status.name
+    return segment_keys_for(status_name, prop.state_id, prop.city_id, prop.property_type_id)
+
+
+def mark_dirty(keys):
+    """Flag segments for the next refresh, creating rows for new ones"""
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    MarketStats.objects.bulk_create(
+        [MarketStats(key=key, **dict(zip(
+            ('listing_status', 'state_id', 'city_id', 'property_type_id'), parse_segment_key(key)
+        ))) for key in keys],
+        ignore_conflicts=True,
+    )
+    MarketStats.objects.filter(key__in=keys, is_dirty=False).update(is_dirty=True)
+
+
+# ==================== BATCH REFRESH ====================
+
+def _segment_stats(prices, ppsf):
+    quantiles = np.percentile(prices, PERCENTILES)
+    stats = {
+        'listing_count': int(len(prices)),
+        'price_min': float(prices.min()),
+        'price_max': float(prices.max()),
+        'price_mean': float(prices.mean()),
+        **{f'price_p{p}': float(q) for p, q in zip(PERCENTILES, quantiles)},
+    }
+    # Log-spaced bins: prices span several orders of magnitude
+    positive = prices[prices > 0]
+    if len(positive):
+        counts, edges = np.histogram(np.log10(positive), bins=HISTOGRAM_BINS)
+        stats['price_histogram'] = {
+            'edges': [round(float(10 ** e), 2) for e in edges],
+            'counts': [int(c) for c in counts],
+        }
+    else:
+        stats['price_histogram'] = {}
+    ppsf = ppsf[ppsf > 0]
+    if len(ppsf):
+        p25, p50, p75 = np.percentile(ppsf, (25, 50, 75))
+        stats.update(ppsf_p25=float(p25), ppsf_median=float(p50), ppsf_p75=float(p75))
+    else:
+        stats.update(ppsf_p25=None, ppsf_median=None, ppsf_p75=None)
+    return stats
+
+
+def refresh_market_stats(full=False):
+    """
+    Recompute dirty segments (or every segment with full=True).
+    Returns the number of segments written.
+    """
+    if full:
+        MarketStats.objects.update(is_dirty=True)
+    dirty = set(MarketStats.objects.filter(is_dirty=True).values_list('key', flat=True))
+    statuses = {parse_segment_key(key)[0] for key in dirty}
+    if full:
+        statuses = set(MARKET_STATUSES)
+    if not statuses:
+        return 0
+
+    rows = list(
+        Property.objects.filter(is_active=True, status__name__in=statuses)
+        .values_list('status__name', 'state_id', 'city_id', 'property_type_id', 'price', 'price_per_sqft')
+    )
+    status_col = np.array([r[0] for r in rows], dtype=object)
+    ids = np.array([[r[1] or 0, r[2] or 0, r[3] or 0] for r in rows], dtype=np.int64).reshape(-1, 3)
+    prices = np.array([float(r[4]) for r in rows])
+    ppsf = np.array([float(r[5]) if r[5] is not None else 0.0 for r in rows])
+
+    if full:
+        for row in rows:
+            dirty.update(segment_keys_for(row[0], row[1], row[2], row[3]))
+
+    now = timezone.now()
+    written = 0
+    with transaction.atomic():
+        empty = []
+        for key in dirty:
+            status, *parts = parse_segment_key(key)
+            mask = status_col == status
+            for column, value in enumerate(parts):
+                if value is not None:
+                    mask &= ids[:, column] == value
+            if not mask.any():
+                empty.append(key)
+                continue
+            defaults = _segment_stats(prices[mask], ppsf[mask])
+            defaults.update(is_dirty=False, computed_at=now)
+            MarketStats.objects.update_or_create(
+                key=key,
+                defaults=defaults,
+                create_defaults={**defaults, **dict(zip(
+                    ('listing_status', 'state_id', 'city_id', 'property_type_id'), [status, *parts]
+                ))},
+            )
+            written += 1
+        MarketStats.objects.filter(key__in=empty).delete()
+    bump_generation('market_stats')
+    return written
+
+
+# ==================== READS ====================
+
+def get_segment_stats(keys):
+    """{key: stats dict} for the requested segments that exist (cached)"""
+    cache_keys = {versioned_key('market_stats', key): key for key in keys}
+    cached = cache.get_many(list(cache_keys))
+    found = {cache_keys[ck]: value for ck, value in cached.items()}
+    missing = [key for key in keys if key not in found]
+    if missing:
+        fresh = {}
+        for stats in MarketStats.objects.filter(key__in=missing, listing_count__gt=0):
+            found[stats.key] = fresh[stats.key] = stats.as_dict()
+        # Remember misses too, so unknown segments don't hit the DB each time
+        for key in missing:
+            fresh.setdefault(key, {})
+        cache.set_many(
+            {versioned_key('market_stats', key): value for key, value in fresh.items()},
+            STATS_CACHE_TIMEOUT,
+        )
+    return {key: value for key, value in found.items() if value}
+
+
+def market_position(prop):
+    """
+    Where a listing's price sits against the median of its narrowest
+    well-populated segment (city + type, then city, then state), e.g.
+    {'percent': 12, 'direction': 'below', 'scope': 'Lekki'}.
+    """
+    status_name = prop.status.name
+    if status_name not in MARKET_STATUSES or not prop.price:
+        return None
+    candidates = [
+        (segment_key(status_name, city_id=prop.city_id, property_type_id=prop.property_type_id),
+         f"{prop.property_type.get_name_display()} in {prop.city.name}"),
+        (segment_key(status_name, city_id=prop.city_id), prop.city.name),
+        (segment_key(status_name, state_id=prop.state_id), prop.state.name),
+    ]
+    stats = get_segment_stats([key for key, _ in candidates])
+    for key, scope in candidates:
+        segment = stats.get(key)
+        if segment and segment['listing_count'] >= MIN_BADGE_SAMPLE and segment['price_p50']:
+            difference = (float(prop.price) - segment['price_p50']) / segment['price_p50'] * 100
+            return {
+                'percent': abs(round(difference)),
+                'direction': 'below' if difference < 0 else 'above',
+                'scope': scope,
+                'median': segment['price_p50'],
+            }
+    return None
@@ -0,0 +1,68 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:01
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_search_vector_index(apps, schema_editor):
+    # GIN indexes are PostgreSQL-only; SQLite uses the `document` fallback
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS property_search_vector_gin "
+        "ON property_propertysearchdocument USING GIN (search_vector)"
+    )
+
+
+def drop_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS property_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0010_alter_propertyapplication_floor_choice_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PropertySearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200)),
+                ("location", models.CharField(blank=True, max_length=700)),
+                ("body", models.TextField(blank=True)),
+                ("document", models.TextField(blank=True)),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(
+                        blank=True, null=True
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "property",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_document",
+                        to="property.property",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Property Search Document",
+            },
+        ),
+        migrations.RunPython(create_search_vector_index, drop_search_vector_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agents", "0008_keyset_pagination_indexes"),
+        ("property", "0011_propertysearchdocument"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="property",
+            name="property_pr_price_b1d594_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="property",
+            name="property_pr_created_82f744_idx",
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["price", "id"], name="property_pr_price_c0f0ee_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="property_pr_created_964c11_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["-views_count", "-id"], name="property_pr_views_c_3e2310_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:06
+
+from django.db import migrations, models
+
+# Frozen copy of property.models.AMENITY_FLAGS order (list position = bit)
+AMENITY_FIELDS = [
+    "has_garage",
+    "has_pool",
+    "has_garden",
+    "has_security",
+    "has_gym",
+    "has_balcony",
+    "is_furnished",
+    "has_ac",
+    "has_heating",
+    "pet_friendly",
+]
+
+
+def backfill_amenity_mask(apps, schema_editor):
+    Property = apps.get_model("property", "Property")
+    expression = models.Value(0)
+    for bit, field in enumerate(AMENITY_FIELDS):
+        expression = expression + models.Case(
+            models.When(**{field: True}, then=models.Value(1 << bit)),
+            default=models.Value(0),
+        )
+    Property.objects.update(amenity_mask=expression)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0012_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="amenity_mask",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["amenity_mask"], name="property_pr_amenity_7feac8_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_amenity_mask, migrations.RunPython.noop),
+    ]
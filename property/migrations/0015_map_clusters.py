@@ -0,0 +1,47 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0014_geo_coordinates"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MapCluster",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("zoom", models.PositiveSmallIntegerField()),
+                ("tile_x", models.PositiveIntegerField()),
+                ("tile_y", models.PositiveIntegerField()),
+                ("cell_x", models.PositiveIntegerField()),
+                ("cell_y", models.PositiveIntegerField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("latitude_sum", models.FloatField(default=0)),
+                ("longitude_sum", models.FloatField(default=0)),
+                ("min_price", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("max_price", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["zoom", "tile_x", "tile_y"],
+                        name="property_ma_zoom_12c33d_idx",
+                    )
+                ],
+                "unique_together": {("zoom", "cell_x", "cell_y")},
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0015_map_clusters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimilarProperty",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("distance", models.FloatField()),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_links",
+                        to="property.property",
+                    ),
+                ),
+                (
+                    "similar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="property.property",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Similar Properties",
+                "ordering": ["property", "rank"],
+                "unique_together": {("property", "rank")},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:18
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_saved_count(apps, schema_editor):
+    # saved_count was never maintained before this migration
+    Property = apps.get_model("property", "Property")
+    SavedProperty = apps.get_model("listings", "SavedProperty")
+    saves = (
+        SavedProperty.objects.filter(property=models.OuterRef("pk"))
+        .order_by()
+        .values("property")
+        .annotate(total=models.Count("pk"))
+        .values("total")
+    )
+    Property.objects.update(
+        saved_count=Coalesce(
+            models.Subquery(saves, output_field=models.IntegerField()), 0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0003_add_slot_fields"),
+        ("property", "0016_similar_properties"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["-saved_count", "-id"], name="property_pr_saved_c_5cf662_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_saved_count, migrations.RunPython.noop),
+    ]
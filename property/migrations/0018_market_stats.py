@@ -0,0 +1,78 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0017_saved_count_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MarketStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("listing_status", models.CharField(max_length=20)),
+                ("listing_count", models.PositiveIntegerField(default=0)),
+                ("price_min", models.FloatField(blank=True, null=True)),
+                ("price_p10", models.FloatField(blank=True, null=True)),
+                ("price_p25", models.FloatField(blank=True, null=True)),
+                ("price_p50", models.FloatField(blank=True, null=True)),
+                ("price_p75", models.FloatField(blank=True, null=True)),
+                ("price_p90", models.FloatField(blank=True, null=True)),
+                ("price_max", models.FloatField(blank=True, null=True)),
+                ("price_mean", models.FloatField(blank=True, null=True)),
+                ("price_histogram", models.JSONField(blank=True, default=dict)),
+                ("ppsf_p25", models.FloatField(blank=True, null=True)),
+                ("ppsf_median", models.FloatField(blank=True, null=True)),
+                ("ppsf_p75", models.FloatField(blank=True, null=True)),
+                ("is_dirty", models.BooleanField(db_index=True, default=True)),
+                ("computed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "city",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="property.city",
+                    ),
+                ),
+                (
+                    "property_type",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="property.propertytype",
+                    ),
+                ),
+                (
+                    "state",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="property.state",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Market Stats",
+            },
+        ),
+    ]
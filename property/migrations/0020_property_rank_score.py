@@ -0,0 +1,24 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0019_property_image_dimensions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="rank_score",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["-rank_score", "-id"], name="property_pr_rank_sc_0ad8d4_idx"
+            ),
+        ),
+    ]
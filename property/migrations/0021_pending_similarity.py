@@ -0,0 +1,33 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0020_property_rank_score"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingSimilarity",
+            fields=[
+                (
+                    "property",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="property.property",
+                    ),
+                ),
+                ("queued_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name_plural": "Pending Similarity Updates",
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+from django.db import migrations
+from django.utils.html import strip_tags
+
+BATCH_SIZE = 500
+
+
+def backfill_search_documents(apps, schema_editor):
+    """
+    Index every listing that has no search document yet, so keyword
+    search works straight after deploy (same document as
+    property.search.build_document at the time of writing).
+    """
+    Property = apps.get_model("property", "Property")
+    PropertySearchDocument = apps.get_model("property", "PropertySearchDocument")
+    postgres = schema_editor.connection.vendor == "postgresql"
+    if postgres:
+        from django.contrib.postgres.search import SearchVector
+
+        vector = (
+            SearchVector("title", weight="A", config="english")
+            + SearchVector("location", weight="B", config="english")
+            + SearchVector("body", weight="C", config="english")
+        )
+
+    def write(docs):
+        PropertySearchDocument.objects.bulk_create(docs, ignore_conflicts=True)
+        if postgres:
+            PropertySearchDocument.objects.filter(
+                property_id__in=[doc.property_id for doc in docs]
+            ).update(search_vector=vector)
+
+    missing = (
+        Property.objects.filter(search_document__isnull=True)
+        .select_related("state", "city", "property_type")
+        .order_by("pk")
+    )
+    batch = []
+    for prop in missing.iterator(chunk_size=BATCH_SIZE):
+        location = ", ".join(
+            part
+            for part in [
+                prop.address,
+                prop.city.name,
+                prop.state.name,
+                prop.zip_code,
+                prop.property_type.get_name_display(),
+            ]
+            if part
+        )
+        body = " ".join(strip_tags(prop.description or "").split())
+        batch.append(
+            PropertySearchDocument(
+                property_id=prop.pk,
+                title=prop.title,
+                location=location[:700],
+                body=body,
+                document=" ".join([prop.title, location, body]).lower(),
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            write(batch)
+            batch = []
+    if batch:
+        write(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0021_pending_similarity"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+import math
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Length
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+# Same scoring as property.ranking at the time of writing
+WEIGHTS = {"boost": 0.40, "freshness": 0.25, "engagement": 0.20, "completeness": 0.15}
+BOOST_FLAGS = {"is_featured": 0.5, "is_premium": 0.3, "is_hot": 0.15, "is_exclusive": 0.05}
+FRESHNESS_HALF_LIFE_DAYS = 14
+SAVE_WEIGHT = 5
+FULL_PHOTO_COUNT = 8
+FULL_DESCRIPTION_LENGTH = 800
+
+
+def backfill_rank_scores(apps, schema_editor):
+    """
+    Score every listing, so the `best` sort is meaningful straight after
+    deploy instead of tying everything at 0 until the first
+    compute_rank_scores run.
+    """
+    Property = apps.get_model("property", "Property")
+    rows = list(
+        Property.objects.order_by()
+        .annotate(description_length=Length("description"), photo_count=Count("images"))
+        .values(
+            "id", "created_at", "views_count", "saved_count", "featured_image",
+            "description_length", "photo_count", *BOOST_FLAGS,
+        )
+    )
+    if not rows:
+        return
+
+    def engagement(row):
+        return math.log1p((row["views_count"] or 0) + SAVE_WEIGHT * (row["saved_count"] or 0))
+
+    now = timezone.now()
+    scale = max(engagement(row) for row in rows)
+    scored = []
+    for row in rows:
+        boost = min(sum(share for flag, share in BOOST_FLAGS.items() if row[flag]), 1.0)
+        age_days = max((now - row["created_at"]).total_seconds() / 86400.0, 0)
+        freshness = math.exp(-math.log(2) * age_days / FRESHNESS_HALF_LIFE_DAYS)
+        engaged = min(engagement(row) / scale, 1.0) if scale > 0 else 0.0
+        photos = (row["photo_count"] or 0) + (1 if row["featured_image"] else 0)
+        completeness = (
+            0.6 * min(photos / FULL_PHOTO_COUNT, 1.0)
+            + 0.4 * min((row["description_length"] or 0) / FULL_DESCRIPTION_LENGTH, 1.0)
+        )
+        score = (
+            WEIGHTS["boost"] * boost
+            + WEIGHTS["freshness"] * freshness
+            + WEIGHTS["engagement"] * engaged
+            + WEIGHTS["completeness"] * completeness
+        )
+        scored.append(Property(pk=row["id"], rank_score=round(score, 6)))
+    Property.objects.bulk_update(scored, ["rank_score"], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("property", "0022_backfill_search_documents"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rank_scores, migrations.RunPython.noop),
+    ]
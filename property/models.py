@@ -4,6 +4,7 @@ from django.urls import reverse
 import random
 import string
 from ckeditor.fields import RichTextField
+from django.contrib.postgres.search import SearchVectorField
 from embed_video.fields import EmbedVideoField
 from agents.models import Agent
 User = get_user_model()
@@ -134,6 +135,37 @@ class PropertyStatus(models.Model):
         return self.get_name_display()
 
 
+# Amenity flags packed into Property.amenity_mask, one bit each.
+# (field, label) - the list position is the bit number, so only ever append.
+AMENITY_FLAGS = [
+    ('has_garage', 'Garage'),
+    ('has_pool', 'Swimming Pool'),
+    ('has_garden', 'Garden'),
+    ('has_security', 'Security System'),
+    ('has_gym', 'Gym'),
+    ('has_balcony', 'Balcony / Patio'),
+    ('is_furnished', 'Furnished'),
+    ('has_ac', 'Air Conditioning'),
+    ('has_heating', 'Heating'),
+    ('pet_friendly', 'Pet Friendly'),
+]
+AMENITY_BITS = {field: 1 << bit for bit, (field, _) in enumerate(AMENITY_FLAGS)}
+
+
+def amenity_mask_expression():
+    """SQL expression computing amenity_mask from the boolean columns (for bulk updates)"""
+    from django.db.models import Case, Value, When
+    expression = Value(0)
+    for field, bit in AMENITY_BITS.items():
+        expression = expression + Case(When(**{field: True}, then=Value(bit)), default=Value(0))
+    return expression
+
+
+def decode_amenity_mask(mask):
+    """List of amenity labels set in a packed amenity mask"""
+    return [label for bit, (_, label) in enumerate(AMENITY_FLAGS) if mask & (1 << bit)]
+
+
 class Property(models.Model):
     """Main Property Model"""
     
@@ -147,6 +179,10 @@ class Property(models.Model):
     city = models.ForeignKey(City, on_delete=models.CASCADE, related_name='properties')
     address = models.CharField(max_length=500)
     zip_code = models.CharField(max_length=10, blank=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    # Derived from latitude/longitude in save(); indexed for radius/map searches (core/geo.py)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     
     # Property Details
     property_type = models.ForeignKey(PropertyType, on_delete=models.CASCADE, related_name='properties')
@@ -175,6 +211,8 @@ class Property(models.Model):
     has_ac = models.BooleanField(default=False)
     has_heating = models.BooleanField(default=False)
     pet_friendly = models.BooleanField(default=False)
+    # Packed copy of the flags above (see AMENITY_FLAGS), maintained in save()
+    amenity_mask = models.PositiveIntegerField(default=0, editable=False)
     is_active = models.BooleanField(default=True)
     # Additional Features (JSON field for flexibility)
     additional_features = models.JSONField(blank=True, null=True, help_text="Store additional features as JSON")
@@ -203,6 +241,8 @@ class Property(models.Model):
     # Views & Interactions
     views_count = models.PositiveIntegerField(default=0)
     saved_count = models.PositiveIntegerField(default=0)
+    # Boosts, freshness, engagement and completeness (see property/ranking.py)
+    rank_score = models.FloatField(default=0, editable=False)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -219,38 +259,67 @@ class Property(models.Model):
         indexes = [
             models.Index(fields=['state', 'city']),
             models.Index(fields=['property_type']),
-            models.Index(fields=['price']),
-            models.Index(fields=['-created_at']),
+            # Keyset pagination orderings (see property/filters.py SORT_ORDERINGS)
+            models.Index(fields=['price', 'id']),
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['-views_count', '-id']),
+            models.Index(fields=['-saved_count', '-id']),
+            models.Index(fields=['-rank_score', '-id']),
+            models.Index(fields=['amenity_mask']),
         ]
     
     def __str__(self):
         return self.title
     
     def save(self, *args, **kwargs):
-        # Auto-generate slug
-        if not self.slug:
-            from django.utils.text import slugify
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Property.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        
         # Calculate price per square foot
         if self.square_feet and self.square_feet > 0:
             self.price_per_sqft = self.price / self.square_feet
         
-        super().save(*args, **kwargs)
+        self.amenity_mask = self.compute_amenity_mask()
+        self.geohash = self.compute_geohash()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if AMENITY_BITS.keys() & update_fields:
+                update_fields.add('amenity_mask')
+            if {'latitude', 'longitude'} & update_fields:
+                update_fields.add('geohash')
+            kwargs['update_fields'] = update_fields
+        
+        # Auto-generate slug (one prefix query, retried on a concurrent clash)
+        if not self.slug:
+            from core.slugs import save_with_unique_slug
+            save_with_unique_slug(self, self.title, lambda: super(Property, self).save(*args, **kwargs))
+        else:
+            super().save(*args, **kwargs)
     
     def get_absolute_url(self):
         return reverse('property_detail', kwargs={'slug': self.slug})
     
+    def compute_amenity_mask(self):
+        """Pack the amenity booleans into a single integer"""
+        mask = 0
+        for field, bit in AMENITY_BITS.items():
+            if getattr(self, field):
+                mask |= bit
+        return mask
+    
+    def compute_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            return ''
+        from core.geo import encode_geohash
+        return encode_geohash(self.latitude, self.longitude)
+    
+    @property
+    def amenities(self):
+        """Amenity labels for display, decoded from amenity_mask"""
+        return decode_amenity_mask(self.amenity_mask)
+    
     def increment_views(self):
-        """Increment view count"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        """Increment view count (buffered, see core/counters.py)"""
+        from core.counters import increment
+        increment(self, 'views_count')
     
     def get_badge_display(self):
         """Return appropriate badge for display"""
@@ -285,6 +354,10 @@ class PropertyImage(models.Model):
     caption = models.CharField(max_length=200, blank=True)
     is_primary = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
+    # Filled on upload (or lazily by property/gallery.py) so the gallery API
+    # doesn't have to open the file
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -297,6 +370,12 @@ class PropertyImage(models.Model):
         # If this is set as primary, unset other primary images
         if self.is_primary:
             PropertyImage.objects.filter(property=self.property, is_primary=True).update(is_primary=False)
+        # Measure new uploads (still in memory) and rows not measured yet
+        if self.image and (not self.image._committed or self.width is None):
+            try:
+                self.width, self.height = self.image.width, self.image.height
+            except Exception:
+                self.width = self.height = None
         super().save(*args, **kwargs)
 
 
@@ -327,6 +406,160 @@ class PropertyAmenityLink(models.Model):
         return f"{self.property.title} - {self.amenity.name}"
 
 
+
+class PropertySearchDocument(models.Model):
+    """
+    Denormalized full-text search document for a Property.
+    Kept in sync by property/signals.py; rebuild with `rebuild_search_index`.
+    On PostgreSQL `search_vector` is a weighted tsvector backed by a GIN index,
+    elsewhere (SQLite in development) searches fall back to `document`.
+    """
+    property = models.OneToOneField(Property, on_delete=models.CASCADE, related_name='search_document')
+    title = models.CharField(max_length=200)
+    location = models.CharField(max_length=700, blank=True)
+    body = models.TextField(blank=True)
+
+    # Lowercased title + location + body, used by the non-PostgreSQL fallback
+    document = models.TextField(blank=True)
+    search_vector = SearchVectorField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Property Search Document'
+
+    def __str__(self):
+        return f"Search document for {self.title}"
+
+
+class MapCluster(models.Model):
+    """
+    Precomputed marker cluster for the listings map (see property/clusters.py).
+    One row per non-empty grid cell per zoom level; each map tile holds a
+    fixed grid of cells. Running sums keep the centroid incrementally
+    updatable; rebuild with `build_map_clusters`.
+    """
+    zoom = models.PositiveSmallIntegerField()
+    tile_x = models.PositiveIntegerField()
+    tile_y = models.PositiveIntegerField()
+    cell_x = models.PositiveIntegerField()
+    cell_y = models.PositiveIntegerField()
+
+    count = models.PositiveIntegerField(default=0)
+    latitude_sum = models.FloatField(default=0)
+    longitude_sum = models.FloatField(default=0)
+    min_price = models.DecimalField(max_digits=15, decimal_places=2)
+    max_price = models.DecimalField(max_digits=15, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['zoom', 'cell_x', 'cell_y']
+        indexes = [
+            models.Index(fields=['zoom', 'tile_x', 'tile_y']),
+        ]
+
+    def __str__(self):
+        return f"{self.count} properties at z{self.zoom} ({self.cell_x}, {self.cell_y})"
+
+    @property
+    def latitude(self):
+        return self.latitude_sum / self.count if self.count else None
+
+    @property
+    def longitude(self):
+        return self.longitude_sum / self.count if self.count else None
+
+
+class SimilarProperty(models.Model):
+    """
+    Precomputed "similar listings" for the detail page, nearest first
+    (see property/similarity.py). Rebuild with `build_similar_properties`.
+    """
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='similar_links')
+    similar = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    distance = models.FloatField()
+
+    class Meta:
+        unique_together = ['property', 'rank']
+        ordering = ['property', 'rank']
+        verbose_name_plural = 'Similar Properties'
+
+    def __str__(self):
+        return f"{self.property_id} ~ {self.similar_id} (#{self.rank})"
+
+
+class PendingSimilarity(models.Model):
+    """
+    A listing whose "similar properties" need rescoring after an edit.
+    Drained by `build_similar_properties --pending` (see property/similarity.py).
+    """
+    property = models.OneToOneField(Property, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = 'Pending Similarity Updates'
+
+    def __str__(self):
+        return f"{self.property_id} (queued {self.queued_at:%Y-%m-%d %H:%M})"
+
+
+class MarketStats(models.Model):
+    """
+    Price distribution of one market segment: a listing status plus any of
+    state, city and property type (blank = all). Maintained by
+    property/market.py; rebuild with `refresh_market_stats --full`.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    listing_status = models.CharField(max_length=20)
+    state = models.ForeignKey(State, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    city = models.ForeignKey(City, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    property_type = models.ForeignKey(PropertyType, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+
+    listing_count = models.PositiveIntegerField(default=0)
+    price_min = models.FloatField(null=True, blank=True)
+    price_p10 = models.FloatField(null=True, blank=True)
+    price_p25 = models.FloatField(null=True, blank=True)
+    price_p50 = models.FloatField(null=True, blank=True)
+    price_p75 = models.FloatField(null=True, blank=True)
+    price_p90 = models.FloatField(null=True, blank=True)
+    price_max = models.FloatField(null=True, blank=True)
+    price_mean = models.FloatField(null=True, blank=True)
+    price_histogram = models.JSONField(default=dict, blank=True)
+    ppsf_p25 = models.FloatField(null=True, blank=True)
+    ppsf_median = models.FloatField(null=True, blank=True)
+    ppsf_p75 = models.FloatField(null=True, blank=True)
+
+    is_dirty = models.BooleanField(default=True, db_index=True)
+    computed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = 'Market Stats'
+
+    def __str__(self):
+        return f"{self.key} ({self.listing_count} listings)"
+
+    def as_dict(self):
+        return {
+            'status': self.listing_status,
+            'state': self.state_id,
+            'city': self.city_id,
+            'property_type': self.property_type_id,
+            'listing_count': self.listing_count,
+            'price_min': self.price_min,
+            'price_p10': self.price_p10,
+            'price_p25': self.price_p25,
+            'price_p50': self.price_p50,
+            'price_p75': self.price_p75,
+            'price_p90': self.price_p90,
+            'price_max': self.price_max,
+            'price_mean': self.price_mean,
+            'price_histogram': self.price_histogram,
+            'ppsf_p25': self.ppsf_p25,
+            'ppsf_median': self.ppsf_median,
+            'ppsf_p75': self.ppsf_p75,
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None,
+        }
+
 # ==================== PROPERTY APPLICATION MODEL ====================
 
 class PropertyApplication(models.Model):
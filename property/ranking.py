@@ -0,0 +1,153 @@
+"""
+Precomputed "best" ranking for listings.
+
+Property.rank_score is a weighted sum of four parts, each in [0, 1]:
+- boost: the paid flags (featured, premium, hot, exclusive);
+- freshness: halves every FRESHNESS_HALF_LIFE_DAYS since the listing
+  was created;
+- engagement: log-scaled views + saves, relative to the most engaged
+  listing;
+- completeness: photos (featured image + gallery) and description length.
+
+`compute_rank_scores` (run periodically, since freshness decays)
+scores every listing with NumPy from one query and writes back only the
+scores that moved. Saves that change one of RANK_FIELDS rescore that
+listing alone (see signals.py). Migration 0023 scored the listings that
+existed when the column was added.
+
+Because the score is a stored column with an index on
+(-rank_score, -id), the `best` sort is an index scan.
+"""
+import math
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, Max, F
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from .models import Property
+
+WEIGHTS = {
+    'boost': 0.40,
+    'freshness': 0.25,
+    'engagement': 0.20,
+    'completeness': 0.15,
+}
+
+# Share of the boost part each flag contributes (capped at 1)
+BOOST_FLAGS = {
+    'is_featured': 0.5,
+    'is_premium': 0.3,
+    'is_hot': 0.15,
+    'is_exclusive': 0.05,
+}
+
+FRESHNESS_HALF_LIFE_DAYS = 14
+SAVE_WEIGHT = 5  # a save counts as much as this many views
+FULL_PHOTO_COUNT = 8  # photos for full photo marks
+FULL_DESCRIPTION_LENGTH = 800  # characters (of stored HTML) for full description marks
+
+# Listing fields whose change moves the score
+RANK_FIELDS = frozenset(list(BOOST_FLAGS) + ['description', 'featured_image'])
+
+ENGAGEMENT_SCALE_KEY = 'ranking:engagement_scale'
+MIN_CHANGE = 1e-4  # smaller moves aren't written back
+BATCH_SIZE = 1000
+
+COLUMNS = [
+    'id', 'rank_score', 'created_at', 'views_count', 'saved_count', 'featured_image',
+    'description_length', 'photo_count',
+] + list(BOOST_FLAGS)
+
+
+def _rows(queryset):
+    return list(
+        queryset.order_by()
+        .annotate(description_length=Length('description'), photo_count=Count('images'))
+        .values_list(*COLUMNS)
+    )
+
+
+def _engagement(views, saves):
+    return np.log1p(views + SAVE_WEIGHT * saves)
+
+
+def engagement_scale():
+    """log-engagement of the most engaged listing (kept by the full run)"""
+    scale = cache.get(ENGAGEMENT_SCALE_KEY)
+    if scale is None:
+        top = Property.objects.aggregate(top=Max(F('views_count') + SAVE_WEIGHT * F('saved_count')))['top'] or 0
+        scale = float(math.log1p(top))
+        cache.set(ENGAGEMENT_SCALE_KEY, scale, None)
+    return scale
+
+
+def score_rows(rows, now, scale=None):
+    """
+    Scores for rows shaped like COLUMNS, as an array. `scale` normalises
+    engagement; by default the top engagement among the rows themselves.
+    """
+    columns = {name: i for i, name in enumerate(COLUMNS)}
+
+    def column(name, dtype=float):
+        return np.array([row[columns[name]] or 0 for row in rows], dtype=dtype)
+
+    boost = np.zeros(len(rows))
+    for flag, share in BOOST_FLAGS.items():
+        boost += share * column(flag)
+    boost = np.minimum(boost, 1.0)
+
+    ages = np.array([(now - row[columns['created_at']]).total_seconds() / 86400.0 for row in rows])
+    freshness = np.exp(-math.log(2) * np.clip(ages, 0, None) / FRESHNESS_HALF_LIFE_DAYS)
+
+    engagement = _engagement(column('views_count'), column('saved_count'))
+    if scale is None:
+        scale = float(engagement.max()) if len(rows) else 0.0
+    engagement = np.minimum(engagement / scale, 1.0) if scale > 0 else np.zeros(len(rows))
+
+    photos = column('photo_count') + np.array([1.0 if row[columns['featured_image']] else 0.0 for row in rows])
+    completeness = (
+        0.6 * np.minimum(photos / FULL_PHOTO_COUNT, 1.0)
+        + 0.4 * np.minimum(column('description_length') / FULL_DESCRIPTION_LENGTH, 1.0)
+    )
+
+    return (
+        WEIGHTS['boost'] * boost
+        + WEIGHTS['freshness'] * freshness
+        + WEIGHTS['engagement'] * engagement
+        + WEIGHTS['completeness'] * completeness
+    )
+
+
+def _write(rows, scores, batch_size):
+    changed = [
+        Property(pk=row[0], rank_score=round(float(score), 6))
+        for row, score in zip(rows, scores)
+        if abs((row[1] or 0.0) - score) >= MIN_CHANGE
+    ]
+    # bulk_update sends no post_save, so listing caches aren't thrown away
+    Property.objects.bulk_update(changed, ['rank_score'], batch_size=batch_size)
+    return len(changed)
+
+
+def compute_rank_scores(now=None, batch_size=BATCH_SIZE):
+    """Rescore every listing. Returns (listings scored, scores written)."""
+    now = now or timezone.now()
+    rows = _rows(Property.objects.all())
+    if not rows:
+        return 0, 0
+    engagement = _engagement(
+        np.array([row[3] for row in rows], dtype=float), np.array([row[4] for row in rows], dtype=float),
+    )
+    scale = float(engagement.max())
+    cache.set(ENGAGEMENT_SCALE_KEY, scale, None)
+    return len(rows), _write(rows, score_rows(rows, now, scale), batch_size)
+
+
+def rank_properties(ids):
+    """Rescore just these listings against the last full run's engagement scale"""
+    rows = _rows(Property.objects.filter(pk__in=ids))
+    if not rows:
+        return 0
+    return _write(rows, score_rows(rows, timezone.now(), engagement_scale()), BATCH_SIZE)
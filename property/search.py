@@ -0,0 +1,155 @@
+"""
+Full-text property search backed by PropertySearchDocument.
+
+On PostgreSQL each document carries a weighted tsvector (title > location >
+description) behind a GIN index, queried with websearch syntax and ranked
+with ts_rank. Other backends (SQLite in development) fall back to matching
+every search term against a single lowercased `document` column, so a search
+never has to join and scan the city/state tables.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from django.utils.html import strip_tags
+
+from .models import Property, PropertySearchDocument
+
+SEARCH_CONFIG = 'english'
+
+# Property fields that feed the search document; saves touching only other
+# fields (e.g. views_count) don't need to reindex.
+INDEXED_FIELDS = frozenset([
+    'title', 'description', 'address', 'zip_code', 'state', 'city', 'property_type',
+])
+
+TERM_RE = re.compile(r'\w+')
+
+
+def is_postgres(using='default'):
+    return connections[using].vendor == 'postgresql'
+
+
+def weighted_search_vector():
+    """tsvector expression over the document columns, used for updates."""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('location', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('body', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def build_document(prop):
+    """Return an unsaved PropertySearchDocument for a Property"""
+    location = ', '.join(part for part in [
+        prop.address,
+        prop.city.name,
+        prop.state.name,
+        prop.zip_code,
+        prop.property_type.get_name_display(),
+    ] if part)
+    body = ' '.join(strip_tags(prop.description or '').split())
+    return PropertySearchDocument(
+        property_id=prop.pk,
+        title=prop.title,
+        location=location[:700],
+        body=body,
+        document=' '.join([prop.title, location, body]).lower(),
+    )
+
+
+def index_property(prop):
+    """Create or refresh the search document for a single property"""
+    doc = build_document(prop)
+    PropertySearchDocument.objects.update_or_create(
+        property_id=prop.pk,
+        defaults={
+            'title': doc.title,
+            'location': doc.location,
+            'body': doc.body,
+            'document': doc.document,
+        },
+    )
+    if is_postgres():
+        PropertySearchDocument.objects.filter(property_id=prop.pk).update(
+            search_vector=weighted_search_vector()
+        )
+
+
+def index_properties(queryset, batch_size=500):
+    """
+    (Re)index every property in `queryset` in batches.
+    Returns the number of documents written.
+    """
+    queryset = queryset.select_related('state', 'city', 'property_type').order_by('pk')
+    total = 0
+    batch = []
+    for prop in queryset.iterator(chunk_size=batch_size):
+        batch.append(build_document(prop))
+        if len(batch) >= batch_size:
+            total += _write_batch(batch)
+            batch = []
+    if batch:
+        total += _write_batch(batch)
+    return total
+
+
+def _write_batch(docs):
+    PropertySearchDocument.objects.bulk_create(
+        docs,
+        update_conflicts=True,
+        unique_fields=['property'],
+        update_fields=['title', 'location', 'body', 'document'],
+    )
+    if is_postgres():
+        PropertySearchDocument.objects.filter(
+            property_id__in=[doc.property_id for doc in docs]
+        ).update(search_vector=weighted_search_vector())
+    return len(docs)
+
+
+def search_terms(query):
+    return TERM_RE.findall((query or '').lower())
+
+
+def apply_search(queryset, query):
+    """
+    Restrict a Property queryset to listings matching `query` and annotate
+    each row with `search_rank` (higher is better).
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    if is_postgres(queryset.db):
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        # ts_rank returns real; as double precision it survives the round
+        # trip through a pagination cursor and compares exactly against it
+        return queryset.filter(
+            search_document__search_vector=search_query
+        ).annotate(
+            search_rank=Cast(SearchRank(F('search_document__search_vector'), search_query), FloatField())
+        )
+
+    for term in terms:
+        queryset = queryset.filter(search_document__document__contains=term)
+    # Crude ranking for the fallback: one point per term found in the title
+    title_hits = [
+        Case(
+            When(search_document__title__icontains=term, then=Value(1.0)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+        for term in terms
+    ]
+    rank = title_hits[0]
+    for hit in title_hits[1:]:
+        rank = rank + hit
+    return queryset.annotate(search_rank=rank)
+
+
+def unindexed_properties():
+    """Properties that have no search document yet"""
+    return Property.objects.filter(search_document__isnull=True)
@@ -0,0 +1,64 @@
+"""
+Compact JSON serialization for property API responses.
+
+Each public field maps to the model columns it needs, so a `?fields=`
+projection loads only those columns (via .only()) and joins only the
+relations it actually reads.
+"""
+from .models import decode_amenity_mask
+
+# name -> (columns to load, getter)
+PROPERTY_FIELDS = {
+    'id': (['id'], lambda p: p.id),
+    'slug': (['slug'], lambda p: p.slug),
+    'title': (['title'], lambda p: p.title),
+    'url': (['slug'], lambda p: p.get_absolute_url()),
+    'price': (['price'], lambda p: float(p.price)),
+    'status': (['status__name'], lambda p: p.status.name),
+    'type': (['property_type__name'], lambda p: p.property_type.name),
+    'city': (['city__name'], lambda p: p.city.name),
+    'state': (['state__name'], lambda p: p.state.name),
+    'address': (['address'], lambda p: p.address),
+    'bedrooms': (['bedrooms'], lambda p: p.bedrooms),
+    'bathrooms': (['bathrooms'], lambda p: p.bathrooms),
+    'square_feet': (['square_feet'], lambda p: p.square_feet),
+    'image': (['featured_image'], lambda p: p.featured_image.url if p.featured_image else None),
+    'amenities': (['amenity_mask'], lambda p: decode_amenity_mask(p.amenity_mask)),
+    'is_featured': (['is_featured'], lambda p: p.is_featured),
+    'lat': (['latitude'], lambda p: float(p.latitude) if p.latitude is not None else None),
+    'lng': (['longitude'], lambda p: float(p.longitude) if p.longitude is not None else None),
+    'created_at': (['created_at'], lambda p: p.created_at.isoformat()),
+}
+
+DEFAULT_FIELDS = ('id', 'title', 'url', 'price', 'status', 'city', 'state', 'bedrooms', 'bathrooms', 'image')
+
+
+class UnknownField(ValueError):
+    pass
+
+
+def parse_fields(value):
+    """Validate a comma-separated `fields` parameter (empty -> defaults)"""
+    if not value:
+        return list(DEFAULT_FIELDS)
+    fields = list(dict.fromkeys(f.strip() for f in value.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in PROPERTY_FIELDS]
+    if unknown:
+        raise UnknownField(f"Unknown field(s): {', '.join(unknown)}")
+    return fields or list(DEFAULT_FIELDS)
+
+
+def project(queryset, fields, extra_columns=()):
+    """
+    Restrict a Property queryset to the columns needed for `fields`
+    (plus `extra_columns`, e.g. the sort keys a cursor is built from).
+    """
+    columns = {'id', *extra_columns}
+    for name in fields:
+        columns.update(PROPERTY_FIELDS[name][0])
+    related = {column.split('__')[0] for column in columns if '__' in column}
+    return queryset.select_related(None).select_related(*related).only(*columns)
+
+
+def serialize(prop, fields):
+    return {name: PROPERTY_FIELDS[name][1](prop) for name in fields}
@@ -0,0 +1,244 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+from core.cache import bump_generation
+from agents.models import Agent
+from blogs.models import Post
+from listings.models import ListingPackage
+from .models import Property, PropertyApplication, PropertyImage, PropertyType, City, State
+
+# Denormalized counters; saves that only touch these don't change listings
+COUNTER_FIELDS = frozenset(['views_count', 'saved_count'])
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def invalidate_property_caches(sender, instance, update_fields=None, **kwargs):
+    """Drop cached listing data (facet counts, detail page, gallery...) when a property changes"""
+    from .detail import invalidate_detail
+    from .gallery import invalidate_gallery
+
+    if update_fields and COUNTER_FIELDS.issuperset(update_fields):
+        return
+    bump_generation('properties')
+    bump_generation('homepage')
+    invalidate_detail(instance.slug)
+    stored_slug = getattr(instance, '_stored_slug', None)
+    if stored_slug != instance.slug:
+        invalidate_detail(stored_slug)  # the old URL mustn't keep serving the bundle
+    invalidate_gallery(instance.pk)
+
+
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def invalidate_property_gallery(sender, instance, **kwargs):
+    """The cached gallery carries the listing's images"""
+    from .gallery import invalidate_gallery
+
+    invalidate_gallery(instance.property_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Agent)
+@receiver(post_delete, sender=Agent)
+@receiver(post_save, sender=ListingPackage)
+@receiver(post_delete, sender=ListingPackage)
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+@receiver(post_save, sender=PropertyType)
+@receiver(post_delete, sender=PropertyType)
+def invalidate_homepage_cache(sender, **kwargs):
+    """Everything else rendered on the homepage (see views._build_homepage_context)"""
+    bump_generation('homepage')
+
+
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+def invalidate_location_index(sender, **kwargs):
+    """Rebuild each process's autocomplete index (property/autocomplete.py)"""
+    bump_generation('locations')
+
+
+@receiver(post_save, sender=Property)
+def update_property_search_document(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Keep the full-text search document in sync with the listing.
+    Deleting a property cascades to its document.
+    """
+    from .search import INDEXED_FIELDS, index_property
+
+    if raw:
+        return
+    if update_fields and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    index_property(instance)
+
+
+@receiver(post_save, sender=City)
+@receiver(post_save, sender=State)
+def reindex_location_properties(sender, instance, created=False, raw=False, **kwargs):
+    """
+    City and state names are part of each search document, so a rename
+    has to be pushed down to the listings in that location.
+    """
+    from .search import index_properties
+
+    if raw or created:
+        return
+    lookup = 'city' if sender is City else 'state'
+    index_properties(Property.objects.filter(**{lookup: instance}))
+
+
+# Fields that decide whether/where a listing shows on the cluster map
+CLUSTER_FIELDS = frozenset(['latitude', 'longitude', 'geohash', 'price', 'is_active', 'status'])
+
+
+@receiver(pre_save, sender=Property)
+def remember_stored_listing(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Capture the stored map snapshot and market segments (one query), so
+    post_save can move the listing between clusters and mark the segments
+    it leaves dirty. Also notes whether the similarity vector changes and
+    the stored slug, whose cached detail page has to go if it changes.
+    """
+    from .clusters import snapshot
+    from .market import MARKET_FIELDS, listing_segments
+    from .similarity import SIMILARITY_FIELDS
+
+    instance._map_snapshot = None
+    instance._market_segments = []
+    instance._similarity_changed = True
+    instance._stored_slug = None
+    if raw or instance.pk is None:
+        return
+    if update_fields and not (CLUSTER_FIELDS | MARKET_FIELDS | SIMILARITY_FIELDS | {'slug'}).intersection(update_fields):
+        instance._map_snapshot = False  # nothing map-related changes
+        instance._market_segments = False
+        instance._similarity_changed = False
+        return
+    stored = (
+        Property.objects.filter(pk=instance.pk)
+        .annotate(status_name=F('status__name'))
+        .only(
+            'latitude', 'longitude', 'price', 'is_active', 'state', 'city', 'property_type', 'status',
+            'bedrooms', 'bathrooms', 'square_feet', 'amenity_mask', 'slug',
+        )
+        .first()
+    )
+    if stored is not None:
+        instance._stored_slug = stored.slug
+        instance._map_snapshot = snapshot(stored)
+        instance._market_segments = listing_segments(stored)
+        attnames = [Property._meta.get_field(name).attname for name in SIMILARITY_FIELDS]
+        instance._similarity_changed = any(getattr(stored, a) != getattr(instance, a) for a in attnames)
+
+
+@receiver(post_save, sender=Property)
+def update_map_clusters(sender, instance, raw=False, **kwargs):
+    from .clusters import apply_change, snapshot
+
+    old = getattr(instance, '_map_snapshot', None)
+    if raw or old is False:
+        return
+    new = snapshot(instance)
+    transaction.on_commit(lambda: apply_change(old, new))
+
+
+@receiver(post_delete, sender=Property)
+def remove_from_map_clusters(sender, instance, **kwargs):
+    from .clusters import apply_change, snapshot
+
+    try:
+        old = snapshot(instance)
+    except Property.status.RelatedObjectDoesNotExist:
+        return
+    transaction.on_commit(lambda: apply_change(old, None))
+
+
+@receiver(post_save, sender=Property)
+def queue_similar_properties(sender, instance, raw=False, **kwargs):
+    """Queue the listing for `build_similar_properties --pending` if its vector changed"""
+    from .similarity import queue_rescore
+
+    if raw or not getattr(instance, '_similarity_changed', True):
+        return
+    queue_rescore([instance.pk])
+
+
+@receiver(pre_delete, sender=Property)
+def remember_similar_referrers(sender, instance, **kwargs):
+    # The cascade removes links pointing at this listing before post_delete
+    from .models import SimilarProperty
+
+    instance._similar_referrers = list(
+        SimilarProperty.objects.filter(similar=instance).values_list('property_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Property)
+def queue_similar_referrers(sender, instance, **kwargs):
+    """Listings that recommended the deleted one need a replacement"""
+    from .similarity import queue_rescore
+
+    queue_rescore(getattr(instance, '_similar_referrers', []))
+
+
+@receiver(post_save, sender=PropertyApplication)
+def count_application_engagement(sender, instance, created=False, raw=False, **kwargs):
+    """Applications feed the trending rankings (core/trending.py)"""
+    from core.trending import record_event
+
+    if created and not raw:
+        record_event(instance.listing, 'application')
+
+
+@receiver(post_save, sender=Property)
+def mark_market_segments(sender, instance, raw=False, **kwargs):
+    """Flag the market segments the listing left and joined for refresh_market_stats"""
+    from .market import listing_segments, mark_dirty
+
+    old = getattr(instance, '_market_segments', [])
+    if raw or old is False:
+        return
+    keys = set(old) | set(listing_segments(instance))
+    transaction.on_commit(lambda: mark_dirty(keys))
+
+
+@receiver(post_delete, sender=Property)
+def mark_market_segments_on_delete(sender, instance, **kwargs):
+    from .market import listing_segments, mark_dirty
+
+    try:
+        keys = listing_segments(instance)
+    except Property.status.RelatedObjectDoesNotExist:
+        return
+    transaction.on_commit(lambda: mark_dirty(keys))
+
+
+@receiver(post_save, sender=Property)
+def rescore_property_rank(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """New and edited listings get a rank_score now rather than at the next compute_rank_scores"""
+    from .ranking import RANK_FIELDS, rank_properties
+
+    if raw:
+        return
+    if update_fields and not created and not RANK_FIELDS.intersection(update_fields):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: rank_properties([pk]))
+
+
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def rescore_property_rank_on_image(sender, instance, raw=False, **kwargs):
+    """Photo count is part of the completeness score"""
+    from .ranking import rank_properties
+
+    if raw:
+        return
+    property_id = instance.property_id
+    transaction.on_commit(lambda: rank_properties([property_id]))
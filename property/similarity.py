@@ -0,0 +1,201 @@
+"""
+"Similar properties" recommendations.
+
+Every active listing is embedded as a numeric vector:
+- standardised log price, bedrooms, bathrooms and log floor area
+- one-hot blocks for status (sale/rent), property type, state and city
+- the ten amenity bits
+
+Its SIMILAR_COUNT nearest neighbours (Euclidean distance) are stored in
+SimilarProperty. The detail page then reads them with one indexed query.
+
+`rebuild_similar` scores everything with scikit-learn's NearestNeighbors.
+Scoring needs every listing's vector, so it never runs inside a request.
+Saves that change a listing's vector queue it in PendingSimilarity.
+`rescore_pending` (`build_similar_properties --pending`, run every few
+minutes) drains the queue with a single load of the vectors. It scores
+the queued listings, then rescores only the listings whose neighbour
+lists they enter or leave.
+"""
+import numpy as np
+from django.db import transaction
+from sklearn.neighbors import NearestNeighbors
+
+from .models import AMENITY_FLAGS, PendingSimilarity, Property, SimilarProperty
+
+SIMILAR_COUNT = 6
+
+LISTED_STATUSES = ['for_sale', 'for_rent', 'pending']
+
+# Fields that change a listing's vector (or whether it is a candidate)
+SIMILARITY_FIELDS = frozenset([
+    'price', 'bedrooms', 'bathrooms', 'square_feet', 'property_type', 'status',
+    'state', 'city', 'amenity_mask', 'is_active',
+])
+
+# Relative weight of each block of the vector
+NUMERIC_WEIGHT = 1.0
+STATUS_WEIGHT = 3.0  # never recommend rentals next to sales if avoidable
+TYPE_WEIGHT = 1.5
+STATE_WEIGHT = 1.0
+CITY_WEIGHT = 1.0
+AMENITY_WEIGHT = 0.35
+
+FEATURE_COLUMNS = (
+    'id', 'price', 'bedrooms', 'bathrooms', 'square_feet',
+    'status_id', 'property_type_id', 'state_id', 'city_id', 'amenity_mask',
+)
+
+
+def candidate_properties():
+    return Property.objects.filter(is_active=True, status__name__in=LISTED_STATUSES)
+
+
+def _one_hot(values, weight):
+    categories, index = np.unique(values, return_inverse=True)
+    block = np.zeros((len(values), len(categories)))
+    block[np.arange(len(values)), index] = weight
+    return block
+
+
+def _standardise(column):
+    std = column.std()
+    return (column - column.mean()) / std if std else np.zeros_like(column)
+
+
+def embed(rows):
+    """Feature matrix for rows of FEATURE_COLUMNS values"""
+    data = np.array(rows, dtype=float).reshape(-1, len(FEATURE_COLUMNS))
+    numeric = np.column_stack([
+        _standardise(np.log1p(data[:, 1])),
+        _standardise(data[:, 2]),
+        _standardise(data[:, 3]),
+        _standardise(np.log1p(data[:, 4])),
+    ]) * NUMERIC_WEIGHT
+    masks = data[:, 9].astype(np.int64)
+    amenities = ((masks[:, None] >> np.arange(len(AMENITY_FLAGS))) & 1) * AMENITY_WEIGHT
+    return np.hstack([
+        numeric,
+        _one_hot(data[:, 5], STATUS_WEIGHT),
+        _one_hot(data[:, 6], TYPE_WEIGHT),
+        _one_hot(data[:, 7], STATE_WEIGHT),
+        _one_hot(data[:, 8], CITY_WEIGHT),
+        amenities,
+    ])
+
+
+def load_vectors():
+    """(ids, matrix) for every candidate listing"""
+    rows = list(candidate_properties().order_by('id').values_list(*FEATURE_COLUMNS))
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    return ids, embed(rows) if rows else np.zeros((0, 0))
+
+
+def _links(property_id, neighbour_ids, distances):
+    return [
+        SimilarProperty(property_id=property_id, similar_id=int(similar_id), rank=rank, distance=float(distance))
+        for rank, (similar_id, distance) in enumerate(zip(neighbour_ids, distances), start=1)
+    ]
+
+
+def rebuild_similar(k=SIMILAR_COUNT, batch_size=1000):
+    """Recompute neighbour lists for every listing. Returns the number of listings scored."""
+    # Taken before the vectors, so edits made during the run stay queued
+    pending = list(PendingSimilarity.objects.values_list('property_id', flat=True))
+    ids, vectors = load_vectors()
+    links = []
+    if len(ids) > 1:
+        n_neighbors = min(k + 1, len(ids))
+        distances, indices = NearestNeighbors(n_neighbors=n_neighbors).fit(vectors).kneighbors(vectors)
+        for row, property_id in enumerate(ids):
+            keep = indices[row] != row  # drop the listing itself
+            links.extend(_links(int(property_id), ids[indices[row][keep]][:k], distances[row][keep][:k]))
+
+    with transaction.atomic():
+        SimilarProperty.objects.all().delete()
+        SimilarProperty.objects.bulk_create(links, batch_size=batch_size)
+        PendingSimilarity.objects.filter(property_id__in=pending).delete()
+    return len(ids)
+
+
+def _nearest(ids, vectors, row, k):
+    distances = np.sqrt(((vectors - vectors[row]) ** 2).sum(axis=1))
+    distances[row] = np.inf
+    order = np.argsort(distances, kind='stable')[:k]
+    order = order[np.isfinite(distances[order])]
+    return ids[order], distances[order]
+
+
+def rescore_properties(property_ids, k=SIMILAR_COUNT):
+    """
+    Update recommendations after these listings were created, edited or
+    removed. Returns the number of lists rewritten.
+
+    Only these lists are rewritten:
+    - the listings' own lists;
+    - lists that currently include one of them (it may have moved away);
+    - lists whose k-th neighbour is now farther away than one of them is.
+    A deleted listing's incoming links are gone by the time this runs, so
+    its referrers are queued themselves (see signals.py).
+    """
+    property_ids = set(property_ids)
+    ids, vectors = load_vectors()
+    positions = {int(pk): i for i, pk in enumerate(ids)}
+    rows = [positions[pk] for pk in property_ids if pk in positions]
+
+    affected = set(
+        SimilarProperty.objects.filter(similar_id__in=property_ids).values_list('property_id', flat=True)
+    )
+    if rows:
+        # Distance to each list's k-th neighbour; lists shorter than k stay at inf
+        worst = np.full(len(ids), np.inf)
+        for pk, distance in SimilarProperty.objects.filter(rank=k).values_list('property_id', 'distance'):
+            if pk in positions:
+                worst[positions[pk]] = distance
+        for row in rows:
+            distances = np.sqrt(((vectors - vectors[row]) ** 2).sum(axis=1))
+            displaces = distances < worst
+            displaces[row] = False
+            affected.update(int(pk) for pk in ids[displaces])
+        affected.update(int(ids[row]) for row in rows)
+
+    links = []
+    for pk in affected:
+        if pk in positions:
+            neighbour_ids, neighbour_distances = _nearest(ids, vectors, positions[pk], k)
+            links.extend(_links(pk, neighbour_ids, neighbour_distances))
+
+    with transaction.atomic():
+        SimilarProperty.objects.filter(property_id__in=affected | property_ids).delete()
+        SimilarProperty.objects.bulk_create(links)
+    return len(affected)
+
+
+def queue_rescore(property_ids):
+    """Queue listings for the next `rescore_pending` run"""
+    PendingSimilarity.objects.bulk_create(
+        [PendingSimilarity(property_id=pk) for pk in set(property_ids)], ignore_conflicts=True,
+    )
+
+
+def rescore_pending(k=SIMILAR_COUNT):
+    """Rescore every queued listing in one pass. Returns the number of listings dequeued."""
+    with transaction.atomic():
+        pending = set(PendingSimilarity.objects.values_list('property_id', flat=True))
+        if not pending:
+            return 0
+        # Dequeued before the vectors are read, so a save committing now is
+        # either seen by this run or queued again for the next one
+        PendingSimilarity.objects.filter(property_id__in=pending).delete()
+        rescore_properties(pending, k)
+    return len(pending)
+
+
+def similar_properties(prop, limit=SIMILAR_COUNT):
+    """Stored neighbours of a listing, best first"""
+    links = (
+        SimilarProperty.objects.filter(property=prop, rank__lte=limit)
+        .select_related('similar__city', 'similar__state', 'similar__status')
+        .order_by('rank')
+    )
+    return [link.similar for link in links]
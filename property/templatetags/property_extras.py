@@ -1,4 +1,5 @@
 from django import template
+from property.models import decode_amenity_mask
 import re
 
 register = template.Library()
@@ -37,4 +38,31 @@ def youtube_id(value):
     if len(val_str) == 11 and re.match(r'^[a-zA-Z0-9_-]{11}$', val_str):
         return val_str
         
-    return value
\ No newline at end of file
+    return value
+
+
+@register.filter(name='amenity_labels')
+def amenity_labels(mask):
+    """Decode a packed Property.amenity_mask into amenity labels"""
+    try:
+        return decode_amenity_mask(int(mask))
+    except (TypeError, ValueError):
+        return []
+
+
+@register.simple_tag
+def market_position(prop):
+    """
+    {% market_position property as position %} - where the listing's price
+    sits against its segment median (see property/market.py), or None
+    """
+    from property.market import market_position as position_for
+    return position_for(prop)
+
+
+@register.simple_tag
+def location_catalogue_url():
+    """Versioned URL of the state/city catalogue (long-lived in browser caches)"""
+    from django.urls import reverse
+    from property.catalogue import get_catalogue
+    return f"{reverse('location_catalogue')}?v={get_catalogue().etag}"
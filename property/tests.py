@@ -1,3 +1,508 @@
+import io
+import pickle
+from datetime import timedelta
+from decimal import Decimal
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.http import Http404
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.pagination import paginate_by_cursor
+from . import ranking
+from .cards import PropertyCard, card_values, load_cards
+from .filters import InvalidFilter, filter_properties, validate_filter_params
+from .models import (
+    City, MapCluster, PendingSimilarity, Property, PropertyImage, PropertySearchDocument, PropertyStatus, PropertyType,
+    SimilarProperty, State,
+)
+from .search import apply_search
+from .similarity import SIMILAR_COUNT, rebuild_similar, rescore_pending
+
+
+class PropertyDataMixin:
+    """A user, two states, three cities and the common types/statuses"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='lister', email='lister@example.com', password='x', phone_number='+2348000000001',
+        )
+        cls.lagos = State.objects.create(name='Lagos', code='LA')
+        cls.abuja = State.objects.create(name='Abuja', code='FC')
+        cls.lekki = City.objects.create(name='Lekki', state=cls.lagos)
+        cls.ikeja = City.objects.create(name='Ikeja', state=cls.lagos)
+        cls.garki = City.objects.create(name='Garki', state=cls.abuja)
+        cls.duplex = PropertyType.objects.create(name='duplex')
+        cls.flat = PropertyType.objects.create(name='mini_flat')
+        cls.for_sale = PropertyStatus.objects.create(name='for_sale')
+        cls.for_rent = PropertyStatus.objects.create(name='for_rent')
+
+    @classmethod
+    def make_property(cls, **kwargs):
+        fields = {
+            'title': 'Luxury Duplex',
+            'description': '<p>Lovely home with a garden</p>',
+            'state': cls.lagos,
+            'city': cls.lekki,
+            'address': '1 Admiralty Way',
+            'property_type': cls.duplex,
+            'status': cls.for_sale,
+            'bedrooms': 3,
+            'bathrooms': 2,
+            'square_feet': 1800,
+            'price': Decimal('50000000'),
+            'listed_by': cls.user,
+        }
+        fields.update(kwargs)
+        return Property.objects.create(**fields)
+
+
+class FilterValidationTests(PropertyDataMixin, TestCase):
+    def test_valid_params_pass(self):
+        validate_filter_params({
+            'state_type': '1', 'min_price': '1000.50', 'max_price': '2000', 'bedrooms': '3+', 'bathrooms': '2',
+            'q': 'duplex',
+        })
+
+    def test_empty_values_are_ignored(self):
+        validate_filter_params({'bedrooms': 'Any', 'min_price': '', 'type': 'All Types'})
+
+    def test_malformed_values_raise(self):
+        for params in [
+            {'bedrooms': 'abc'}, {'bathrooms': '+'}, {'state_type': 'abc'}, {'city_type': '-1'},
+            {'min_price': 'abc'}, {'max_price': 'NaN'}, {'min_price': 'Infinity'}, {'min_price': '-5'},
+        ]:
+            with self.subTest(params=params), self.assertRaises(InvalidFilter):
+                filter_properties(Property.objects.all(), params)
+
+    def test_count_filters(self):
+        small = self.make_property(bedrooms=2)
+        large = self.make_property(bedrooms=5)
+        self.assertEqual(list(filter_properties(Property.objects.all(), {'bedrooms': '2'})), [small])
+        self.assertEqual(list(filter_properties(Property.objects.all(), {'bedrooms': '3+'})), [large])
+
+
+class PropertySearchApiTests(PropertyDataMixin, TestCase):
+    url = reverse('property_search_api')
+
+    def test_results(self):
+        prop = self.make_property()
+        response = self.client.get(self.url, {'bedrooms': '3', 'fields': 'id,title'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [{'id': prop.pk, 'title': prop.title}])
+
+    def test_malformed_filters_are_bad_requests(self):
+        for params in [{'bedrooms': 'abc'}, {'min_price': 'abc'}, {'state_type': 'x'}]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+
+class MalformedFilterPageTests(PropertyDataMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # With photos: search_results' placeholder image isn't in the static manifest
+        photo = 'properties/featured/front.jpg'
+        cls.small = cls.make_property(title='Small Flat', bedrooms=1, price=Decimal('1000000'), featured_image=photo)
+        cls.large = cls.make_property(title='Large Duplex', bedrooms=5, featured_image=photo)
+
+    def test_pages_drop_malformed_filters_and_say_so(self):
+        malformed = [{'bedrooms': 'abc'}, {'min_price': 'x'}, {'state_type': 'lagos'}]
+        for name, extra in [('properties', []), ('search_properties', [{'price_range': 'a-b'}])]:
+            for params in malformed + extra:
+                with self.subTest(page=name, params=params):
+                    response = self.client.get(reverse(name), params)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertContains(response, 'Ignored invalid filter values')
+                    self.assertContains(response, 'Large Duplex')
+
+    def test_valid_filters_still_apply_alongside_bad_ones(self):
+        response = self.client.get(reverse('properties'), {'bedrooms': '5', 'min_price': 'x'})
+        self.assertContains(response, 'Ignored invalid filter values: min_price')
+        self.assertEqual([card.id for card in response.context['properties']], [self.large.pk])
+        self.assertNotIn('min_price', response.context['search_params'])
+
+
+class GeoSearchApiTests(PropertyDataMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.prop = cls.make_property(latitude=Decimal('6.447800'), longitude=Decimal('3.472300'))
+
+    def get(self, name, params):
+        return self.client.get(reverse(name), params)
+
+    def test_valid_queries(self):
+        response = self.get('nearby_properties', {'lat': 6.4478, 'lng': 3.4723, 'radius_km': 1})
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.prop.pk])
+        response = self.get('properties_in_bounds', {'south': 6.4, 'west': 3.4, 'north': 6.5, 'east': 3.5})
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.prop.pk])
+
+    def test_non_finite_and_out_of_range_values_are_rejected(self):
+        for name, params in [
+            ('nearby_properties', {'lat': 'nan', 'lng': 3.4}),
+            ('nearby_properties', {'lat': 6.4, 'lng': 'inf'}),
+            ('nearby_properties', {'lat': 6.4, 'lng': 181}),
+            ('nearby_properties', {'lat': 6.4, 'lng': 3.4, 'radius_km': 'nan'}),
+            ('nearby_properties', {'lat': 6.4, 'lng': 3.4, 'radius_km': 'inf'}),
+            ('nearby_properties', {'lat': 6.4, 'lng': 3.4, 'radius_km': '-5'}),
+            ('properties_in_bounds', {'south': 6.4, 'west': 3.4, 'north': 'nan', 'east': 3.5}),
+            ('properties_in_bounds', {'south': 6.4, 'west': 3.4, 'north': 6.5, 'east': 'inf'}),
+            ('properties_in_bounds', {'south': 6.5, 'west': 3.4, 'north': 6.4, 'east': 3.5}),
+        ]:
+            with self.subTest(name=name, params=params):
+                response = self.get(name, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+
+class RelevanceSortTests(PropertyDataMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Ties: every listing ranks the same for 'garden' bar the title hits
+        for i in range(9):
+            cls.make_property(title='Garden Duplex' if i % 3 == 0 else 'Duplex')
+
+    def test_walking_relevance_pages_returns_each_listing_once(self):
+        seen, cursor = [], None
+        for _ in range(20):
+            params = {'q': 'garden', 'sort': 'relevance', 'limit': 2, 'fields': 'id'}
+            if cursor:
+                params['cursor'] = cursor
+            payload = self.client.get(reverse('property_search_api'), params).json()
+            self.assertEqual(payload['sort'], 'relevance')
+            seen += [row['id'] for row in payload['results']]
+            cursor = payload['next']
+            if cursor is None:
+                break
+        self.assertIsNone(cursor)
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(len(seen), 9)
+        titled = set(Property.objects.filter(title__startswith='Garden').values_list('pk', flat=True))
+        self.assertEqual(set(seen[:3]), titled)
+
+
+class ImporterTests(PropertyDataMixin, TestCase):
+    HEADER = 'title,state,city,address,property_type,status,square_feet,price,latitude,longitude,bedrooms\n'
+
+    def run_import(self, *rows):
+        from .importer import import_properties
+
+        stream = io.StringIO(self.HEADER + ''.join(f'{row}\n' for row in rows))
+        return import_properties(stream, 'csv', self.user, charge_slots=False, fetch_photos=False)
+
+    def test_valid_rows_are_created(self):
+        report = self.run_import(
+            'Garden Flat,Lagos,Lekki,1 Road,duplex,for_sale,1000,"25,000,000",6.45,3.39,3',
+            'Office,FC,Garki,2 Road,Mini Flat,for_rent,500,₦900000,,,',
+        )
+        self.assertEqual((report.rows, report.created, report.errors), (2, 2, []))
+        flat = Property.objects.get(title='Garden Flat')
+        self.assertEqual(flat.price_per_sqft, Decimal('25000.00'))
+        self.assertEqual((flat.latitude, flat.bedrooms), (Decimal('6.450000'), 3))
+
+    def test_bad_rows_are_reported_and_skipped(self):
+        valid = 'Good,Lagos,Lekki,1 Road,duplex,for_sale,1000,5000000,,,'
+        report = self.run_import(
+            valid,
+            'NaN price,Lagos,Lekki,1 Road,duplex,for_sale,1000,NaN,,,',
+            'Infinite price,Lagos,Lekki,1 Road,duplex,for_sale,1000,Infinity,,,',
+            'Latitude,Lagos,Lekki,1 Road,duplex,for_sale,1000,5000000,1000,3.3,',
+            'Longitude,Lagos,Lekki,1 Road,duplex,for_sale,1000,5000000,6.4,-181,',
+            'Huge price,Lagos,Lekki,1 Road,duplex,for_sale,1000,1e20,,,',
+            'Huge bedrooms,Lagos,Lekki,1 Road,duplex,for_sale,1000,5000000,,,1e30',
+            'Half bedroom,Lagos,Lekki,1 Road,duplex,for_sale,1000,5000000,,,2.5',
+            'Free,Lagos,Lekki,1 Road,duplex,for_sale,1000,0,,,',
+            'Nowhere,Atlantis,Lekki,1 Road,duplex,for_sale,1000,5000000,,,',
+            'Missing,Lagos,Lekki,1 Road,duplex,for_sale,,5000000,,,',
+        )
+        self.assertEqual(report.created, 1)
+        self.assertEqual([line for line, _ in report.errors], list(range(3, 13)))
+        self.assertEqual(list(Property.objects.values_list('title', flat=True)), ['Good'])
+
+    def test_derived_data_is_refreshed_in_batched_passes(self):
+        from listings.models import SavedSearch, SavedSearchMatch
+        from .clusters import rebuild_clusters
+
+        city = SavedSearch.objects.create(user=self.user, name='lekki', params={'city_type': str(self.lekki.pk)})
+        keyword = SavedSearch.objects.create(user=self.user, name='garden', params={'q': 'garden'})
+        rows = [f'Garden Flat {i},Lagos,Lekki,{i} Road,duplex,for_sale,1000,{5000000 + i},6.4{i},3.3{i},3' for i in range(5)]
+        rows.append('Office,FC,Garki,2 Road,Mini Flat,for_sale,500,900000,9.05,7.49,')
+
+        with mock.patch('property.similarity.rebuild_similar') as rebuild_similar, \
+                mock.patch('property.clusters.rebuild_clusters') as rebuild, \
+                CaptureQueriesContext(connection) as queries:
+            report = self.run_import(*rows)
+        rebuild_similar.assert_not_called()
+        rebuild.assert_not_called()
+
+        self.assertEqual(set(PendingSimilarity.objects.values_list('property_id', flat=True)), set(report.created_ids))
+        # The keyword search is verified for the whole batch in one query
+        self.assertEqual(sum('EXISTS' in query['sql'].upper() for query in queries.captured_queries), 1)
+        lekki = set(Property.objects.filter(city=self.lekki).values_list('pk', flat=True))
+        self.assertEqual(set(SavedSearchMatch.objects.filter(saved_search=city).values_list('property', flat=True)), lekki)
+        self.assertEqual(set(SavedSearchMatch.objects.filter(saved_search=keyword).values_list('property', flat=True)), lekki)
+
+        def clusters():
+            return sorted(MapCluster.objects.values_list('zoom', 'cell_x', 'cell_y', 'count', 'min_price', 'max_price'))
+
+        added = clusters()
+        self.assertTrue(added)
+        rebuild_clusters()
+        self.assertEqual(added, clusters())
+
+
+class SimilarityQueueTests(PropertyDataMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(8):
+            cls.make_property(
+                price=Decimal(10_000_000 * (i + 1)), bedrooms=1 + i % 4,
+                city=cls.garki if i % 2 else cls.lekki, state=cls.abuja if i % 2 else cls.lagos,
+            )
+
+    def links(self):
+        return sorted(SimilarProperty.objects.values_list('property_id', 'rank', 'similar_id'))
+
+    def queued(self):
+        return set(PendingSimilarity.objects.values_list('property_id', flat=True))
+
+    def test_saves_queue_instead_of_rescoring(self):
+        PendingSimilarity.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            prop = self.make_property()
+        self.assertEqual(self.queued(), {prop.pk})
+        self.assertFalse(SimilarProperty.objects.exists())
+
+    def test_only_vector_changes_queue(self):
+        rebuild_similar()
+        prop = Property.objects.first()
+        prop.views_count += 1
+        prop.save(update_fields=['views_count'])
+        prop.title = 'Renamed'
+        prop.save()
+        self.assertEqual(self.queued(), set())
+        prop.bedrooms += 1
+        prop.save()
+        self.assertEqual(self.queued(), {prop.pk})
+
+    def test_rescore_pending_matches_full_rebuild(self):
+        rebuild_similar()
+        self.assertEqual(self.queued(), set())
+        prop = Property.objects.order_by('pk').first()
+        prop.price = Decimal('75000000')
+        prop.city, prop.state = self.garki, self.abuja
+        prop.save()
+        self.make_property(price=Decimal('35000000'))
+
+        self.assertEqual(rescore_pending(), 2)
+        self.assertEqual(self.queued(), set())
+        incremental = self.links()
+        rebuild_similar()
+        self.assertEqual(incremental, self.links())
+
+    def test_delete_queues_referrers(self):
+        rebuild_similar()
+        prop = Property.objects.order_by('pk').first()
+        referrers = set(SimilarProperty.objects.filter(similar=prop).values_list('property_id', flat=True))
+        self.assertTrue(referrers)
+        prop.delete()
+        self.assertEqual(self.queued(), referrers)
+        rescore_pending()
+        self.assertFalse(SimilarProperty.objects.filter(similar_id=prop.pk).exists())
+        self.assertTrue(all(
+            SimilarProperty.objects.filter(property_id=pk).count() == SIMILAR_COUNT for pk in referrers
+        ))
+
+
+class SearchBackfillTests(PropertyDataMixin, TestCase):
+    def test_migration_indexes_listings_without_documents(self):
+        backfill = import_module('property.migrations.0022_backfill_search_documents').backfill_search_documents
+        indexed = self.make_property(title='Indexed Villa')
+        missing = self.make_property(title='Forgotten Bungalow', city=self.garki, state=self.abuja)
+        PropertySearchDocument.objects.filter(property=missing).delete()
+        self.assertFalse(apply_search(Property.objects.all(), 'bungalow').exists())
+
+        backfill(apps, connection.schema_editor())
+
+        self.assertEqual(PropertySearchDocument.objects.count(), 2)
+        self.assertEqual(list(apply_search(Property.objects.all(), 'bungalow garki')), [missing])
+        self.assertEqual(list(apply_search(Property.objects.all(), 'villa')), [indexed])
+
+
+class DetailBundleTests(PropertyDataMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bundle_caches_only_public_user_and_agent_fields(self):
+        from agents.models import Agent
+        from .detail import load_detail
+
+        agent_user = get_user_model().objects.create_user(
+            username='agent', email='agent@example.com', password='secret', phone_number='+2348000000002',
+            first_name='Ada', last_name='Obi',
+        )
+        agent = Agent.objects.create(user=agent_user, account_number='0123456789', verification_status='verified')
+        prop = self.make_property(agent=agent)
+
+        bundle = load_detail(prop.slug)
+        cached = pickle.dumps(bundle)
+        for secret in [self.user.password, agent_user.password, '0123456789', 'agent@example.com']:
+            self.assertNotIn(secret.encode(), cached)
+        listing = bundle['property']
+        self.assertEqual(listing.agent.user.get_full_name(), 'Ada Obi')
+        self.assertEqual((listing.agent.slug, listing.agent.verification_status), (agent.slug, 'verified'))
+        self.assertEqual(listing.listed_by.username, 'lister')
+        self.assertIn('password', listing.listed_by.get_deferred_fields())
+
+        response = self.client.get(prop.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Ada Obi')
+
+    def test_slug_change_drops_the_old_bundle(self):
+        from .detail import load_detail
+
+        prop = self.make_property()
+        old_slug = prop.slug
+        load_detail(old_slug)
+        prop.slug = 'renamed-listing'
+        prop.save()
+        with self.assertRaises(Http404):
+            load_detail(old_slug)
+        self.assertEqual(load_detail('renamed-listing')['property'].pk, prop.pk)
+
+
+class RankScoreTests(PropertyDataMixin, TestCase):
+    def row(self, now, **values):
+        fields = dict.fromkeys(ranking.COLUMNS, 0)
+        fields.update(id=1, rank_score=0.0, created_at=now, featured_image='')
+        fields.update(values)
+        return tuple(fields[name] for name in ranking.COLUMNS)
+
+    def test_score_parts(self):
+        now = timezone.now()
+        plain, featured, all_flags, aged, engaged, complete = ranking.score_rows([
+            self.row(now),
+            self.row(now, is_featured=True),
+            self.row(now, is_featured=True, is_premium=True, is_hot=True, is_exclusive=True),
+            self.row(now - timedelta(days=ranking.FRESHNESS_HALF_LIFE_DAYS)),
+            self.row(now, views_count=100, saved_count=4),
+            self.row(now, featured_image='a.jpg', photo_count=7, description_length=ranking.FULL_DESCRIPTION_LENGTH),
+        ], now)
+        weights = ranking.WEIGHTS
+        self.assertAlmostEqual(plain, weights['freshness'])
+        self.assertAlmostEqual(featured - plain, weights['boost'] * 0.5)
+        self.assertAlmostEqual(all_flags - plain, weights['boost'])  # shares are capped at 1
+        self.assertAlmostEqual(plain - aged, weights['freshness'] / 2)
+        self.assertAlmostEqual(engaged - plain, weights['engagement'])  # the most engaged row
+        self.assertAlmostEqual(complete - plain, weights['completeness'])
+
+    def test_compute_writes_only_moved_scores_and_orders_best(self):
+        cache.clear()
+        plain = self.make_property()
+        featured = self.make_property(is_featured=True, is_premium=True)
+        popular = self.make_property(views_count=500)
+        Property.objects.update(rank_score=0)
+
+        self.assertEqual(ranking.compute_rank_scores(), (3, 3))
+        self.assertEqual(ranking.compute_rank_scores(), (3, 0))
+        payload = self.client.get(reverse('property_search_api'), {'sort': 'best', 'fields': 'id'}).json()
+        self.assertEqual(payload['sort'], 'best')
+        self.assertEqual([row['id'] for row in payload['results']], [featured.pk, popular.pk, plain.pk])
+
+    def test_migration_backfills_the_same_scores(self):
+        backfill = import_module('property.migrations.0023_backfill_rank_scores').backfill_rank_scores
+        self.make_property(is_featured=True, views_count=40)
+        self.make_property(saved_count=3, featured_image='properties/featured/front.jpg')
+        self.make_property(description='')
+        ranking.compute_rank_scores()
+        expected = dict(Property.objects.values_list('pk', 'rank_score'))
+        Property.objects.update(rank_score=0)
+
+        backfill(apps, connection.schema_editor())
+
+        for pk, score in Property.objects.values_list('pk', 'rank_score'):
+            self.assertGreater(score, 0)
+            self.assertAlmostEqual(score, expected[pk], places=4)
+
+    def test_saves_of_rank_fields_rescore_the_listing(self):
+        cache.clear()
+        prop = self.make_property()
+        ranking.compute_rank_scores()
+        before = Property.objects.get(pk=prop.pk).rank_score
+
+        prop.views_count = 1000
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.save(update_fields=['views_count'])
+        self.assertEqual(Property.objects.get(pk=prop.pk).rank_score, before)
+
+        prop.is_featured = True
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.save(update_fields=['is_featured'])
+        self.assertAlmostEqual(
+            Property.objects.get(pk=prop.pk).rank_score - before, ranking.WEIGHTS['boost'] * 0.5, places=3,
+        )
+
+
+class PropertyCardTests(PropertyDataMixin, TestCase):
+    def test_card_matches_the_listing(self):
+        prop = self.make_property(featured_image='properties/featured/front.jpg', is_hot=True, is_featured=True)
+        for i in range(2):
+            PropertyImage.objects.create(property=prop, image=f'properties/gallery/{i}.jpg')
+
+        with CaptureQueriesContext(connection) as queries:
+            [card] = load_cards(Property.objects.filter(pk=prop.pk))
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(card.get_absolute_url(), prop.get_absolute_url())
+        self.assertEqual(card.price_display, prop.formatted_price)
+        self.assertEqual(card.photo_count, 3)  # the featured image and two gallery photos
+        self.assertEqual(card.badge, 'Hot')
+        self.assertEqual(card.image_url, prop.featured_image.url)
+        self.assertEqual(card.location, 'Lekki, Lagos')
+        self.assertEqual(card.location_short, 'Lekki, LA')
+        self.assertEqual(card.status_label, prop.status.get_name_display())
+        self.assertEqual(card.agent_name, 'lister')
+
+    def test_card_without_photos_or_flags(self):
+        self.user.first_name, self.user.last_name = 'Ada', 'Obi'
+        self.user.save()
+        self.make_property()
+        [card] = load_cards(Property.objects.all())
+        self.assertEqual((card.image, card.image_url, card.photo_count, card.badge), (None, '', 0, ''))
+        self.assertEqual(card.agent_name, 'Ada Obi')
+
+    def test_cursor_pages_of_cards(self):
+        for i in range(5):
+            self.make_property(price=Decimal(1000 * (i % 2)))
+        ordering = ('price', 'id')
+        seen, cursor = [], None
+        while True:
+            page = paginate_by_cursor(
+                card_values(Property.objects.all(), ordering), ordering,
+                cursor=cursor, per_page=2, row_factory=PropertyCard.from_row,
+            )
+            self.assertTrue(all(isinstance(card, PropertyCard) for card in page))
+            seen += [card.id for card in page]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(seen, list(Property.objects.order_by(*ordering).values_list('pk', flat=True)))
 
-# Create your tests here.
+    def test_list_page_renders_cards(self):
+        prop = self.make_property(title='Garden Terrace')
+        response = self.client.get(reverse('properties'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Garden Terrace')
+        self.assertContains(response, prop.get_absolute_url())
@@ -8,6 +8,18 @@ urlpatterns = [
     
     # AJAX endpoint for cities
     path('api/get-cities/', views.get_cities_by_state, name='get_cities_by_state'),
+    path('api/locations/catalogue.json', views.location_catalogue, name='location_catalogue'),
+    
+    # JSON search API
+    path('api/properties/search/', views.property_search_api, name='property_search_api'),
+
+    # Geo search (radius / map viewport)
+    path('api/properties/nearby/', views.nearby_properties, name='nearby_properties'),
+    path('api/properties/bounds/', views.properties_in_bounds, name='properties_in_bounds'),
+    path('api/map/tiles/<int:zoom>/<int:x>/<int:y>.json', views.map_cluster_tile, name='map_cluster_tile'),
+    path('api/market-stats/', views.market_stats_api, name='market_stats_api'),
+    path('api/properties/<int:pk>/gallery/', views.property_gallery_api, name='property_gallery_api'),
+    path('api/locations/autocomplete/', views.location_autocomplete, name='location_autocomplete'),
     path("properties/", views.property_list, name="properties"),
     path('property/details/<slug:slug>/', views.get_properties_details, name='property_detail'),
     
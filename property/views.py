@@ -1,66 +1,80 @@
 # views.py
-from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.contrib import messages
+from django.shortcuts import render
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.gzip import gzip_page
 from .models import Property, State, City, PropertyType, PropertyApplication
 from listings.models import SavedProperty
+from core.pagination import paginate_by_cursor
+from .filters import InvalidFilter, apply_sort, drop_invalid_filters, filter_properties, get_sort_ordering
+from .facets import get_facets
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+HOMEPAGE_CACHE_KEY = 'homepage:context'
+HOMEPAGE_FRESH_FOR = 60 * 10
+
+
+def _build_homepage_context():
+    """
+    Query everything the homepage shows. Results are materialised (with
+    the relations index.html reads) so they can be cached as-is.
+    """
+    from listings.models import ListingPackage
+    from blogs.models import Post
+    from agents.models import Agent
+    from .cards import load_cards
+
+    # Get all states for dropdown
+    states = list(State.objects.filter(is_active=True))
+
+    # Get property types
+    property_types = list(PropertyType.objects.all())
+
+    # Featured properties (as cards, see cards.py)
+    featured_properties = load_cards(Property.objects.filter(is_featured=True), limit=6)
+
+    # Premium properties for carousel
+    premium_properties = load_cards(Property.objects.filter(is_premium=True).order_by('-created_at'), limit=3)
+
+    # Get pricing packages for "Sell Your Properties" section
+    pricing_packages = list(ListingPackage.objects.filter(is_active=True).order_by('price')[:4])
+
+    # Get recent blog posts
+    recent_blog_posts = list(Post.objects.filter(
+        status='published'
+    ).select_related('author__user', 'category').order_by('-publish')[:3])
+
+    # Get featured agents for homepage
+    featured_agents = list(Agent.objects.filter(
+        is_active=True,
+        verification_status='verified'
+    ).select_related('user')[:6])
+
+    return {
+        'states': states,
+        'property_types': property_types,
+        'featured_properties': featured_properties,
+        'premium_properties': premium_properties,
+        'pricing_packages': pricing_packages,
+        'recent_blog_posts': recent_blog_posts,
+        'latest_posts': recent_blog_posts,  # alias for index.html template
+        'featured_agents': featured_agents,
+    }
+
+
 def homepage(request):
     """Homepage with property search"""
-    
+    from core.cache import get_or_rebuild
+
     try:
-        # Get all states for dropdown
-        states = State.objects.filter(is_active=True)
-        
-        # Get property types
-        property_types = PropertyType.objects.all()
-        
-        # Featured properties
-        featured_properties = Property.objects.filter(
-            is_featured=True
-        ).select_related('state', 'city', 'property_type', 'status', 'agent', 'listed_by')[:6]
-        
-        # Premium properties for carousel
-        premium_properties = Property.objects.filter(
-            is_premium=True
-        ).select_related('state', 'city', 'property_type', 'status', 'agent', 'listed_by').order_by('-created_at')[:3]
-        print("This is premium properties", premium_properties)
-        # Get all properties for display
-        all_properties = Property.objects.select_related(
-            'state', 'city', 'property_type', 'status'
-        )[:10]
-        
-        # Get pricing packages for "Sell Your Properties" section
-        from listings.models import ListingPackage
-        pricing_packages = ListingPackage.objects.filter(is_active=True).order_by('price')[:4]
-        
-        # Get recent blog posts
-        from blogs.models import Post
-        recent_blog_posts = Post.objects.filter(
-            status='published'
-        ).select_related('author', 'category').order_by('-publish')[:3]
-
-        # Get featured agents for homepage
-        from agents.models import Agent
-        featured_agents = Agent.objects.filter(
-            is_active=True,
-            verification_status='verified'
-        ).select_related('user')[:6]
-
-        context = {
-            'states': states,
-            'property_types': property_types,
-            'featured_properties': featured_properties,
-            'premium_properties': premium_properties,
-            'all_properties': all_properties,
-            'pricing_packages': pricing_packages,
-            'recent_blog_posts': recent_blog_posts,
-            'latest_posts': recent_blog_posts,  # alias for index.html template
-            'featured_agents': featured_agents,
-        }
+        # Shared by every visitor; the 'homepage' generation is bumped by
+        # property/signals.py whenever any of the listed models change
+        context = get_or_rebuild(
+            HOMEPAGE_CACHE_KEY, 'homepage', _build_homepage_context, HOMEPAGE_FRESH_FOR
+        )
 
         return render(request, 'estate/index.html', context)
 
@@ -71,7 +85,6 @@ def homepage(request):
             'states': [],
             'property_types': [],
             'featured_properties': [],
-            'all_properties': [],
             'pricing_packages': [],
             'recent_blog_posts': [],
             'latest_posts': [],
@@ -80,70 +93,87 @@ def homepage(request):
 
 
 def get_cities_by_state(request):
-    """AJAX endpoint to get cities for a selected state"""
+    """AJAX endpoint to get cities for a selected state (from the catalogue snapshot)"""
+    from .catalogue import get_catalogue
+
     state_id = request.GET.get('state_id')
     
     if not state_id:
         return JsonResponse({'cities': []})
     
     try:
-        cities = City.objects.filter(
-            state_id=state_id,
-            is_active=True
-        ).values('id', 'name')
-        
-        return JsonResponse({
-            'cities': list(cities)
-        })
-    except Exception as e:
+        return JsonResponse({'cities': get_catalogue().cities(int(state_id))})
+    except ValueError as e:
         return JsonResponse({'error': str(e)}, status=400)
 
 
+CATALOGUE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def location_catalogue(request):
+    """
+    All active states with their cities as one JSON document. Requested
+    with ?v=<current version> it is cacheable for a year; otherwise it
+    must be revalidated, which costs a 304 when nothing has changed.
+    """
+    from django.utils.cache import get_conditional_response, patch_cache_control
+    from .catalogue import get_catalogue
+
+    catalogue = get_catalogue()
+    etag = f'"{catalogue.etag}"'
+    if request.GET.get('v') == catalogue.etag:
+        cache_control = {'public': True, 'max_age': CATALOGUE_MAX_AGE, 'immutable': True}
+    else:
+        cache_control = {'public': True, 'max_age': 0, 'must_revalidate': True}
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(catalogue.body, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, **cache_control)
+    return response
+
+
+def _legacy_search_params(params):
+    """
+    Translate the search_results.html form parameters to the shared
+    property filters (see filters.filter_properties).
+    """
+    translated = params.copy()
+    if params.get('property_type'):
+        translated['type'] = params['property_type']
+    price_range = params.get('price_range')
+    if price_range:
+        if price_range.endswith('+'):
+            translated['min_price'] = price_range.rstrip('+')
+        elif '-' in price_range:
+            translated['min_price'], translated['max_price'] = price_range.split('-', 1)
+    return translated
+
+
+def _valid_filters(request, params):
+    """`params` without malformed filters (e.g. bedrooms=abc), with a message naming them"""
+    params, invalid = drop_invalid_filters(params)
+    if invalid:
+        messages.warning(request, f"Ignored invalid filter values: {', '.join(invalid)}")
+    return params
+
+
 def search_properties(request):
     """Search/filter properties"""
-    
-    # Get filter parameters
-    state_id = request.GET.get('state_type')
-    city_id = request.GET.get('city_type')
-    property_type = request.GET.get('property_type')
-    price_range = request.GET.get('price_range')
-    bedrooms = request.GET.get('bedrooms')
-    bathrooms = request.GET.get('bathrooms')
-    
-    # Start with all properties
     properties = Property.objects.select_related(
         'state', 'city', 'property_type', 'status'
     )
-    
-    # Apply filters
-    if state_id:
-        properties = properties.filter(state_id=state_id)
-    
-    if city_id:
-        properties = properties.filter(city_id=city_id)
-    
-    if property_type:
-        properties = properties.filter(property_type__name=property_type)
-    
-    if price_range:
-        if price_range == '1200000+':
-            properties = properties.filter(price__gte=1200000)
-        elif '-' in price_range:
-            min_price, max_price = price_range.split('-')
-            properties = properties.filter(price__gte=int(min_price), price__lte=int(max_price))
-    
-    if bedrooms:
-        if bedrooms == '5+':
-            properties = properties.filter(bedrooms__gte=5)
-        else:
-            properties = properties.filter(bedrooms=int(bedrooms))
-    
-    if bathrooms:
-        if bathrooms == '4+':
-            properties = properties.filter(bathrooms__gte=4)
-        else:
-            properties = properties.filter(bathrooms=int(bathrooms))
-    
+    params = _valid_filters(request, _legacy_search_params(request.GET))
+    properties = filter_properties(properties, params)
+
+    # One bounded page at a time; the JSON search API serves further results
+    properties = paginate_by_cursor(
+        properties, ('-created_at', '-id'),
+        cursor=request.GET.get('cursor'),
+        per_page=12,
+    )
+
     context = {
         'properties': properties,
         'search_params': request.GET,
@@ -153,27 +183,22 @@ def search_properties(request):
 
 
 def get_properties_details(request, slug):
-    property_detail = get_object_or_404(Property, slug=slug)
+    from .detail import load_detail, load_visitor_state
+    from .gallery import GALLERY_PAGE_SIZE, PREVIEW_SIZE, load_gallery
 
-    # ── Saved property check ─────────────────────────────────────────────────
-    saved_property = None
-    if request.user.is_authenticated:
-        try:
-            saved_property = SavedProperty.objects.get(user=request.user, property=property_detail)
-        except SavedProperty.DoesNotExist:
-            saved_property = None
+    # Listing, relations and similar listings (cached per slug)
+    bundle = load_detail(slug)
+    property_detail = bundle['property']
+
+    # First few gallery images; the rest load from property_gallery_api
+    gallery = load_gallery(property_detail.pk) or []
+
+    # ── Saved / already-applied state for this visitor (one query) ───────────
+    is_saved, existing_application = load_visitor_state(property_detail, request.user)
 
     # ── Application form setup ───────────────────────────────────────────────
     from .forms import PropertyApplicationForm
 
-    # Check if user already submitted an application for this property
-    existing_application = None
-    if request.user.is_authenticated:
-        existing_application = PropertyApplication.objects.filter(
-            listing=property_detail,
-            applicant=request.user
-        ).first()
-
     application_form = None
     application_success = False
 
@@ -228,6 +253,11 @@ def get_properties_details(request, slug):
             })
         application_form = PropertyApplicationForm(initial=initial)
 
+    # ── View counter (buffered, deduplicated per visitor) ────────────────────
+    if request.method == "GET":
+        from core.counters import record_view
+        record_view(request, property_detail)
+
     # ── Referral tracking ────────────────────────────────────────────────────
     ref_code = request.GET.get('ref')
     if ref_code:
@@ -243,7 +273,12 @@ def get_properties_details(request, slug):
     context = {
         'property':              property_detail,
         'referral_link':         referral_link,
-        'saved_property':        saved_property is not None,
+        'saved_property':        is_saved,
+        'similar_properties':    bundle['similar_properties'],
+        'gallery_preview':       gallery[:PREVIEW_SIZE],
+        'gallery_count':         len(gallery),
+        'gallery_remaining':     max(len(gallery) - PREVIEW_SIZE, 0),
+        'gallery_page_size':     GALLERY_PAGE_SIZE,
 
         # Application form context
         'application_form':      application_form,
@@ -265,129 +300,280 @@ def get_properties_details(request, slug):
 
 def property_list(request):
     """List all properties with pagination, filtering, and sorting"""
-    from django.core.paginator import Paginator
-    from django.db.models import Q
-    
+    from .cards import PropertyCard, card_values, load_cards
+
     # Base Queryset
-    properties_list = Property.objects.select_related(
-        'state', 'city', 'property_type', 'status', 'listed_by'
-    ).filter(status__name__in=['for_sale', 'for_rent', 'pending']) # Show active listings
+    properties_list = Property.objects.filter(status__name__in=['for_sale', 'for_rent', 'pending']) # Show active listings
     
     # --- Filtering ---
-    
-    # Keyword Search (e.g. from global search)
-    query = request.GET.get('q')
-    if query:
-        properties_list = properties_list.filter(
-            Q(title__icontains=query) | 
-            Q(description__icontains=query) |
-            Q(address__icontains=query) |
-            Q(city__name__icontains=query)
-        )
-
-    state_id = request.GET.get('state_type')
-    if state_id:
-        properties_list = properties_list.filter(state_id=state_id)
-
-    listing_type = request.GET.get('listing_type')
-    if listing_type and listing_type not in ('', 'buy'):
-        properties_list = properties_list.filter(status__name__icontains=listing_type)    
-
-    # City filter (from homepage search form)
-    city_id = request.GET.get('city_type')
-    if city_id:
-        properties_list = properties_list.filter(city_id=city_id)   
-
-    # Property Type
-    prop_type = request.GET.get('type')
-    if prop_type and prop_type != 'All Types':
-        properties_list = properties_list.filter(property_type__name=prop_type)
-
-    # Price Range
-    min_price = request.GET.get('min_price')
-    max_price = request.GET.get('max_price')
-    if min_price:
-        properties_list = properties_list.filter(price__gte=min_price)
-    if max_price:
-        properties_list = properties_list.filter(price__lte=max_price)
-
-    # Bedrooms
-    bedrooms = request.GET.get('bedrooms')
-    if bedrooms and bedrooms != 'Any':
-        if '+' in bedrooms:
-            val = int(bedrooms.replace('+', ''))
-            properties_list = properties_list.filter(bedrooms__gte=val)
-        else:
-            properties_list = properties_list.filter(bedrooms=int(bedrooms))
-
-    # Bathrooms
-    bathrooms = request.GET.get('bathrooms')
-    if bathrooms and bathrooms != 'Any':
-        if '+' in bathrooms:
-            val = int(bathrooms.replace('+', ''))
-            properties_list = properties_list.filter(bathrooms__gte=val)
-        else:
-            properties_list = properties_list.filter(bathrooms=int(bathrooms))
-            
-    # Location (Text search for City/State/Address)
-    location = request.GET.get('location')
-    if location:
-        properties_list = properties_list.filter(
-            Q(city__name__icontains=location) | 
-            Q(state__name__icontains=location) |
-            Q(address__icontains=location)
-        )
-        
-    # Features
-    if request.GET.get('garage'):
-        properties_list = properties_list.filter(has_garage=True)
-    if request.GET.get('pool'):
-        properties_list = properties_list.filter(has_pool=True)
-    if request.GET.get('balcony'):
-        properties_list = properties_list.filter(has_balcony=True)
-    if request.GET.get('garden'):
-        properties_list = properties_list.filter(has_garden=True)
-    if request.GET.get('security'):
-        properties_list = properties_list.filter(has_security=True)
-    if request.GET.get('gym'):
-        properties_list = properties_list.filter(has_gym=True)
-    if request.GET.get('furnished'):
-        properties_list = properties_list.filter(is_furnished=True)
-    if request.GET.get('ac'):
-        properties_list = properties_list.filter(has_ac=True)
-    if request.GET.get('has_heating'):
-        properties_list = properties_list.filter(has_heating=True)
-    if request.GET.get('pets'):
-        properties_list = properties_list.filter(pet_friendly=True)             
-
-    # --- Sorting ---
-    sort_by = request.GET.get('sort', 'newest')
-    if sort_by == 'price_asc':
-        properties_list = properties_list.order_by('price')
-    elif sort_by == 'price_desc':
-        properties_list = properties_list.order_by('-price')
-    elif sort_by == 'views':
-        properties_list = properties_list.order_by('-views_count')
-    else: # newest
-        properties_list = properties_list.order_by('-created_at')
-
-    
-    # --- Pagination ---
-    paginator = Paginator(properties_list, 9) 
-    page_number = request.GET.get('page')
-    properties = paginator.get_page(page_number)
+    params = _valid_filters(request, request.GET)
+    query = params.get('q')
+    properties_list = filter_properties(properties_list, params)
+
+    # Sidebar facet counts for the current filter set (cached)
+    facets = get_facets(properties_list, params)
+
+    # --- Sorting & keyset pagination ---
+    sort_by, ordering = get_sort_ordering(request.GET.get('sort'), query)
+    properties = paginate_by_cursor(
+        card_values(apply_sort(properties_list, sort_by), ordering), ordering,
+        cursor=request.GET.get('cursor'),
+        per_page=9,
+        count_cap=None,  # exact total already comes from the cached facets
+        row_factory=PropertyCard.from_row,
+    )
     
     # Get Filter Options for Sidebar
-    property_types = PropertyType.objects.all()
+    property_types = list(PropertyType.objects.all())
+    for prop_type in property_types:
+        prop_type.facet_count = facets['type_counts'].get(prop_type.name, 0)
     
     # Sidebar Featured Properties (limit 3)
-    featured_sidebar = Property.objects.filter(is_featured=True).exclude(status__name='sold').order_by('-created_at')[:3]
+    featured_sidebar = load_cards(
+        Property.objects.filter(is_featured=True).exclude(status__name='sold').order_by('-created_at'), limit=3,
+    )
     
     context = {
         'properties': properties,
         'property_types': property_types,
-        'search_params': request.GET, # To keep filter values in inputs
+        'search_params': params, # To keep filter values in inputs
         'featured_sidebar': featured_sidebar,
+        'facets': facets,
+        'total_properties': facets['total'],
+        'current_sort': sort_by,
     }
     
-    return render(request, 'estate/properties.html', context)
\ No newline at end of file
+    return render(request, 'estate/properties.html', context)
+
+# ==================== SEARCH API ====================
+
+SEARCH_API_PAGE_SIZE = 20
+SEARCH_API_MAX_PAGE_SIZE = 50
+
+
+@gzip_page
+def property_search_api(request):
+    """
+    JSON search over the same filters and sort options as property_list.
+    `fields` picks the (comma-separated) attributes returned per result;
+    results are cursor-paginated like the listing pages.
+    """
+    import ujson
+    from .serializers import UnknownField, parse_fields, project, serialize
+
+    try:
+        fields = parse_fields(request.GET.get('fields'))
+    except UnknownField as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    try:
+        limit = max(1, min(int(request.GET.get('limit', SEARCH_API_PAGE_SIZE)), SEARCH_API_MAX_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number'}, status=400)
+
+    query = request.GET.get('q')
+    sort_by, ordering = get_sort_ordering(request.GET.get('sort'), query)
+    try:
+        properties = filter_properties(
+            Property.objects.filter(status__name__in=['for_sale', 'for_rent', 'pending']),
+            request.GET,
+        )
+    except InvalidFilter as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    sort_columns = [f.lstrip('-') for f in ordering if f.lstrip('-') not in ('search_rank', 'trending_score')]
+    page = paginate_by_cursor(
+        apply_sort(project(properties, fields, extra_columns=sort_columns), sort_by),
+        ordering,
+        cursor=request.GET.get('cursor'),
+        per_page=limit,
+    )
+
+    payload = {
+        'count': page.count,
+        'count_capped': page.count_capped,
+        'sort': sort_by,
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+        'results': [serialize(prop, fields) for prop in page],
+    }
+    return HttpResponse(
+        ujson.dumps(payload, ensure_ascii=False, escape_forward_slashes=False),
+        content_type='application/json',
+    )
+
+
+# ==================== GEO SEARCH API ====================
+
+def _geo_property_queryset():
+    return Property.objects.filter(
+        is_active=True,
+        status__name__in=['for_sale', 'for_rent', 'pending'],
+    ).exclude(geohash='').select_related('city', 'state', 'status')
+
+
+def _geo_property_json(prop):
+    return {
+        'id': prop.id,
+        'title': prop.title,
+        'url': prop.get_absolute_url(),
+        'price': str(prop.price),
+        'formatted_price': prop.formatted_price,
+        'status': prop.status.name,
+        'location': f"{prop.city.name}, {prop.state.name}",
+        'lat': float(prop.latitude),
+        'lng': float(prop.longitude),
+        'distance_km': prop.distance_km,
+    }
+
+
+def nearby_properties(request):
+    """AJAX endpoint: listings within `radius_km` of lat/lng, nearest first"""
+    from core.geo import InvalidGeoQuery, parse_point, result_limit, within_radius
+
+    try:
+        lat, lng, radius_km = parse_point(request.GET)
+    except InvalidGeoQuery as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'lat and lng are required numbers'}, status=400)
+
+    results = within_radius(_geo_property_queryset(), lat, lng, radius_km, limit=result_limit(request.GET))
+    return JsonResponse({
+        'count': len(results),
+        'results': [_geo_property_json(prop) for prop in results],
+    })
+
+
+def properties_in_bounds(request):
+    """AJAX endpoint: listings inside a map viewport (south, west, north, east)"""
+    from core.geo import InvalidGeoQuery, parse_bounds, result_limit, within_bounds
+
+    try:
+        south, west, north, east = parse_bounds(request.GET)
+    except InvalidGeoQuery as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'south, west, north and east are required numbers'}, status=400)
+
+    results = within_bounds(_geo_property_queryset(), south, west, north, east, limit=result_limit(request.GET))
+    return JsonResponse({
+        'count': len(results),
+        'results': [_geo_property_json(prop) for prop in results],
+    })
+
+
+def map_cluster_tile(request, zoom, x, y):
+    """
+    Precomputed marker clusters for one z/x/y map tile: count, centroid and
+    price range per cluster (see property/clusters.py).
+    """
+    from .clusters import MAX_ZOOM, MIN_ZOOM, get_tile
+
+    if not MIN_ZOOM <= zoom <= MAX_ZOOM:
+        return JsonResponse({'error': f'zoom must be between {MIN_ZOOM} and {MAX_ZOOM}'}, status=400)
+    if x >= 1 << zoom or y >= 1 << zoom:
+        return JsonResponse({'error': 'Tile out of range'}, status=400)
+
+    response = JsonResponse({'zoom': zoom, 'x': x, 'y': y, 'clusters': get_tile(zoom, x, y)})
+    response['Cache-Control'] = 'public, max-age=60'
+    return response
+
+
+MARKET_BREAKDOWNS = {'state': 'state_id', 'city': 'city_id', 'type': 'property_type_id'}
+
+
+def market_stats_api(request):
+    """
+    Price distribution for a market segment, e.g.
+    ?status=for_sale&city=12&type=3, optionally broken down one level
+    further with &breakdown=city|state|type. Served from the materialised
+    MarketStats rows (see property/market.py).
+    """
+    from django.core.cache import cache
+    from core.cache import versioned_key
+    from .market import MARKET_STATUSES, get_segment_stats, segment_key
+    from .models import MarketStats
+
+    status_name = request.GET.get('status', 'for_sale')
+    if status_name not in MARKET_STATUSES:
+        return JsonResponse({'error': f"status must be one of {', '.join(MARKET_STATUSES)}"}, status=400)
+    try:
+        ids = {
+            field: int(request.GET[param]) if request.GET.get(param) else None
+            for param, field in MARKET_BREAKDOWNS.items()
+        }
+    except ValueError:
+        return JsonResponse({'error': 'state, city and type must be ids'}, status=400)
+    breakdown = request.GET.get('breakdown')
+    if breakdown and (breakdown not in MARKET_BREAKDOWNS or ids[MARKET_BREAKDOWNS[breakdown]] is not None):
+        return JsonResponse({'error': 'Invalid breakdown'}, status=400)
+
+    key = segment_key(status_name, ids['state_id'], ids['city_id'], ids['property_type_id'])
+    data = {'segment': get_segment_stats([key]).get(key)}
+    if breakdown:
+        cache_key = versioned_key('market_stats', f'breakdown:{key}:{breakdown}')
+        children = cache.get(cache_key)
+        if children is None:
+            field = MARKET_BREAKDOWNS[breakdown]
+            filters = {f: v for f, v in ids.items() if f != field}
+            if field == 'city_id' and filters['state_id']:
+                # City segments don't repeat the state; select its cities instead
+                filters['city__state_id'] = filters['state_id']
+                filters['state_id'] = None
+            children = [
+                stats.as_dict() for stats in
+                MarketStats.objects.filter(
+                    listing_status=status_name, listing_count__gt=0, **{f'{field}__isnull': False}, **filters
+                ).order_by('-listing_count')
+            ]
+            cache.set(cache_key, children, 60 * 60)
+        data['breakdown'] = children
+
+    response = JsonResponse(data)
+    response['Cache-Control'] = 'public, max-age=300'
+    return response
+
+
+def property_gallery_api(request, pk):
+    """
+    One page of a listing's gallery (?page=, ?per_page= up to 48): URLs of
+    the original and its variants, caption, order and dimensions. Served
+    from the cached gallery metadata (see property/gallery.py).
+    """
+    from django.core.paginator import Paginator
+    from .gallery import GALLERY_PAGE_SIZE, MAX_PAGE_SIZE, load_gallery
+
+    gallery = load_gallery(pk)
+    if gallery is None:
+        return JsonResponse({'error': 'Property not found'}, status=404)
+    try:
+        per_page = min(max(int(request.GET.get('per_page', GALLERY_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'error': 'per_page must be a number'}, status=400)
+
+    page = Paginator(gallery, per_page).get_page(request.GET.get('page'))
+    response = JsonResponse({
+        'count': len(gallery),
+        'page': page.number,
+        'num_pages': page.paginator.num_pages,
+        'next_page': page.next_page_number() if page.has_next() else None,
+        'images': list(page.object_list),
+    })
+    response['Cache-Control'] = 'public, max-age=300'
+    return response
+
+
+def location_autocomplete(request):
+    """
+    Search-bar suggestions: states, cities and neighbourhoods starting with
+    ?q=, from the in-process index (no query per keystroke). Each result
+    carries the property_list parameters that select it.
+    """
+    from .autocomplete import MAX_RESULTS, autocomplete
+
+    try:
+        limit = min(max(int(request.GET.get('limit', MAX_RESULTS)), 1), MAX_RESULTS)
+    except ValueError:
+        limit = MAX_RESULTS
+    response = JsonResponse({'results': autocomplete(request.GET.get('q', ''), limit)})
+    response['Cache-Control'] = 'public, max-age=300'
+    return response
@@ -6,6 +6,7 @@ Usage: python manage.py scrape_ritzman
 from django.core.management.base import BaseCommand
 from django.core.files.base import ContentFile
 from django.utils.text import slugify
+from core.slugs import SlugAllocator
 from shop.models import Category, Product, ProductImage, ProductSpecification
 
 import requests
@@ -299,6 +300,7 @@ class RitzmanScraper:
         self.stdout.write('-' * 50)
         
         created_count = 0
+        slugs = SlugAllocator(Product)
         
         for prod_data in sample_products:
             try:
@@ -308,28 +310,30 @@ class RitzmanScraper:
                 
                 sku = f"RZM-{slugify(prod_data['name'])[:40].upper()}"
                 
-                product, created = Product.objects.get_or_create(
-                    sku=sku,
-                    defaults={
-                        'name': prod_data['name'],
-                        'slug': slugify(prod_data['name']),
-                        'category': category,
-                        'product_type': prod_data.get('product_type', 'accessory'),
-                        'short_description': prod_data.get('short_description', prod_data['description'][:200]),
-                        'description': prod_data['description'],
-                        'features': prod_data.get('features', 'Smart connectivity\nRemote control\nEnergy efficient'),
-                        'price': prod_data.get('price', Decimal('0.00')),
-                        'discount_price': prod_data.get('discount_price'),
-                        'brand': 'Ritzman Smart Homes',
-                        'model_number': sku,
-                        'connectivity': prod_data.get('connectivity', 'wifi'),
-                        'power_source': prod_data.get('power_source', 'AC Power / Battery'),
-                        'warranty_period': '1 Year',
-                        'stock_quantity': 25,
-                        'is_available': True,
-                        'is_featured': created_count < 3,  # First 3 are featured
-                    }
-                )
+                # Look up first: only a new row should take a slug from the allocator
+                product = Product.objects.filter(sku=sku).first()
+                created = product is None
+                if created:
+                    product = Product.objects.create(
+                        sku=sku,
+                        slug=slugs.allocate(prod_data['name']),
+                        name=prod_data['name'],
+                        category=category,
+                        product_type=prod_data.get('product_type', 'accessory'),
+                        short_description=prod_data.get('short_description', prod_data['description'][:200]),
+                        description=prod_data['description'],
+                        features=prod_data.get('features', 'Smart connectivity\nRemote control\nEnergy efficient'),
+                        price=prod_data.get('price', Decimal('0.00')),
+                        discount_price=prod_data.get('discount_price'),
+                        brand='Ritzman Smart Homes',
+                        model_number=sku,
+                        connectivity=prod_data.get('connectivity', 'wifi'),
+                        power_source=prod_data.get('power_source', 'AC Power / Battery'),
+                        warranty_period='1 Year',
+                        stock_quantity=25,
+                        is_available=True,
+                        is_featured=created_count < 3,  # First 3 are featured
+                    )
                 
                 if created:
                     created_count += 1
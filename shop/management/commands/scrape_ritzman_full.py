@@ -6,6 +6,7 @@ Usage: python manage.py scrape_ritzman_full
 from django.core.management.base import BaseCommand
 from django.core.files.base import ContentFile
 from django.utils.text import slugify
+from core.slugs import SlugAllocator
 from shop.models import Category, Product, ProductImage, ProductSpecification
 
 import requests
@@ -393,6 +394,7 @@ class RitzmanFullScraper:
         self.stdout.write('\n  Creating products...')
         created_count = 0
         updated_count = 0
+        slugs = SlugAllocator(Product)
         
         for prod_data in products:
             try:
@@ -401,27 +403,29 @@ class RitzmanFullScraper:
                     self.stdout.write(self.style.WARNING(f'    ⚠ No category for: {prod_data["name"]}'))
                     continue
                 
-                product, created = Product.objects.get_or_create(
-                    sku=prod_data['sku'],
-                    defaults={
-                        'name': prod_data['name'],
-                        'slug': prod_data['slug'],
-                        'category': category,
-                        'product_type': prod_data['product_type'],
-                        'short_description': prod_data['short_description'],
-                        'description': prod_data['description'],
-                        'features': prod_data['features'],
-                        'price': prod_data['price'],
-                        'discount_price': prod_data['discount_price'],
-                        'brand': prod_data['brand'],
-                        'model_number': prod_data['model_number'],
-                        'connectivity': prod_data['connectivity'],
-                        'power_source': prod_data['power_source'],
-                        'warranty_period': prod_data['warranty_period'],
-                        'stock_quantity': prod_data['stock_quantity'],
-                        'is_available': prod_data['is_available'],
-                    }
-                )
+                # Look up first: only a new row should take a slug from the allocator
+                product = Product.objects.filter(sku=prod_data['sku']).first()
+                created = product is None
+                if created:
+                    product = Product.objects.create(
+                        sku=prod_data['sku'],
+                        slug=slugs.allocate(prod_data['name']),
+                        name=prod_data['name'],
+                        category=category,
+                        product_type=prod_data['product_type'],
+                        short_description=prod_data['short_description'],
+                        description=prod_data['description'],
+                        features=prod_data['features'],
+                        price=prod_data['price'],
+                        discount_price=prod_data['discount_price'],
+                        brand=prod_data['brand'],
+                        model_number=prod_data['model_number'],
+                        connectivity=prod_data['connectivity'],
+                        power_source=prod_data['power_source'],
+                        warranty_period=prod_data['warranty_period'],
+                        stock_quantity=prod_data['stock_quantity'],
+                        is_available=prod_data['is_available'],
+                    )
                 
                 if created:
                     created_count += 1
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.4 on 2026-10-17 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shop", "0003_customerprofile_referred_by"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="shop_produc_created_5778ff_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["price", "id"], name="shop_produc_price_5e650a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["-views_count", "-id"], name="shop_produc_views_c_c10db6_idx"
+            ),
+        ),
+    ]
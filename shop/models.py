@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.text import slugify
+from core.slugs import save_with_unique_slug
 from django.urls import reverse
 import uuid
 from ckeditor.fields import RichTextField
@@ -97,12 +98,17 @@ class Product(models.Model):
             models.Index(fields=['slug']),
             models.Index(fields=['sku']),
             models.Index(fields=['is_available']),
+            # Keyset pagination orderings (see shop/views.py PRODUCT_SORT_ORDERINGS)
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['price', 'id']),
+            models.Index(fields=['-views_count', '-id']),
         ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+            save_with_unique_slug(self, self.name, lambda: super(Product, self).save(*args, **kwargs))
+        else:
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.name} ({self.sku})"
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Wishlist
+
+
+@receiver(post_save, sender=Wishlist)
+@receiver(post_delete, sender=Wishlist)
+def invalidate_wishlisted_ids(sender, instance, created=True, **kwargs):
+    """Drop the user's cached wishlist IDs (core/saved_items.py)"""
+    from core.saved_items import invalidate
+
+    if created:  # post_delete has no `created`; re-saving a row doesn't change the IDs
+        invalidate('products', instance.user_id)
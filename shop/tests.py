@@ -1,3 +1,130 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db.models import Sum
 from django.test import TestCase
+from django.urls import reverse
+
+from core.models import EngagementBucket
+from core.slugs import SlugAllocator
+from .models import Cart, CartItem, Category, Product
+
+
+def make_product(**kwargs):
+    category, _ = Category.objects.get_or_create(name='Smart Locks')
+    fields = {
+        'name': 'Deadbolt Pro',
+        'category': category,
+        'product_type': 'smart_lock',
+        'sku': 'LOCK-1',
+        'short_description': 'Keyless deadbolt',
+        'description': 'Keyless deadbolt',
+        'features': 'Fingerprint',
+        'price': Decimal('45000.00'),
+        'brand': 'Nestova',
+        'model_number': 'DB-1',
+        'connectivity': 'wifi',
+        'power_source': 'Battery',
+        'warranty_period': '1 Year',
+        'stock_quantity': 10,
+    }
+    fields.update(kwargs)
+    return Product.objects.create(**fields)
+
+
+class UpdateCartTests(TestCase):
+    def setUp(self):
+        self.product = make_product()
+        session = self.client.session
+        session.save()
+        self.cart = Cart.objects.create(session_key=session.session_key)
+        self.item = CartItem.objects.create(cart=self.cart, product=self.product, quantity=2)
+        self.url = reverse('shop:update_cart', args=[self.item.pk])
+
+    def cart_adds(self):
+        return EngagementBucket.objects.filter(
+            content_type=ContentType.objects.get_for_model(Product), event='cart_add',
+        ).aggregate(total=Sum('count'))['total'] or 0
+
+    def update(self, quantity):
+        return self.client.post(self.url, {'quantity': quantity}, headers={'X-Requested-With': 'XMLHttpRequest'})
+
+    def test_increase_records_the_added_quantity(self):
+        response = self.update(5)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['success'])
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 5)
+        self.assertEqual(self.cart_adds(), 3)
+
+    def test_decrease_records_nothing(self):
+        response = self.update(1)
+        self.assertEqual(response.status_code, 200)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 1)
+        self.assertEqual(self.cart_adds(), 0)
+
+    def test_zero_removes_the_item(self):
+        response = self.update(0)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(CartItem.objects.filter(pk=self.item.pk).exists())
+        self.assertEqual(self.cart_adds(), 0)
+
+    def test_quantity_is_capped_at_stock(self):
+        response = self.update(50)
+        self.assertEqual(response.json()['message'], 'Only 10 items available')
+        self.assertEqual(self.cart_adds(), 8)
+
+    def test_plain_post_redirects_to_cart(self):
+        response = self.client.post(self.url, {'quantity': 3})
+        self.assertRedirects(response, reverse('shop:cart'), fetch_redirect_response=False)
+
+
+class ScrapeRitzmanTests(TestCase):
+    def scrape(self):
+        call_command('scrape_ritzman', use_samples=True, stdout=StringIO())
+
+    def test_rerun_keeps_slugs_and_allocates_nothing(self):
+        self.scrape()
+        slugs = dict(Product.objects.values_list('sku', 'slug'))
+        self.assertTrue(slugs)
+        self.assertEqual(len(set(slugs.values())), len(slugs))
+
+        with mock.patch.object(SlugAllocator, 'allocate', wraps=SlugAllocator.allocate, autospec=True) as allocate:
+            self.scrape()
+        allocate.assert_not_called()
+        self.assertEqual(dict(Product.objects.values_list('sku', 'slug')), slugs)
+
+
+class ProductListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Products have UUID keys; repeated prices make pages break ties on them
+        cls.products = [
+            make_product(name=f'Lock {i}', sku=f'LOCK-{i}', price=Decimal(1000 * (i % 3))) for i in range(27)
+        ]
+
+    def walk(self, sort):
+        seen, cursor = [], None
+        for _ in range(10):
+            params = {'sort': sort}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(reverse('shop:product_list'), params)
+            self.assertEqual(response.status_code, 200)
+            page = response.context['page_obj']
+            seen += [product.pk for product in page]
+            cursor = page.next_cursor
+            if cursor is None:
+                return seen
+        raise AssertionError('Pagination did not terminate')
 
-# Create your tests here.
+    def test_walking_pages_returns_each_product_once(self):
+        for sort in ['newest', 'price_asc', 'price_desc']:
+            with self.subTest(sort=sort):
+                seen = self.walk(sort)
+                self.assertEqual(len(seen), len(self.products))
+                self.assertEqual(set(seen), {product.pk for product in self.products})
@@ -12,6 +12,9 @@ from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from decimal import Decimal
+from core.counters import record_view
+from core.pagination import paginate_by_cursor
+from core.trending import annotate_trending, record_event
 from .models import (
     Product, Category, Cart, CartItem, Order, OrderItem,
     Review, Wishlist, CustomerProfile, Newsletter
@@ -116,6 +119,22 @@ import requests
 # Product Views
 # ===========================
 
+# Sort options -> keyset ordering. The short names are what the shop
+# templates send; the field names are kept for old links.
+PRODUCT_SORT_ORDERINGS = {
+    'newest': ('-created_at', '-id'),
+    '-created_at': ('-created_at', '-id'),
+    'price_asc': ('price', 'id'),
+    'price': ('price', 'id'),
+    'price_desc': ('-price', '-id'),
+    '-price': ('-price', '-id'),
+    'popular': ('-views_count', '-id'),
+    'views_count': ('-views_count', '-id'),
+    'trending': ('-trending_score', '-id'),
+    'name': ('name', 'id'),
+    '-name': ('-name', '-id'),
+}
+
 def product_list(request):
     """Display all products with filtering and sorting"""
     products = Product.objects.filter(is_available=True).select_related('category')
@@ -153,15 +172,17 @@ def product_list(request):
         products = products.filter(brand=brand)
     
     # Sorting
-    sort_by = request.GET.get('sort', '-created_at')
-    valid_sorts = ['price', '-price', 'name', '-name', '-created_at', 'views_count']
-    if sort_by in valid_sorts:
-        products = products.order_by(sort_by)
-    
-    # Pagination
-    paginator = Paginator(products, 12)  # 12 products per page
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
+    sort_by = request.GET.get('sort', 'newest')
+    ordering = PRODUCT_SORT_ORDERINGS.get(sort_by, PRODUCT_SORT_ORDERINGS['newest'])
+    if sort_by == 'trending':
+        products = annotate_trending(products)
+    
+    # Keyset pagination - 12 products per page, total capped at 1,000+
+    page_obj = paginate_by_cursor(
+        products, ordering,
+        cursor=request.GET.get('cursor'),
+        per_page=12,
+    )
     
     # Get categories and brands for filters
     categories = Category.objects.filter(is_active=True)
@@ -169,6 +190,9 @@ def product_list(request):
     
     context = {
         'products': page_obj,
+        'page_obj': page_obj,
+        'is_paginated': page_obj.has_other_pages(),
+        'total_products': page_obj.count_display,
         'categories': categories,
         'brands': brands,
         'query': query,
@@ -187,9 +211,8 @@ def product_detail(request, slug):
         slug=slug
     )
     
-    # Increment view count
-    product.views_count += 1
-    product.save(update_fields=['views_count'])
+    # Increment view count (buffered in the cache, flushed in bulk)
+    record_view(request, product)
     
     # Get related products
     related_products = Product.objects.filter(
@@ -200,10 +223,9 @@ def product_detail(request, slug):
     # Get approved reviews
     reviews = product.product_reviews.filter(is_approved=True).select_related('user')
     
-    # Check if user has this in wishlist
-    in_wishlist = False
-    if request.user.is_authenticated:
-        in_wishlist = Wishlist.objects.filter(user=request.user, product=product).exists()
+    # Check if user has this in wishlist (cached ID set, see core/saved_items.py)
+    from core.saved_items import wishlisted_product_ids
+    in_wishlist = product.id in wishlisted_product_ids(request.user)
     
     context = {
         'product': product,
@@ -331,6 +353,7 @@ def add_to_cart(request, product_id):
         message = f'{product.name} added to cart'
     
     cart_item.save()
+    record_event(product, 'cart_add')
     
     # AJAX response
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -352,6 +375,7 @@ def update_cart(request, item_id):
     cart_item = get_object_or_404(CartItem, id=item_id, cart=cart)
     
     quantity = int(request.POST.get('quantity', 1))
+    previous_quantity = cart_item.quantity
     
     if quantity <= 0:
         cart_item.delete()
@@ -366,6 +390,9 @@ def update_cart(request, item_id):
         
         cart_item.quantity = quantity
         cart_item.save()
+        # Only increases count towards trending; lowering or removing doesn't
+        if quantity > previous_quantity:
+            record_event(cart_item.product, 'cart_add', quantity - previous_quantity)
     
     # AJAX response
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -627,6 +654,7 @@ def add_to_wishlist(request, product_id):
     )
     
     if created:
+        record_event(product, 'save')
         message = f'{product.name} added to wishlist'
     else:
         message = f'{product.name} is already in your wishlist'
@@ -701,18 +729,22 @@ def profile(request):
             return redirect('shop:profile')
 
     # Fetch Data for Dashboard Tabs
+    from property.cards import load_cards
     from property.models import Property
     from bookings.models import Booking
-    from listings.models import SavedProperty, Notification, UserSubscription
+    from listings.models import SavedProperty, SavedSearch, Notification, UserSubscription
     
-    # 1. My Properties (Real Estate Listings)
-    my_properties = Property.objects.filter(listed_by=request.user).order_by('-created_at')
+    # 1. My Properties (Real Estate Listings, as cards)
+    my_properties = load_cards(Property.objects.filter(listed_by=request.user).order_by('-created_at'))
     
     # 2. My Bookings (Appointments/Rental Bookings)
     my_bookings = Booking.objects.filter(user=request.user).order_by('-created_at')
     
     # 3. Saved Properties (Wishlist)
-    saved_properties = SavedProperty.objects.filter(user=request.user).select_related('property')
+    saved_ids = list(SavedProperty.objects.filter(user=request.user).values_list('property_id', flat=True))
+    saved_cards = {card.id: card for card in load_cards(Property.objects.filter(pk__in=saved_ids))}
+    saved_properties = [saved_cards[pk] for pk in saved_ids if pk in saved_cards]  # most recently saved first
+    saved_searches = SavedSearch.objects.filter(user=request.user)
     
     # 4. Notifications
     notifications = Notification.objects.filter(user=request.user).order_by('-created_at')[:20]
@@ -776,6 +808,7 @@ def profile(request):
         'my_properties': my_properties,
         'my_bookings': my_bookings,
         'saved_properties': saved_properties,
+        'saved_searches': saved_searches,
         'notifications': notifications,
         'recent_orders': recent_orders,
         'subscription': subscription,